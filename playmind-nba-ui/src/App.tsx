@@ -19,6 +19,27 @@ type Game = {
   score: string
 }
 
+type LiveMessage =
+  | { type: 'snapshot'; gameId: string; version: number; summary: any }
+  | { type: 'patch'; gameId: string; version: number; patch: any }
+
+// RFC 7386 JSON Merge Patch, as sent by /api/games/{id}/live
+function applyMergePatch(target: any, patch: any): any {
+  if (patch === null || typeof patch !== 'object' || Array.isArray(patch)) {
+    return patch
+  }
+  const result: Record<string, any> =
+    target !== null && typeof target === 'object' && !Array.isArray(target) ? { ...target } : {}
+  for (const [key, value] of Object.entries(patch)) {
+    if (value === null) {
+      delete result[key]
+    } else {
+      result[key] = applyMergePatch(result[key], value)
+    }
+  }
+  return result
+}
+
 function App() {
   const [games, setGames] = useState<Game[]>([])
   const [selectedGameIds, setSelectedGameIds] = useState<string[]>([])
@@ -130,6 +151,53 @@ function App() {
     }
   }, [activeSummaryGameId])
 
+  // Live updates for the game being viewed: the server pushes a snapshot, then merge patches
+  // whenever ingestion changes the summary, so nothing is polled.
+  useEffect(() => {
+    if (!activeSummaryGameId) {
+      return
+    }
+
+    const gameId = activeSummaryGameId
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:'
+    const socket = new WebSocket(`${protocol}//${window.location.host}/api/games/${gameId}/live`)
+    let current: any = null
+
+    socket.onmessage = (event) => {
+      let message: LiveMessage
+      try {
+        message = JSON.parse(event.data)
+      } catch {
+        return
+      }
+      if (message.type === 'snapshot') {
+        current = message.summary
+      } else if (current) {
+        current = applyMergePatch(current, message.patch)
+      } else {
+        return
+      }
+
+      const summary = current
+      setGameSummary(summary)
+      setGameSummaryStatus(null)
+      setSummaryCache((prev) => ({ ...prev, [gameId]: summary }))
+      setGames((prev) =>
+        prev.map((g) => {
+          const score = summary.final_score ?? {}
+          if (g.id !== gameId || !(g.home in score) || !(g.away in score)) {
+            return g
+          }
+          return { ...g, score: `${score[g.away]} - ${score[g.home]}` }
+        }),
+      )
+    }
+
+    return () => {
+      socket.close()
+    }
+  }, [activeSummaryGameId])
+
   async function handleAskQuestion() {
     if (!selectedGame || !question.trim() || selectedGameIds.length === 0) {
       return
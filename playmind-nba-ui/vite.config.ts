@@ -6,7 +6,8 @@ export default defineConfig({
   plugins: [react()],
   server: {
     proxy: {
-      '/api': 'http://localhost:8000',
+      // ws: true also proxies the live-update WebSockets
+      '/api': { target: 'http://localhost:8000', ws: true },
     },
   },
 })
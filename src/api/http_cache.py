@@ -0,0 +1,143 @@
+"""Conditional GET (ETag / 304) and compression for the game read endpoints.
+
+Each cacheable resource is keyed by a cheap *validator* — file (mtime, size)
+tuples obtained with `stat()` only. While the validator is unchanged the
+serialized body, its strong ETag and its compressed variants are reused, so a
+poll that hits `If-None-Match` is answered with a 304 without opening,
+parsing or re-serializing anything.
+
+Each content coding is a different representation with its own bytes, so it
+gets its own strong ETag: `"v1-<digest>"` for identity, `"v1-<digest>-gzip"`
+and `"v1-<digest>-br"` for the compressed variants. All of them revalidate
+the same resource.
+"""
+
+import gzip
+import hashlib
+import threading
+
+from fastapi import Request, Response
+
+from src.utils.metrics import record_cache
+
+try:  # optional: brotli is preferred when the client accepts it and the package is installed
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Bump when the JSON shape of a cached endpoint changes so old ETags stop matching.
+API_CACHE_VERSION = "1"
+
+# Final games never change again; live games (and the list, which grows) must revalidate.
+FINAL_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=86400"
+LIVE_CACHE_CONTROL = "no-cache"
+
+# Compressing tiny bodies costs more than it saves.
+MIN_COMPRESS_BYTES = 1024
+
+
+class CachedBody:
+    def __init__(self, body: bytes, cache_control: str):
+        self.body = body
+        self.cache_control = cache_control
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self._tag = f"v{API_CACHE_VERSION}-{digest}"
+        self._encoded: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def etag(self, encoding: str | None = None) -> str:
+        """Strong ETag of the representation sent with `encoding` (None = identity)."""
+        return f'"{self._tag}-{encoding}"' if encoding else f'"{self._tag}"'
+
+    def encoded(self, encoding: str | None) -> bytes:
+        if encoding is None:
+            return self.body
+        with self._lock:
+            data = self._encoded.get(encoding)
+            if data is None:
+                if encoding == "br":
+                    data = brotli.compress(self.body, quality=5)
+                else:
+                    data = gzip.compress(self.body, compresslevel=6)
+                self._encoded[encoding] = data
+        return data
+
+
+class ResponseCache:
+    """Maps a resource key to the CachedBody built for its current validator."""
+
+    def __init__(self):
+        self._entries: dict[str, tuple[object, CachedBody]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, validator, build) -> CachedBody:
+        """Return the cached body for `key` if `validator` is unchanged, else rebuild it.
+
+        `build()` must return (body_bytes, cache_control).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == validator:
+            record_cache("http_response", True)
+            return entry[1]
+
+        record_cache("http_response", False)
+        body, cache_control = build()
+        cached = CachedBody(body, cache_control)
+        with self._lock:
+            self._entries[key] = (validator, cached)
+        return cached
+
+
+def etag_matches(if_none_match: str | None, cached: CachedBody) -> bool:
+    """RFC 9110 If-None-Match evaluation (weak comparison, '*' and lists).
+
+    A tag for any content coding of the cached body matches: a client that
+    stored the gzip variant still holds the current resource.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = {cached.etag(encoding) for encoding in (None, "gzip", "br")}
+    return any(tag.strip().removeprefix("W/") in current for tag in if_none_match.split(","))
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        pieces = part.strip().split(";")
+        name = pieces[0].strip().lower()
+        q = 1.0
+        for param in pieces[1:]:
+            if param.strip().startswith("q="):
+                try:
+                    q = float(param.strip()[2:])
+                except ValueError:
+                    q = 0.0
+        if name:
+            accepted[name] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def cached_response(request: Request, cached: CachedBody) -> Response:
+    """304 if the client's ETag matches, else the (possibly compressed) JSON body."""
+    encoding = None
+    if len(cached.body) >= MIN_COMPRESS_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": cached.etag(encoding),
+        "Cache-Control": cached.cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), cached):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=cached.encoded(encoding), media_type="application/json", headers=headers)
@@ -1,20 +1,69 @@
 from pathlib import Path
 from typing import List
+import asyncio
+import cProfile
+import io
+import os
+import pstats
 import subprocess
+import tempfile
+import threading
+import time
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 
+from src.api.http_cache import FINAL_CACHE_CONTROL, LIVE_CACHE_CONTROL, ResponseCache, cached_response
+from src.rag.batch_qa import MAX_BATCH_QUESTIONS, answer_batch
+from src.rag.hybrid_retrieval import MODES as RETRIEVAL_MODES, HybridRetriever
+from src.rag.llm_client import BREAKER_RESET_SECONDS, LLM_BACKEND, LLMUnavailable
 from src.rag.qa_engine import build_llm, build_prompt
-from src.service.data_service import ingest_game as ingest_game_service
+from src.rag.stat_router import ROUTER_DECISIONS, route_question, teams_in_question
+from src.service.comparison import build_rows, format_comparison_context
+from src.service.data_service import add_ingest_listener, ingest_game as ingest_game_service
+from src.service.game_catalog import find_games, known_teams, load_catalog
+from src.service.lineup_store import query_lineups, query_on_off
+from src.service.live_updates import Broadcaster
+from src.service.play_search import search_plays
+from src.service.summary_store import load_summaries, load_summary
+from src.utils.columnar_export import (
+  EXPORT_FORMATS,
+  EXPORT_KINDS,
+  MEDIA_TYPES,
+  exportable_games,
+  iter_arrow_stream,
+  iter_game_tables,
+  write_parquet_export,
+)
+from src.utils.context_snapshot import assemble_context
+from src.utils.game_state import load_game_state
+from src.utils.lineups import lineup_stats, player_on_off
+from src.utils.metrics import HTTP_SECONDS, record_bytes, render_prometheus, time_stage
+from src.utils.shot_charts import chart, get_season_path, get_shots_path, load_shot_charts
 
 
 # Lazily initialize LLM and prompt so the API can start even if OpenAI is misconfigured.
 llm = None
 prompt = None
+retriever = None
+# The startup warm-up thread and request threads may build the LLM at the same time.
+_llm_lock = threading.Lock()
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 STRUCTURED_DIR = BASE_DIR / "data" / "structured"
+PROFILE_DIR = BASE_DIR / "data" / "profiles"
+
+# Above this many games, /ask switches from raw per-game summaries to a
+# pre-aggregated comparison table so the prompt size stays bounded.
+MULTI_GAME_THRESHOLD = 4
+
+# Per-request profiling is opt-in twice: the server must be started with
+# PLAYMIND_PROFILING=1 and the client must send `X-Playmind-Profile: 1`.
+PROFILING_ENABLED = os.getenv("PLAYMIND_PROFILING", "0") == "1"
+PROFILE_HEADER = "x-playmind-profile"
 
 
 class GameListItem(BaseModel):
@@ -36,10 +85,146 @@ class AskRequest(BaseModel):
 
 class AskResponse(BaseModel):
   answer: str
+  # "fast_path" when answered directly from the summary, "llm" otherwise
+  source: str = "llm"
+
+
+class BatchAskRequest(BaseModel):
+  questions: List[str]
+  gameIds: List[str] | None = None
+
+
+class BatchAnswer(BaseModel):
+  question: str
+  answer: str
+  # "fast_path", "batch" (one shared completion), "fanout" or "single" (separate calls)
+  source: str
+
+
+class BatchAskResponse(BaseModel):
+  answers: List[BatchAnswer]
+
+
+class QueryRequest(BaseModel):
+  question: str
+  team: str | None = None
+  startDate: str | None = None
+  endDate: str | None = None
+  gameIds: List[str] | None = None
+
+
+class QueryResponse(BaseModel):
+  answer: str
+  gameIds: List[str]
 
 
 app = FastAPI(title="Playmind NBA API", version="0.1.0")
 
+# Serialized bodies + ETags for the read endpoints, keyed by file stat validators.
+response_cache = ResponseCache()
+
+
+def _read_summary(game_id: str) -> dict | None:
+  import json
+
+  try:
+    with open(STRUCTURED_DIR / f"{game_id}_summary.json", "r") as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return None
+
+
+# One broadcaster fans summary changes out to every live WebSocket subscriber.
+broadcaster = Broadcaster(load_summary=_read_summary, refresh=ingest_game_service)
+add_ingest_listener(broadcaster.publish)
+
+
+@app.on_event("startup")
+async def _bind_broadcaster():
+  broadcaster.bind(asyncio.get_running_loop())
+
+
+def _warm_llm():
+  try:
+    _ensure_llm()
+    llm.warm()
+  except Exception as e:
+    print(f"Local model warm-up failed (will retry on first ask): {e}")
+
+
+@app.on_event("startup")
+async def _start_llm_warmup():
+  # Load the local model in the background so the first ask doesn't pay for it.
+  if LLM_BACKEND == "local":
+    asyncio.get_running_loop().run_in_executor(None, _warm_llm)
+
+
+def _route_label(request: Request) -> str:
+  # Use the route template (e.g. /api/games/{game_id}/ask) so metrics don't
+  # get one series per game id.
+  route = request.scope.get("route")
+  return getattr(route, "path", None) or "unmatched"
+
+
+def _dump_profile(profiler: cProfile.Profile, request: Request) -> Path:
+  PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+  slug = request.url.path.strip("/").replace("/", "_") or "root"
+  out_path = PROFILE_DIR / f"{int(time.time() * 1000)}_{request.method.lower()}_{slug}.prof"
+  profiler.dump_stats(str(out_path))
+
+  # Human-readable top functions next to the binary dump (load the .prof in snakeviz etc.)
+  buf = io.StringIO()
+  pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(30)
+  out_path.with_suffix(".txt").write_text(buf.getvalue())
+  return out_path
+
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+  profiler = None
+  if PROFILING_ENABLED and request.headers.get(PROFILE_HEADER) == "1":
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+  start = time.perf_counter()
+  status = 500
+  try:
+    response = await call_next(request)
+    status = response.status_code
+  finally:
+    if profiler is not None:
+      profiler.disable()
+    HTTP_SECONDS.observe(
+      time.perf_counter() - start,
+      method=request.method,
+      route=_route_label(request),
+      status=status,
+    )
+
+  content_length = response.headers.get("content-length")
+  if content_length is not None:
+    record_bytes("http_response", int(content_length))
+
+  if profiler is not None:
+    response.headers["X-Playmind-Profile-Path"] = str(_dump_profile(profiler, request))
+
+  return response
+
+
+@app.exception_handler(LLMUnavailable)
+async def llm_unavailable_handler(request: Request, exc: LLMUnavailable):
+  # Provider timeouts / outages surface as 503 instead of a hung request or a 500.
+  return JSONResponse(
+    status_code=503,
+    content={"detail": str(exc)},
+    headers={"Retry-After": str(int(BREAKER_RESET_SECONDS))},
+  )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+  return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 
 @app.post("/api/games/ingest")
 async def ingest_game_endpoint(payload: IngestRequest):
@@ -48,7 +233,8 @@ async def ingest_game_endpoint(payload: IngestRequest):
     raise HTTPException(status_code=400, detail="gameId must not be empty")
 
   try:
-    summary_path = ingest_game_service(game_id)
+    # Off the event loop so WebSocket fan-out and other requests keep flowing during ingest.
+    summary_path = await run_in_threadpool(ingest_game_service, game_id)
   except Exception as e:
     raise HTTPException(
       status_code=500,
@@ -58,18 +244,14 @@ async def ingest_game_endpoint(payload: IngestRequest):
   return {"status": "ok", "gameId": game_id, "summaryPath": str(summary_path)}
 
 
-@app.get("/api/games", response_model=List[GameListItem])
-async def list_games() -> List[GameListItem]:
-  if not STRUCTURED_DIR.exists():
-    return []
+def _game_list_items(paths: List[Path]) -> List[GameListItem]:
+  import json
 
   items: List[GameListItem] = []
-  for path in sorted(STRUCTURED_DIR.glob("*_summary.json")):
+  for path in paths:
     game_id = path.name.split("_summary.json")[0]
 
     try:
-      import json
-
       with open(path, "r") as f:
         data = json.load(f)
     except Exception:
@@ -102,99 +284,441 @@ async def list_games() -> List[GameListItem]:
   return items
 
 
+def _stat_validator(path: Path):
+  st = path.stat()
+  return (st.st_mtime_ns, st.st_size)
+
+
+@app.get("/api/games", response_model=List[GameListItem])
+async def list_games(request: Request):
+  import json
+
+  paths = sorted(STRUCTURED_DIR.glob("*_summary.json")) if STRUCTURED_DIR.exists() else []
+  # Validator is stat()-only: unchanged files mean the cached body/ETag are still valid.
+  validator = tuple((p.name, *_stat_validator(p)) for p in paths)
+
+  def build():
+    with time_stage("list_games"):
+      items = _game_list_items(paths)
+    with time_stage("serialize"):
+      body = json.dumps([item.model_dump() for item in items], separators=(",", ":")).encode("utf-8")
+    # New games can be ingested at any time, so the list always revalidates.
+    return body, LIVE_CACHE_CONTROL
+
+  return cached_response(request, response_cache.get("games", validator, build))
+
+
 @app.get("/api/games/{game_id}/summary")
-async def get_game_summary(game_id: str):
+async def get_game_summary(game_id: str, request: Request):
   path = STRUCTURED_DIR / f"{game_id}_summary.json"
   if not path.exists():
     raise HTTPException(status_code=404, detail="Summary not found for that game_id")
 
   import json
 
-  with open(path, "r") as f:
-    data = json.load(f)
+  def build():
+    with time_stage("summary_read"):
+      with open(path, "r") as f:
+        data = json.load(f)
+    with time_stage("serialize"):
+      body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    policy = FINAL_CACHE_CONTROL if data.get("status") == "final" else LIVE_CACHE_CONTROL
+    return body, policy
+
+  return cached_response(request, response_cache.get(f"summary:{game_id}", _stat_validator(path), build))
 
+
+@app.websocket("/api/games/{game_id}/live")
+async def live_game(websocket: WebSocket, game_id: str):
+  """Push a summary snapshot, then JSON merge patches whenever ingestion updates the game."""
+  await websocket.accept()
+  queue = broadcaster.subscribe(game_id)
+
+  async def pump():
+    while True:
+      await websocket.send_text(await queue.get())
+
+  sender = asyncio.create_task(pump())
+  try:
+    # Clients never need to send anything; reading only detects the disconnect.
+    while True:
+      await websocket.receive_text()
+  except WebSocketDisconnect:
+    pass
+  finally:
+    sender.cancel()
+    broadcaster.unsubscribe(game_id, queue)
+
+
+@app.get("/api/games/{game_id}/state")
+async def get_game_state(game_id: str, period: int | None = None, clock: str | None = None):
+  """Per-period splits, lead changes, runs, and (optionally) team stats at `period` / `clock` remaining."""
+  state = load_game_state(game_id, STRUCTURED_DIR)
+  if state is None:
+    raise HTTPException(status_code=404, detail="Game state not found for that game_id")
+
+  data = {"teams": state.teams, **state.derived}
+  if period is not None:
+    if period < 1 or period > state.last_period():
+      raise HTTPException(status_code=400, detail=f"period must be between 1 and {state.last_period()}")
+    data["at"] = {"period": period, "clock": clock or "0:00", "stats": state.stats_at(period, clock or 0.0)}
   return data
 
 
-@app.post("/api/games/{game_id}/ask", response_model=AskResponse)
-async def ask_about_game(game_id: str, payload: AskRequest):
+@app.get("/api/games/{game_id}/lineups")
+async def get_game_lineups(game_id: str):
+  """Stints, per-lineup plus-minus / net rating and per-player on/off splits for one game."""
+  import json
+
+  path = STRUCTURED_DIR / f"{game_id}_stints.json"
+  if not path.exists():
+    raise HTTPException(status_code=404, detail="Lineup data not found for that game_id")
+  with open(path, "r") as f:
+    data = json.load(f)
+
+  teams = data["teams"]
+  names = {pid: p["name"] for pid, p in data.get("players", {}).items()}
+  lineups = lineup_stats(data["stints"], teams)
+  for row in lineups:
+    row["players"] = [names.get(pid, pid) for pid in row["lineup"].split("-")]
+  on_off = player_on_off(data["stints"], teams)
+  for row in on_off:
+    row["name"] = names.get(str(row["player_id"]))
+  return {"teams": teams, "lineups": lineups, "onOff": on_off, "stints": data["stints"]}
+
+
+@app.get("/api/teams/{team}/lineups")
+async def get_team_lineups(
+  team: str,
+  startDate: str | None = None,
+  endDate: str | None = None,
+  minMinutes: float = 0,
+  limit: int = 20,
+):
+  """Lineup and on/off splits for `team` across every ingested game in the date range."""
+  team = team.strip().upper()
+  game_ids = find_games(team, startDate, endDate, STRUCTURED_DIR) if (startDate or endDate) else None
+  if game_ids is not None and not game_ids:
+    raise HTTPException(status_code=404, detail="No ingested games match that query")
+
+  with time_stage("lineup_query"):
+    lineups = query_lineups(team, game_ids, min_seconds=minMinutes * 60, limit=max(1, min(limit, 200)))
+    on_off = query_on_off(team, game_ids)
+  if not lineups:
+    raise HTTPException(status_code=404, detail=f"No lineup data for {team}")
+  return {"team": team, "lineups": lineups, "onOff": on_off}
+
+
+def _shot_chart_response(arrays: dict, team: str | None, player: int | None, teams: list[str]) -> dict:
+  if not arrays:
+    raise HTTPException(status_code=404, detail="Shot charts not found")
+  if player is not None:
+    data = chart(arrays, player_id=player)
+    if data is None:
+      raise HTTPException(status_code=404, detail=f"No shots for player {player}")
+    return {"player": player, **data}
+  charts = {t: chart(arrays, team=t) for t in ([team] if team else teams)}
+  charts = {t: c for t, c in charts.items() if c is not None}
+  if not charts:
+    raise HTTPException(status_code=404, detail=f"No shots for {team}")
+  return {"teams": charts}
+
+
+def _chart_teams(arrays: dict) -> list[str]:
+  return sorted({name.split(":")[1] for name in arrays if name.startswith("team:")})
+
+
+@app.get("/api/games/{game_id}/shots")
+async def get_game_shots(game_id: str, team: str | None = None, player: int | None = None):
+  """Precomputed shot grids and zone splits for one game, per team (default) or for one player."""
+  arrays = load_shot_charts(get_shots_path(game_id, STRUCTURED_DIR))
+  team = team.strip().upper() if team else None
+  return {"gameId": game_id, **_shot_chart_response(arrays, team, player, _chart_teams(arrays))}
+
+
+@app.get("/api/plays/search")
+async def get_play_search(
+  q: str | None = None,
+  gameId: List[str] | None = Query(None),
+  team: str | None = None,
+  player: str | None = None,
+  period: int | None = None,
+  eventType: str | None = None,
+  startDate: str | None = None,
+  endDate: str | None = None,
+  limit: int = 50,
+  offset: int = 0,
+):
+  """Full-text search over play descriptions with game / team / player / period / event-type filters.
+
+  `player` is a person id or a name; `startDate` / `endDate` select games via the catalog.
+  Results are paginated with `limit` / `offset`.
+  """
+  game_ids = list(gameId) if gameId else None
+  if startDate or endDate:
+    in_range = find_games(None, startDate, endDate, STRUCTURED_DIR)
+    game_ids = [gid for gid in game_ids if gid in in_range] if game_ids else in_range
+    if not game_ids:
+      raise HTTPException(status_code=404, detail="No ingested games match that query")
+  if not any((q, game_ids, team, player, period, eventType)):
+    raise HTTPException(status_code=400, detail="Provide a search term or at least one filter")
+
+  with time_stage("play_search"):
+    return search_plays(q, game_ids, team, player, period, eventType, limit=limit, offset=offset)
+
+
+def _ensure_retriever() -> HybridRetriever:
+  global retriever
+
+  # The play vector index is optional: without it (or its dependencies) retrieval is lexical only.
+  if retriever is None:
+    store = None
+    try:
+      from src.embeddings.build_index import PLAY_INDEX_PATH, load_play_index
+      if (BASE_DIR / PLAY_INDEX_PATH).exists():
+        store = load_play_index(BASE_DIR / PLAY_INDEX_PATH)
+    except ImportError as e:
+      print(f"Play vector index unavailable ({e}); using lexical retrieval only")
+    retriever = HybridRetriever(store)
+  return retriever
+
+
+@app.get("/api/plays/retrieve")
+async def get_play_retrieval(
+  q: str,
+  gameId: List[str] | None = Query(None),
+  k: int = 10,
+  mode: str = "hybrid",
+):
+  """Plays most relevant to a natural-language question (BM25 + embeddings, fused).
+
+  Period, team and player filters are parsed from the question itself.
+  """
+  if mode not in RETRIEVAL_MODES:
+    raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(RETRIEVAL_MODES)}")
+  r = _ensure_retriever()
+  if mode != "lexical" and r.vector_store is None:
+    mode = "lexical"
+  game_ids = list(gameId) if gameId else None
+  return {
+    "mode": mode,
+    "filters": r.filters(q, game_ids),
+    "results": r.retrieve(q, max(1, min(k, 100)), game_ids, mode),
+  }
+
+
+@app.get("/api/seasons/{season}/shots")
+async def get_season_shots(season: str, team: str | None = None, player: int | None = None):
+  """Season-total shot grids; `season` is the two-digit year in the game id (e.g. 25 for 2025-26)."""
+  arrays = load_shot_charts(get_season_path(season, STRUCTURED_DIR))
+  team = team.strip().upper() if team else None
+  return {"season": season, **_shot_chart_response(arrays, team, player, _chart_teams(arrays))}
+
+
+@app.get("/api/export/{kind}")
+async def export_games(
+  kind: str,
+  format: str = "arrow",
+  gameId: List[str] | None = Query(None),
+  team: str | None = None,
+  startDate: str | None = None,
+  endDate: str | None = None,
+):
+  """Parsed plays or team box scores for many games as an Arrow IPC stream or a Parquet file.
+
+  Games are `gameId` (repeatable) and/or those matching `team` / `startDate` / `endDate`
+  in the catalog; with no selector every catalogued game is exported. Rows come straight
+  from the per-game Parquet files written at ingest. `X-Playmind-Games` is the number of
+  games exported; selected games with no stored data are listed in `X-Playmind-Missing-Games`.
+  """
+  if kind not in EXPORT_KINDS:
+    raise HTTPException(status_code=404, detail=f"Unknown export {kind!r}; use one of {', '.join(EXPORT_KINDS)}")
+  if format not in EXPORT_FORMATS:
+    raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+  game_ids = list(gameId) if gameId else None
+  if team or startDate or endDate or game_ids is None:
+    matching = find_games(team, startDate, endDate, STRUCTURED_DIR)
+    game_ids = [gid for gid in game_ids if gid in matching] if game_ids else matching
+  if game_ids:
+    game_ids, missing = await run_in_threadpool(exportable_games, kind, game_ids, STRUCTURED_DIR)
+  if not game_ids:
+    raise HTTPException(status_code=404, detail="No ingested games match that query")
+
+  dates = {gid: entry.get("date") for gid, entry in load_catalog(STRUCTURED_DIR)["games"].items()}
+  tables = iter_game_tables(kind, game_ids, dates, STRUCTURED_DIR)
+  headers = {"X-Playmind-Games": str(len(game_ids))}
+  if missing:
+    headers["X-Playmind-Missing-Games"] = ",".join(missing)
+
+  if format == "arrow":
+    # Generated in Starlette's threadpool, one game's record batches at a time.
+    return StreamingResponse(iter_arrow_stream(kind, tables), media_type=MEDIA_TYPES["arrow"], headers=headers)
+
+  # Parquet needs its footer written last, so the file is built on disk and then sent.
+  fd, tmp_name = tempfile.mkstemp(prefix=f"playmind-{kind}-", suffix=".parquet")
+  os.close(fd)
+  try:
+    with time_stage("export_parquet"):
+      await run_in_threadpool(write_parquet_export, kind, tables, Path(tmp_name))
+  except Exception:
+    os.unlink(tmp_name)
+    raise
+  record_bytes("export_parquet", os.path.getsize(tmp_name))
+  return FileResponse(
+    tmp_name,
+    media_type=MEDIA_TYPES["parquet"],
+    filename=f"playmind_{kind}.parquet",
+    headers=headers,
+    background=BackgroundTask(os.unlink, tmp_name),
+  )
+
+
+def build_game_context(game_ids: List[str]) -> str:
+  """Concatenate the ingest-time context snapshots for `game_ids` (see src.utils.context_snapshot).
+
+  Missing snapshots are rendered from the summary; returns "" if none of the games has one.
+  """
+  context, _ = assemble_context(game_ids, STRUCTURED_DIR)
+  return context
+
+
+def build_comparison_context(game_ids: List[str], team: str | None = None) -> str:
+  """Aggregate many games into one bounded-size comparison block (see src.service.comparison)."""
+  summaries = load_summaries(game_ids, STRUCTURED_DIR)
+  catalog_games = load_catalog(STRUCTURED_DIR)["games"]
+  dates = {gid: catalog_games.get(gid, {}).get("date") for gid in summaries}
+  rows = build_rows(summaries, dates, team)
+  return format_comparison_context(rows, team)
+
+
+def _ensure_llm():
   global llm, prompt
 
   # Lazily build the LLM and prompt on first use to avoid blocking startup
-  if llm is None or prompt is None:
-    llm = build_llm()
-    prompt = build_prompt()
+  with _llm_lock:
+    if llm is None or prompt is None:
+      llm = build_llm()
+      prompt = build_prompt()
 
-  if not payload.question.strip():
+
+def _answer(context: str, question: str) -> str:
+  input_text = prompt.format(context=context, question=question)
+  record_bytes("context", len(input_text.encode("utf-8")))
+
+  result = llm.invoke(input_text)
+
+  with time_stage("serialize"):
+    if isinstance(result, dict) and "generated_text" in result:
+      return str(result["generated_text"]).strip()
+    return str(result).strip()
+
+
+@app.post("/api/games/query", response_model=QueryResponse)
+async def query_games(payload: QueryRequest):
+  """Ask about many games at once, resolved by explicit ids or team / date range from the catalog."""
+  question = payload.question.strip()
+  if not question:
     raise HTTPException(status_code=400, detail="Question must not be empty")
-  import json
 
-  # Determine which game IDs to include in context
-  game_ids = payload.gameIds or [game_id]
+  team = payload.team.strip().upper() if payload.team else None
+  if not team and not payload.gameIds:
+    # "How did BOS do this month?" / "How did the Celtics do?" -> pick up a known team from the question
+    mentioned = teams_in_question(question, known_teams(STRUCTURED_DIR))
+    if len(mentioned) == 1:
+      team = mentioned[0]
 
-  contexts: List[str] = []
-  for gid in game_ids:
-    path = STRUCTURED_DIR / f"{gid}_summary.json"
-    if not path.exists():
-      continue
+  with time_stage("context_build"):
+    if payload.gameIds:
+      game_ids = payload.gameIds
+    else:
+      game_ids = find_games(team, payload.startDate, payload.endDate, STRUCTURED_DIR)
+    context = build_comparison_context(game_ids, team) if game_ids else ""
 
-    with open(path, "r") as f:
-      summary = json.load(f)
+  if not context:
+    raise HTTPException(status_code=404, detail="No ingested games match that query")
 
-    teams = summary.get("teams", [])
-    fs = summary.get("final_score", {})
+  _ensure_llm()
+  answer = await run_in_threadpool(_answer, context, question)
+  return QueryResponse(answer=answer, gameIds=game_ids)
 
-    lines = []
-    if len(teams) >= 2:
-      lines.append(f"Game {gid}: {teams[0]} vs {teams[1]}.")
-    if fs and len(teams) >= 2:
-      lines.append(
-        f"Final Score — {teams[0]}: {fs.get(teams[0], 'N/A')}, {teams[1]}: {fs.get(teams[1], 'N/A')}."
-      )
 
-    for stat in [
-      "three_pointers",
-      "field_goals",
-      "free_throws",
-      "turnovers",
-      "rebounds",
-      "fouls",
-      "steals",
-      "blocks",
-      "timeouts",
-      "substitutions",
-      "scoring_runs",
-    ]:
-      s = summary.get(stat, {})
-      if len(teams) >= 2 and s:
-        lines.append(
-          f"{stat.replace('_', ' ').title()} — {teams[0]}: {s.get(teams[0], 'N/A')}, {teams[1]}: {s.get(teams[1], 'N/A')}."
-        )
-
-    narrative = summary.get("narrative", "")
-    if narrative:
-      lines.append(f"Narrative: {narrative}")
-
-    # Also include the full aggregate summary JSON so the LLM can see all stats/fields
-    try:
-      lines.append(f"RawSummaryJSON: {json.dumps(summary)}")
-    except Exception:
-      # If for some reason the summary isn't serializable, skip this line
-      pass
+@app.post("/api/games/{game_id}/ask", response_model=AskResponse)
+async def ask_about_game(game_id: str, payload: AskRequest):
+  if not payload.question.strip():
+    raise HTTPException(status_code=400, detail="Question must not be empty")
 
-    contexts.append("\n".join(lines))
+  # Determine which game IDs to include in context
+  game_ids = payload.gameIds or [game_id]
 
-  if not contexts:
+  # Plain stat lookups on a single game are answered from the summary directly
+  if len(game_ids) == 1:
+    with time_stage("router"):
+      routed = route_question(
+        payload.question,
+        load_summary(game_ids[0], STRUCTURED_DIR),
+        load_game_state(game_ids[0], STRUCTURED_DIR),
+      )
+    if routed is not None:
+      ROUTER_DECISIONS.inc(route="fast_path")
+      return AskResponse(answer=routed, source="fast_path")
+  ROUTER_DECISIONS.inc(route="llm")
+
+  with time_stage("context_build"):
+    if len(game_ids) > MULTI_GAME_THRESHOLD:
+      context = build_comparison_context(game_ids)
+    else:
+      context = build_game_context(game_ids)
+  if not context:
     raise HTTPException(status_code=404, detail="No summaries found for the requested games")
 
-  context = "\n\n".join(contexts)
+  # Only questions the router can't answer need the LLM built.
+  _ensure_llm()
+  # Off the event loop so concurrent asks overlap (and the local backend can batch them).
+  return AskResponse(answer=await run_in_threadpool(_answer, context, payload.question))
 
-  input_text = prompt.format(context=context, question=payload.question)
-  result = llm.invoke(input_text)
 
-  if isinstance(result, dict) and "generated_text" in result:
-    answer_text: str = str(result["generated_text"]).strip()
-  else:
-    answer_text = str(result).strip()
+@app.post("/api/games/{game_id}/ask/batch", response_model=BatchAskResponse)
+async def ask_batch_about_game(game_id: str, payload: BatchAskRequest):
+  """Answer many questions with one shared context and, where possible, one LLM completion."""
+  questions = [q.strip() for q in payload.questions]
+  if not questions or not all(questions):
+    raise HTTPException(status_code=400, detail="questions must be a non-empty list of non-empty strings")
+  if len(questions) > MAX_BATCH_QUESTIONS:
+    raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_QUESTIONS} questions per batch")
+
+  game_ids = payload.gameIds or [game_id]
+
+  # Stat lookups never reach the LLM; only the remaining questions are batched.
+  answers: dict[int, BatchAnswer] = {}
+  if len(game_ids) == 1:
+    summary = load_summary(game_ids[0], STRUCTURED_DIR)
+    state = load_game_state(game_ids[0], STRUCTURED_DIR)
+    with time_stage("router"):
+      for i, question in enumerate(questions):
+        routed = route_question(question, summary, state)
+        if routed is not None:
+          answers[i] = BatchAnswer(question=question, answer=routed, source="fast_path")
+  ROUTER_DECISIONS.inc(len(answers), route="fast_path")
+
+  pending = [i for i in range(len(questions)) if i not in answers]
+  if pending:
+    ROUTER_DECISIONS.inc(len(pending), route="llm")
+
+    with time_stage("context_build"):
+      if len(game_ids) > MULTI_GAME_THRESHOLD:
+        context = build_comparison_context(game_ids)
+      else:
+        context = build_game_context(game_ids)
+    if not context:
+      raise HTTPException(status_code=404, detail="No summaries found for the requested games")
+    record_bytes("context", len(context.encode("utf-8")))
+
+    _ensure_llm()
+    results = await run_in_threadpool(
+      answer_batch, llm, context, [questions[i] for i in pending], lambda q: _answer(context, q)
+    )
+    for i, (answer, source) in zip(pending, results):
+      answers[i] = BatchAnswer(question=questions[i], answer=str(answer).strip(), source=source)
 
-  return AskResponse(answer=answer_text)
+  return BatchAskResponse(answers=[answers[i] for i in range(len(questions))])
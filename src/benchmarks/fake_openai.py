@@ -0,0 +1,169 @@
+"""Local stand-in for the OpenAI chat completions API with injectable faults.
+
+Serves `POST /v1/chat/completions` and answers every request with a fixed
+completion after a configurable delay. A fraction of requests can be made slow
+(tail latency), rejected with 429 (rate limit, with Retry-After) or failed
+with 500, and the whole server can be switched "down". The `FakeOpenAIConfig`
+returned by `serve_fake_openai` can be changed while the server runs.
+
+Point the real client at it with OPENAI_BASE_URL:
+
+  python -m src.benchmarks.fake_openai --port 8001 --latency 0.2 --slow-rate 0.05 --slow-latency 3
+  OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=fake uvicorn src.api.server:app
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class FakeOpenAIConfig:
+    latency: float = 0.05          # seconds before every response
+    jitter: float = 0.0            # extra uniform random delay in [0, jitter]
+    slow_rate: float = 0.0         # fraction of requests that take `slow_latency` instead
+    slow_latency: float = 2.0
+    rate_limit_rate: float = 0.0   # fraction answered with 429
+    retry_after: float = 0.1
+    error_rate: float = 0.0        # fraction answered with 500
+    down: bool = False             # every request fails with 503
+    content: str = "Not enough information."
+    seed: int | None = None
+
+    def __post_init__(self):
+        self.requests = 0
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> tuple[float, float]:
+        with self._lock:
+            self.requests += 1
+            return self._rng.random(), self._rng.random()
+
+
+def _completion(config: FakeOpenAIConfig, body: dict) -> dict:
+    messages = body.get("messages", [])
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+    content = config.content
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        # Batched ask: one answer per "Q<n>:" line of the user message
+        ids = re.findall(r"^Q(\d+):", str(messages[-1].get("content", "")) if messages else "", re.M)
+        content = json.dumps({"answers": [{"id": int(i), "answer": config.content} for i in ids]})
+    return {
+        "id": f"chatcmpl-fake-{config.requests}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_chars // 4 + len(content) // 4,
+        },
+    }
+
+
+def _handler(config: FakeOpenAIConfig):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, payload: dict, headers: dict | None = None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client gave up (deadline / hedge won)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                body = {}
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send(404, {"error": {"message": "not found"}})
+                return
+
+            fault, slow = config.draw()
+            if config.down:
+                self._send(503, {"error": {"message": "service unavailable", "type": "server_error"}})
+                return
+            if fault < config.rate_limit_rate:
+                self._send(
+                    429,
+                    {"error": {"message": "rate limited", "type": "rate_limit_exceeded"}},
+                    {"Retry-After": str(config.retry_after)},
+                )
+                return
+            if fault < config.rate_limit_rate + config.error_rate:
+                self._send(500, {"error": {"message": "internal error", "type": "server_error"}})
+                return
+
+            delay = config.slow_latency if slow < config.slow_rate else config.latency
+            time.sleep(delay + random.uniform(0, config.jitter))
+            self._send(200, _completion(config, body))
+
+    return Handler
+
+
+@contextmanager
+def serve_fake_openai(config: FakeOpenAIConfig | None = None, port: int = 0):
+    """Run the fake API on localhost; yields (base_url, config). base_url ends in /v1."""
+    config = config or FakeOpenAIConfig()
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(config))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        yield f"http://{host}:{port}/v1", config
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat completions server")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-latency", type=float, default=2.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    config = FakeOpenAIConfig(
+        latency=args.latency, jitter=args.jitter,
+        slow_rate=args.slow_rate, slow_latency=args.slow_latency,
+        rate_limit_rate=args.rate_limit_rate, error_rate=args.error_rate,
+    )
+    with serve_fake_openai(config, args.port) as (base_url, _):
+        print(f"Fake OpenAI API listening on {base_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
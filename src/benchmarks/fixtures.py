@@ -0,0 +1,77 @@
+"""Offline stand-ins used by the benchmark suite.
+
+- `serve_directory` runs a local HTTP server that mimics the NBA CDN layout.
+- `StubLLM` replaces `OpenAIChatLLM` with a constant-time answer.
+- `HashEmbeddings` is a deterministic LangChain-compatible embedding model so
+  index builds can be measured without downloading MiniLM.
+"""
+
+import hashlib
+import json
+import math
+import re
+import threading
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_directory(directory: str):
+    """Serve `directory` over HTTP on a free localhost port; yields the base URL."""
+    handler = partial(_QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        yield f"http://{host}:{port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+class StubLLM:
+    """Drop-in for `OpenAIChatLLM` that answers instantly and records prompt sizes."""
+
+    def __init__(self, answer: str = "Not enough information."):
+        self.answer = answer
+        self.calls = 0
+        self.prompt_chars = 0
+
+    def invoke(self, input_text: str, system: str | None = None,
+               max_completion_tokens: int = 80, json_mode: bool = False):
+        self.calls += 1
+        self.prompt_chars += len(input_text)
+        if json_mode:
+            # Batched ask: one answer per "Q<n>:" line, in the format batch_qa expects
+            ids = [int(n) for n in re.findall(r"^Q(\d+):", input_text, re.M)]
+            return json.dumps({"answers": [{"id": i, "answer": self.answer} for i in ids]})
+        return self.answer
+
+
+class HashEmbeddings:
+    """Cheap deterministic bag-of-words embeddings (implements the LangChain Embeddings API)."""
+
+    def __init__(self, dim: int = 64):
+        self.dim = dim
+
+    def _embed(self, text: str) -> list[float]:
+        vec = [0.0] * self.dim
+        for token in text.lower().split():
+            h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
@@ -0,0 +1,132 @@
+"""Latency and throughput of the remote (OpenAI) and local (CPU) LLM backends on the same prompts.
+
+Prompts are real /ask prompts: synthetic games are run through the pipeline,
+rendered into their context snapshots, and combined with a fixed set of
+analysis questions using the API's prompt template. Every backend then
+answers the same prompts at each concurrency level:
+
+  remote          OpenAIChatLLM against the fake OpenAI server (`--remote-latency`
+                  seconds per call), or the real API with `--remote openai`
+  local           the local model with micro-batching (PLAYMIND_LOCAL_MAX_BATCH)
+  local_unbatched the local model with batches of one, to isolate the batching gain
+
+The local model is loaded and warmed up before timing, as the API does at startup.
+
+Usage:
+  python -m src.benchmarks.llm_backends
+  python -m src.benchmarks.llm_backends --callers 1 4 16 --requests 64 --remote openai
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from src.benchmarks.fake_openai import FakeOpenAIConfig, serve_fake_openai
+from src.benchmarks.llm_load import drive
+
+
+QUESTIONS = (
+    "Why did the winning team win?",
+    "Which quarter decided the game and why?",
+    "How did turnovers affect the result?",
+    "Compare the two teams' three-point shooting.",
+    "Who was the most important player and why?",
+    "Did either team have a big scoring run?",
+    "How did the bench or substitutions matter?",
+    "What was the biggest difference between the teams?",
+)
+
+
+def build_prompts(n_games: int, seed: int) -> list[str]:
+    """One /ask prompt per (game, question), built exactly as the API builds them."""
+    from src.benchmarks.retrieval_eval import load_games
+    from src.rag.qa_engine import build_prompt
+    from src.utils.context_snapshot import build_snapshot
+    from src.utils.game_state import build_game_state
+    from src.utils.summarize_parsed_data import summarize_parsed_game
+
+    prompt = build_prompt()
+    prompts = []
+    with tempfile.TemporaryDirectory(prefix="playmind-llm-") as tmp:
+        work_dir = Path(tmp)
+        plays_by_game = load_games(work_dir, n_games, 480, seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for gid, plays in plays_by_game.items():
+                parsed_path = work_dir / f"{gid}_parsed.json"
+                parsed_path.write_text(json.dumps(plays))
+                summary = summarize_parsed_game(str(parsed_path))
+                state = build_game_state(plays, summary["teams"])
+                context = build_snapshot(gid, summary, state)["text"]
+                prompts.extend(prompt.format(context=context, question=q) for q in QUESTIONS)
+    return prompts
+
+
+@contextlib.contextmanager
+def backends(names: list[str], remote: str, remote_latency: float, max_batch: int):
+    """Yield {name: llm} for the requested backends (the fake server runs for the duration)."""
+    from src.rag.llm_client import build_llm
+
+    llms = {}
+    with contextlib.ExitStack() as stack:
+        if "remote" in names:
+            if remote == "fake":
+                base_url, _ = stack.enter_context(serve_fake_openai(FakeOpenAIConfig(latency=remote_latency, seed=1)))
+                from openai import OpenAI
+
+                from src.rag.llm_client import OpenAIChatLLM
+                llms["remote"] = OpenAIChatLLM(OpenAI(base_url=base_url, api_key="fake", max_retries=0),
+                                               "fake-model", max_concurrency=64)
+            else:
+                llms["remote"] = build_llm("openai", max_concurrency=64)
+        if "local" in names:
+            llms["local"] = build_llm("local", max_batch=max_batch)
+        if "local_unbatched" in names:
+            llms["local_unbatched"] = build_llm("local", max_batch=1)
+        for llm in llms.values():
+            if hasattr(llm, "warm"):
+                llm.warm()
+            llm.invoke("Game Data: warm-up\n\nQuestion: Who won?")
+        yield llms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Remote vs. local LLM backend latency / throughput")
+    parser.add_argument("--backend", action="append", choices=("remote", "local", "local_unbatched"),
+                        help="backends to compare (default: all)")
+    parser.add_argument("--remote", choices=("fake", "openai"), default="fake")
+    parser.add_argument("--remote-latency", type=float, default=0.5, help="fake server seconds per call")
+    parser.add_argument("--callers", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--requests", type=int, default=32, help="requests per backend and concurrency level")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--games", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    prompts = build_prompts(args.games, args.seed)
+    names = args.backend or ["remote", "local", "local_unbatched"]
+
+    rows = []
+    print(f"{len(prompts)} prompts, {args.requests} requests per run")
+    print(f"{'backend':<18}{'callers':>8}{'p50':>9}{'p95':>9}{'max':>9}{'req/s':>9}  outcomes")
+    with backends(names, args.remote, args.remote_latency, args.max_batch) as llms:
+        for name in names:
+            for callers in args.callers:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    r = drive(llms[name], args.requests, callers, prompts)
+                rows.append({"backend": name, "callers": callers, **r})
+                print(
+                    f"{name:<18}{callers:>8}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['max_ms']:>9.1f}"
+                    f"{r['throughput_per_s']:>9.1f}  {r['outcomes']}"
+                )
+    if args.json:
+        args.json.write_text(json.dumps({"config": vars(args) | {"json": str(args.json)}, "results": rows}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Load scenarios for the resilient LLM client against the fake OpenAI server.
+
+Each scenario starts `fake_openai` with injected latency / faults, fires
+concurrent `invoke` calls through `OpenAIChatLLM`, and reports latency
+percentiles and outcomes:
+
+  tail      5% of requests are slow; plain client vs. hedged requests
+  ratelimit 20% of requests get 429 + Retry-After; backoff absorbs them
+  deadline  the provider is slower than the per-request deadline
+  outage    the provider returns 503; the circuit breaker starts failing fast
+
+Usage:
+  python -m src.benchmarks.llm_load
+  python -m src.benchmarks.llm_load --scenario tail --requests 400 --callers 32
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from src.benchmarks.fake_openai import FakeOpenAIConfig, serve_fake_openai
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))] if values else 0.0
+
+
+def drive(llm, n_requests: int, callers: int, prompts: list[str] | None = None) -> dict:
+    """Send `n_requests` invokes from `callers` threads; returns latency stats and outcomes.
+
+    Requests cycle through `prompts` if given, otherwise use a tiny synthetic prompt.
+    """
+    from src.rag.llm_client import LLMQueueTimeout, LLMTimeout, LLMUnavailable
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            llm.invoke(prompts[i % len(prompts)] if prompts else f"Game Data: synthetic\n\nQuestion: load test {i}")
+            outcome = "ok"
+        except LLMQueueTimeout:
+            outcome = "queue_timeout"
+        except LLMTimeout:
+            outcome = "timeout"
+        except LLMUnavailable as e:
+            outcome = "circuit_open" if "circuit" in str(e) else "unavailable"
+        return (time.perf_counter() - start) * 1000, outcome
+
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        results = list(pool.map(one, range(n_requests)))
+    wall = time.perf_counter() - wall
+
+    latencies = [ms for ms, _ in results]
+    return {
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(_percentile(latencies, 0.95), 1),
+        "p99_ms": round(_percentile(latencies, 0.99), 1),
+        "max_ms": round(max(latencies), 1),
+        "throughput_per_s": round(n_requests / wall, 1),
+        "outcomes": dict(Counter(outcome for _, outcome in results)),
+    }
+
+
+def _client(base_url: str, **overrides):
+    from openai import OpenAI
+
+    from src.rag.llm_client import OpenAIChatLLM
+
+    return OpenAIChatLLM(OpenAI(base_url=base_url, api_key="fake", max_retries=0), "fake-model", **overrides)
+
+
+def scenario_tail(n: int, callers: int) -> list[tuple[str, dict]]:
+    config = FakeOpenAIConfig(latency=0.05, jitter=0.02, slow_rate=0.05, slow_latency=1.0, seed=1)
+    with serve_fake_openai(config) as (base_url, _):
+        plain = drive(_client(base_url, max_concurrency=callers), n, callers)
+        hedged = drive(_client(base_url, max_concurrency=callers * 2, hedge_after=0.15), n, callers)
+    return [("tail_plain", plain), ("tail_hedged", hedged)]
+
+
+def scenario_ratelimit(n: int, callers: int) -> list[tuple[str, dict]]:
+    config = FakeOpenAIConfig(latency=0.02, rate_limit_rate=0.2, retry_after=0.05, seed=2)
+    with serve_fake_openai(config) as (base_url, _):
+        return [("ratelimit_backoff", drive(_client(base_url, max_concurrency=callers), n, callers))]
+
+
+def scenario_deadline(n: int, callers: int) -> list[tuple[str, dict]]:
+    config = FakeOpenAIConfig(latency=1.0, seed=3)
+    with serve_fake_openai(config) as (base_url, _):
+        # A tiny concurrency cap also shows requests timing out while queued.
+        llm = _client(base_url, timeout=0.3, max_concurrency=max(1, callers // 4))
+        return [("deadline_0.3s", drive(llm, min(n, 4 * callers), callers))]
+
+
+def scenario_outage(n: int, callers: int) -> list[tuple[str, dict]]:
+    from src.rag.llm_client import CircuitBreaker
+
+    config = FakeOpenAIConfig(down=True)
+    with serve_fake_openai(config) as (base_url, cfg):
+        llm = _client(base_url, max_concurrency=callers, max_retries=1, breaker=CircuitBreaker(5, reset_after=60))
+        stats = drive(llm, n, callers)
+        stats["provider_requests"] = cfg.requests
+    return [("outage_breaker", stats)]
+
+
+SCENARIOS = {
+    "tail": scenario_tail,
+    "ratelimit": scenario_ratelimit,
+    "deadline": scenario_deadline,
+    "outage": scenario_outage,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resilient LLM client load scenarios")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--callers", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    print(f"{'scenario':<20}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'req/s':>9}  outcomes")
+    for name in args.scenario or list(SCENARIOS):
+        for label, r in SCENARIOS[name](args.requests, args.callers):
+            extra = f" provider_requests={r['provider_requests']}" if "provider_requests" in r else ""
+            print(
+                f"{label:<20}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}"
+                f"{r['throughput_per_s']:>9.1f}  {r['outcomes']}{extra}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
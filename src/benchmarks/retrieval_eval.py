@@ -0,0 +1,196 @@
+"""Recall@k and latency of lexical, vector and hybrid play retrieval.
+
+Synthetic games are fetched and parsed through the real pipeline, indexed
+into a scratch FTS5 database and play-level Chroma index, and a labelled
+question set is generated from their plays. Every question has a known set
+of relevant plays, e.g.
+
+  "S. Carter floating jump shots in the 4th quarter"  -> that player's floating jump shots in Q4
+  "When did Carter reach 17 points?"                   -> the play ending "(17 PTS)"
+  "PHX turnovers in the first half"                    -> PHX turnovers in periods 1-2
+  "three-pointers Carter made in the third quarter"    -> his made 3PT shots in Q3 (paraphrase)
+
+Each question is asked against its own game, as the QA endpoints do.
+recall@k is |relevant ∩ top k| / min(|relevant|, k).
+
+Usage:
+  python -m src.benchmarks.retrieval_eval
+  python -m src.benchmarks.retrieval_eval --games 10 --per-game 30 --k 5 10 20 --embeddings minilm
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import re
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from src.benchmarks.fixtures import HashEmbeddings, serve_directory
+from src.benchmarks.synthetic_games import write_synthetic_games
+from src.rag.hybrid_retrieval import MODES, HybridRetriever
+from src.service.play_search import index_game_plays
+
+
+ORDINALS = {1: "1st", 2: "2nd", 3: "3rd", 4: "4th"}
+QUARTER_WORDS = {1: "first", 2: "second", 3: "third", 4: "fourth"}
+
+_SHOT_NAME = re.compile(r"\d+' (?:3PT )?(.+?)(?: \(\d+ PTS\))?$")
+_POINTS = re.compile(r"\((\d+) PTS\)")
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))] if values else 0.0
+
+
+def _surname(player: str) -> str:
+    return player.split(". ", 1)[-1]
+
+
+def _keys(game_id: str, plays: list[dict], pred) -> set[tuple[str, int]]:
+    return {(game_id, seq) for seq, p in enumerate(plays) if p.get("description") and pred(p)}
+
+
+def labelled_questions(plays_by_game: dict[str, list[dict]], per_game: int = 20, seed: int = 7) -> list[dict]:
+    """Questions with their relevant (game_id, seq) sets, drawn from the plays of each game."""
+    rng = random.Random(seed)
+    questions = []
+    for game_id, plays in plays_by_game.items():
+        shots = [p for p in plays if str(p.get("event_type") or "").startswith(("SHOT_", "3PT_"))
+                 and p.get("period", 0) in ORDINALS and _SHOT_NAME.search(p["description"])]
+        scoring = [p for p in plays if p.get("player") and _POINTS.search(p["description"] or "")]
+        teams = sorted({p["team"] for p in plays if p.get("event_type") == "TURNOVER"})
+
+        def shot_type(p=None):
+            p = p or rng.choice(shots)
+            name = _SHOT_NAME.search(p["description"]).group(1)
+            period, player = p["period"], p["player"]
+            q = f"{player} {name.lower()}s in the {ORDINALS[period]} quarter"
+            return q, _keys(game_id, plays, lambda x: x.get("player") == player and x["period"] == period
+                            and str(x.get("event_type") or "").startswith(("SHOT_", "3PT_"))
+                            and name in x["description"])
+
+        def milestone():
+            p = rng.choice(scoring)
+            pts = _POINTS.search(p["description"]).group(1)
+            q = f"When did {_surname(p['player'])} reach {pts} points?"
+            return q, _keys(game_id, plays, lambda x: x.get("player") == p["player"]
+                            and f"({pts} PTS)" in x["description"])
+
+        def team_turnovers():
+            team, first = rng.choice(teams), rng.random() < 0.5
+            periods = (1, 2) if first else (3, 4)
+            q = f"{team} turnovers in the {'first' if first else 'second'} half"
+            return q, _keys(game_id, plays, lambda x: x.get("team") == team and x["period"] in periods
+                            and x.get("event_type") == "TURNOVER")
+
+        def made_threes():
+            p = rng.choice([s for s in shots if s.get("event_type") == "3PT_MADE"] or shots)
+            period, player = p["period"], p["player"]
+            q = f"three-pointers {_surname(player)} made in the {QUARTER_WORDS[period]} quarter"
+            return q, _keys(game_id, plays, lambda x: x.get("player") == player and x["period"] == period
+                            and x.get("event_type") == "3PT_MADE")
+
+        makers = [shot_type, milestone, team_turnovers, made_threes]
+        for _ in range(per_game):
+            question, relevant = rng.choice(makers)()
+            if relevant:
+                questions.append({"question": question, "game_id": game_id, "relevant": relevant})
+    return questions
+
+
+def evaluate(retriever: HybridRetriever, questions: list[dict], ks=(5, 10), modes=MODES) -> list[dict]:
+    """Mean recall@k and latency percentiles per retrieval mode."""
+    rows = []
+    for mode in modes:
+        recalls = {k: [] for k in ks}
+        latencies = []
+        for q in questions:
+            start = time.perf_counter()
+            results = retriever.retrieve(q["question"], max(ks), [q["game_id"]], mode)
+            latencies.append((time.perf_counter() - start) * 1000)
+            keys = [(r["game_id"], r["seq"]) for r in results]
+            for k in ks:
+                hits = len(q["relevant"] & set(keys[:k]))
+                recalls[k].append(hits / min(len(q["relevant"]), k))
+        rows.append({
+            "mode": mode,
+            "questions": len(questions),
+            **{f"recall@{k}": round(statistics.fmean(recalls[k]), 3) for k in ks},
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(_percentile(latencies, 0.95), 2),
+        })
+    return rows
+
+
+def load_games(work_dir: Path, n_games: int, n_actions: int, seed: int) -> dict[str, list[dict]]:
+    """Synthetic games run through save_game_csv and parse_game_data; returns parsed plays per game."""
+    from src.ingestion import nba_data_loader
+    from src.utils.parse_game_data import parse_game_data
+
+    game_ids = write_synthetic_games(work_dir / "cdn", n_games, n_actions, seed=seed)
+    plays_by_game = {}
+    with serve_directory(work_dir / "cdn") as base_url, contextlib.redirect_stdout(io.StringIO()):
+        nba_data_loader.CDN_BASE_URL = base_url
+        for gid in game_ids:
+            csv_path = work_dir / f"{gid}_game_data.csv"
+            nba_data_loader.save_game_csv(gid, csv_path)
+            plays_by_game[gid] = parse_game_data(gid, str(csv_path))
+    return plays_by_game
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play retrieval recall@k / latency evaluation")
+    parser.add_argument("--games", type=int, default=6)
+    parser.add_argument("--actions", type=int, default=480)
+    parser.add_argument("--per-game", type=int, default=25, help="labelled questions per game")
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 10])
+    parser.add_argument("--embeddings", choices=("hash", "minilm"), default="hash",
+                        help="hash = deterministic stand-in, minilm = the production model")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="playmind-retrieval-") as tmp:
+        work_dir = Path(tmp)
+        db_path = work_dir / "playmind.db"
+        plays_by_game = load_games(work_dir, args.games, args.actions, args.seed)
+        for gid, plays in plays_by_game.items():
+            index_game_plays(gid, plays, db_path)
+
+        store, modes = None, ("lexical",)
+        try:
+            from src.embeddings.build_index import EMBEDDING_MODEL, build_play_index
+        except ImportError as e:
+            print(f"Vector retrieval unavailable ({e}); evaluating lexical only.")
+        else:
+            if args.embeddings == "minilm":
+                from langchain_huggingface import HuggingFaceEmbeddings
+                embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+            else:
+                embeddings = HashEmbeddings()
+            with contextlib.redirect_stdout(io.StringIO()):
+                store = build_play_index(plays_by_game, work_dir / "play_index", embeddings)
+            modes = MODES
+
+        questions = labelled_questions(plays_by_game, args.per_game, args.seed)
+        rows = evaluate(HybridRetriever(store, db_path), questions, tuple(args.k), modes)
+
+    header = f"{'mode':<10}" + "".join(f"{f'recall@{k}':>12}" for k in args.k) + f"{'p50 ms':>10}{'p95 ms':>10}"
+    print(f"{len(questions)} labelled questions over {args.games} games ({args.embeddings} embeddings)")
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['mode']:<10}" + "".join(f"{r[f'recall@{k}']:>12.3f}" for k in args.k)
+              + f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}")
+    if args.json:
+        args.json.write_text(json.dumps({"config": vars(args) | {"json": str(args.json)}, "results": rows}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,369 @@
+"""Reproducible benchmark suite for the PlayMind pipeline.
+
+Generates synthetic CDN games, serves them from a local HTTP fixture, and
+measures each stage of the pipeline plus the read/ask paths of the API with a
+stub LLM. Results are compared against a stored baseline and the run fails
+(exit code 1) when a case regresses beyond the tolerance.
+
+Usage:
+  python -m src.benchmarks.suite                       # run and compare
+  python -m src.benchmarks.suite --update-baseline     # record a new baseline
+  python -m src.benchmarks.suite --games 50 --actions 600 --overtime 2 --iterations 5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from src.benchmarks.fixtures import HashEmbeddings, StubLLM, serve_directory
+from src.benchmarks.synthetic_games import write_synthetic_games
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Metrics compared against the baseline; lower is better for all of them.
+COMPARED_METRICS = ("p50_ms", "peak_alloc_mb", "bytes_per_call")
+
+# Ignore regressions smaller than these absolute amounts (timer / allocator noise).
+NOISE_FLOOR = {"p50_ms": 0.05, "peak_alloc_mb": 0.25, "bytes_per_call": 64}
+
+
+def reset_peak_rss() -> bool:
+    """Reset the process RSS high-water mark so the next `peak_rss_mb()` covers one case.
+
+    Linux only (writing 5 to /proc/self/clear_refs); returns False elsewhere.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _proc_status_mb(field: str) -> float | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_mb() -> float | None:
+    """RSS high-water mark (VmHWM) since the last `reset_peak_rss()`, or None if it can't be read."""
+    return _proc_status_mb("VmHWM")
+
+
+def run_case(name: str, fn, iterations: int, items_per_call: int, extra: dict | None = None) -> dict:
+    """Time `fn` over `iterations` calls, then measure its peak allocation once.
+
+    Tracing allocations slows Python code down several-fold, so latency and
+    memory are measured in separate passes. `peak_rss_mb` is the process RSS
+    high-water mark during the timed calls only and `rss_growth_mb` how far it
+    rose above the RSS before them (both None where the mark can't be reset
+    per case, i.e. outside Linux).
+    """
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        fn()  # warm-up (imports, file cache)
+
+        rss_reset = reset_peak_rss()
+        rss_before = _proc_status_mb("VmRSS")
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        rss = peak_rss_mb() if rss_reset else None
+
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    timings.sort()
+    p50 = statistics.median(timings)
+    p95 = timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))]
+    mean = statistics.fmean(timings)
+    result = {
+        "name": name,
+        "iterations": iterations,
+        "items_per_call": items_per_call,
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "mean_ms": round(mean, 3),
+        "throughput_per_s": round(items_per_call / (mean / 1000), 1) if mean > 0 else None,
+        "peak_alloc_mb": round(peak / (1024 * 1024), 3),
+        "peak_rss_mb": round(rss, 1) if rss is not None else None,
+        "rss_growth_mb": round(rss - rss_before, 1) if rss is not None and rss_before is not None else None,
+    }
+    result.update(extra or {})
+    return result
+
+
+def http_poll_cases(server, game_ids: list[str]) -> list[tuple]:
+    """Repeated UI polls of the read endpoints: full rebuild vs cached 200 vs 304 revalidation."""
+    from fastapi.testclient import TestClient
+
+    from src.api.http_cache import ResponseCache
+
+    client = TestClient(server.app)
+    gzip_headers = {"Accept-Encoding": "gzip"}
+    cases = []
+    for label, path in (("games", "/api/games"), ("summary", f"/api/games/{game_ids[0]}/summary")):
+        first = client.get(path, headers=gzip_headers)
+        etag = first.headers["etag"]
+        revalidate = {**gzip_headers, "If-None-Match": etag}
+
+        def rebuild(path=path):
+            # What every poll cost before: drop the server cache so the body is re-read and re-serialized.
+            server.response_cache = ResponseCache()
+            client.get(path, headers=gzip_headers)
+
+        polls = (
+            (f"poll_{label}_rebuild", rebuild, gzip_headers),
+            (f"poll_{label}_200", lambda path=path: client.get(path, headers=gzip_headers), gzip_headers),
+            (f"poll_{label}_304", lambda path=path, h=revalidate: client.get(path, headers=h), revalidate),
+        )
+        for name, fn, headers in polls:
+            wire = client.get(path, headers=headers).num_bytes_downloaded
+            cases.append((name, fn, 1, {"bytes_per_call": wire}))
+    return cases
+
+
+def build_cases(work_dir: Path, game_ids: list[str], base_url: str) -> list[tuple]:
+    """Prepare on-disk artifacts for every game and return (name, fn, items[, extra]) cases."""
+    from src.ingestion import nba_data_loader
+    from src.service.play_search import index_game_plays, search_plays
+    from src.utils.columnar_export import iter_arrow_stream, iter_game_tables, save_columnar
+    from src.utils.context_snapshot import build_snapshot, save_context_snapshot
+    from src.utils.game_state import build_game_state, save_game_state
+    from src.utils.lineups import build_stints
+    from src.utils.parse_game_data import parse_game_data
+    from src.utils.summarize_parsed_data import summarize_parsed_game
+
+    raw_dir = work_dir / "raw"
+    structured_dir = work_dir / "structured"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    structured_dir.mkdir(parents=True, exist_ok=True)
+
+    nba_data_loader.CDN_BASE_URL = base_url
+
+    csv_paths, parsed_paths, n_rows = {}, {}, {}
+    n_actions = n_plays = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for gid in game_ids:
+            csv_paths[gid] = raw_dir / f"{gid}_game_data.csv"
+            n_rows[gid] = nba_data_loader.save_game_csv(gid, csv_paths[gid])["rows"]
+            n_actions += n_rows[gid]
+
+            parsed_paths[gid] = structured_dir / f"{gid}_parsed.json"
+            with open(parsed_paths[gid], "w") as f:
+                json.dump(parse_game_data(gid, str(csv_paths[gid])), f, indent=2)
+
+            summary = summarize_parsed_game(str(parsed_paths[gid]), str(structured_dir / f"{gid}_summary.json"))
+            save_game_state(str(parsed_paths[gid]), summary["teams"], str(structured_dir / f"{gid}_state.json"))
+            save_context_snapshot(gid, str(structured_dir / f"{gid}_summary.json"), structured_dir=structured_dir)
+            with open(parsed_paths[gid], "r") as f:
+                n_plays += index_game_plays(gid, json.load(f), work_dir / "playmind.db")
+            save_columnar(gid, str(parsed_paths[gid]), str(structured_dir / f"{gid}_summary.json"), structured_dir)
+
+    first = game_ids[0]
+    first_rows = n_rows[first]
+    with open(parsed_paths[first], "r") as f:
+        first_plays = json.load(f)
+    first_summary = summarize_parsed_game(str(parsed_paths[first]))
+    first_teams = first_summary["teams"]
+    state = build_game_state(first_plays, first_teams)
+
+    def state_queries():
+        for period in range(1, state.last_period() + 1):
+            for clock in ("PT09M00.00S", "PT06M00.00S", "PT03M00.00S", "PT00M00.00S"):
+                state.score_at(period, clock)
+            state.period_stats(period)
+
+    cases = [
+        ("save_game_csv", lambda: nba_data_loader.save_game_csv(first, raw_dir / "stream_game_data.csv"), first_rows),
+        ("parse_game_data", lambda: parse_game_data(first, str(csv_paths[first])), first_rows),
+        ("summarize_parsed_game", lambda: summarize_parsed_game(str(parsed_paths[first])), first_rows),
+        ("game_state_build", lambda: build_game_state(first_plays, first_teams), first_rows),
+        ("game_state_queries", state_queries, state.last_period() * 5),
+        ("lineups_build", lambda: build_stints(first_plays, first_teams), first_rows),
+        ("context_snapshot_build", lambda: build_snapshot(first, first_summary, state), 1),
+        ("play_index_game", lambda: index_game_plays(first, first_plays, work_dir / "playmind.db"), len(first_plays)),
+        ("play_search", lambda: search_plays("jump shot", team=first_teams[0], period=4,
+                                             db_path=work_dir / "playmind.db"), 1),
+        ("export_plays_arrow", lambda: sum(len(chunk) for chunk in iter_arrow_stream(
+            "plays", iter_game_tables("plays", game_ids, structured_dir=structured_dir))), n_plays),
+    ]
+
+    try:
+        from src.api import server
+        from src.rag.qa_engine import build_prompt
+    except ImportError as e:
+        print(f"Skipping API cases ({e})")
+    else:
+        server.STRUCTURED_DIR = structured_dir
+        stub = StubLLM()
+        server.llm, server.prompt = stub, build_prompt()
+        question = server.AskRequest(question="Why did the winning team pull ahead?")
+        stat_question = server.AskRequest(question="What was the final score?")
+        # A typical report: analytical questions that all need the LLM
+        report = [
+            "Why did the winning team pull ahead?",
+            "What decided the game?",
+            "How did turnovers affect the result?",
+            "Which team controlled the glass and why did it matter?",
+            "How did the bench units compare?",
+            "What should the losing team change next time?",
+        ]
+        report_batch = server.BatchAskRequest(questions=report)
+
+        def report_sequential():
+            for q in report:
+                asyncio.run(server.ask_about_game(first, server.AskRequest(question=q)))
+
+        cases += [
+            ("context_build", lambda: server.build_game_context([first]), 1),
+            ("context_build_all_games", lambda: server.build_game_context(game_ids), len(game_ids)),
+            ("comparison_context", lambda: server.build_comparison_context(game_ids), len(game_ids)),
+            ("ask_stub_llm", lambda: asyncio.run(server.ask_about_game(first, question)), 1),
+            ("ask_fast_path", lambda: asyncio.run(server.ask_about_game(first, stat_question)), 1),
+            ("ask_report_sequential", report_sequential, len(report)),
+            ("ask_report_batch", lambda: asyncio.run(server.ask_batch_about_game(first, report_batch)), len(report)),
+        ]
+        try:
+            cases += http_poll_cases(server, game_ids)
+        except ImportError as e:
+            print(f"Skipping HTTP polling cases ({e})")
+
+    try:
+        from src.embeddings.build_index import build_index
+    except ImportError as e:
+        print(f"Skipping index build case ({e})")
+    else:
+        embeddings = HashEmbeddings()
+        builds = iter(range(1_000_000))
+
+        def index_case():
+            # Fresh directory per build so Chroma never appends to a previous run.
+            index_dir = work_dir / "index" / str(next(builds))
+            build_index(csv_paths[first].name, data_dir=raw_dir, index_path=index_dir, embeddings=embeddings)
+
+        cases.append(("build_index", index_case, first_rows))
+
+    print(f"Prepared {len(game_ids)} synthetic games ({n_actions} actions).")
+    return cases
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """Return human-readable regression messages (empty list = pass)."""
+    failures = []
+    base_cases = {c["name"]: c for c in baseline.get("results", [])}
+    for r in results:
+        base = base_cases.get(r["name"])
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), r.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > NOISE_FLOOR[metric]:
+                failures.append(
+                    f"{r['name']}: {metric} {old} -> {new} (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)"
+                )
+    return failures
+
+
+def _or_dash(value) -> str:
+    return "-" if value is None else str(value)
+
+
+def print_table(results: list[dict]):
+    header = (f"{'case':<26}{'p50 ms':>10}{'p95 ms':>10}{'items/s':>12}{'alloc MB':>10}"
+              f"{'RSS MB':>9}{'+RSS MB':>9}{'bytes':>9}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['name']:<26}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}"
+            f"{(r['throughput_per_s'] or 0):>12.1f}{r['peak_alloc_mb']:>10.2f}"
+            f"{_or_dash(r['peak_rss_mb']):>9}{_or_dash(r['rss_growth_mb']):>9}"
+            f"{r.get('bytes_per_call', ''):>9}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PlayMind pipeline benchmarks")
+    parser.add_argument("--games", type=int, default=12, help="number of synthetic games")
+    parser.add_argument("--actions", type=int, default=480, help="target actions per game")
+    parser.add_argument("--overtime", type=int, default=1, help="OT periods for every third game")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed fractional slowdown")
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    config = {"games": args.games, "actions": args.actions, "overtime": args.overtime, "seed": args.seed}
+
+    with tempfile.TemporaryDirectory(prefix="playmind-bench-") as tmp:
+        work_dir = Path(tmp)
+        game_ids = write_synthetic_games(
+            work_dir / "cdn", args.games, args.actions, args.overtime, seed=args.seed
+        )
+        with serve_directory(work_dir / "cdn") as base_url:
+            cases = build_cases(work_dir, game_ids, base_url)
+            results = [run_case(*case[:2], args.iterations, *case[2:]) for case in cases]
+
+    print_table(results)
+    report = {
+        "config": config,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("config") != config:
+        print(f"\nBaseline config {baseline.get('config')} differs from {config}; skipping comparison.")
+        return 0
+
+    failures = compare(results, baseline, args.tolerance)
+    if failures:
+        print("\nRegressions against baseline:")
+        for msg in failures:
+            print(f"  ✗ {msg}")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
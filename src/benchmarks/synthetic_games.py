@@ -0,0 +1,356 @@
+"""Synthetic NBA CDN play-by-play generator.
+
+Produces documents shaped like
+  https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_<GAMEID>.json
+so the whole pipeline (fetch -> parse -> summarize -> QA) can be exercised
+offline and reproducibly. Games are simulated possession by possession, so
+scores, rebounds after misses, free throws after shooting fouls, paired
+substitutions and period boundaries all line up the way real feeds do.
+
+Every game is fully determined by (seed, game index), which is what makes
+benchmark runs comparable across machines and commits.
+"""
+
+import json
+import math
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+TEAMS = [
+    "ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DAL", "DEN", "DET", "GSW",
+    "HOU", "IND", "LAC", "LAL", "MEM", "MIA", "MIL", "MIN", "NOP", "NYK",
+    "OKC", "ORL", "PHI", "PHX", "POR", "SAC", "SAS", "TOR", "UTA", "WAS",
+]
+
+FIRST_INITIALS = "ABCDEGHJKLMNPRSTW"
+LAST_NAMES = [
+    "Adams", "Allen", "Banks", "Barnes", "Bell", "Brooks", "Bryant", "Carter",
+    "Clark", "Cole", "Collins", "Curry", "Davis", "Dixon", "Edwards", "Ellis",
+    "Evans", "Fields", "Fox", "Gordon", "Grant", "Green", "Hall", "Harris",
+    "Hayes", "Hill", "Holmes", "Howard", "Hunter", "Jackson", "James", "Jones",
+    "Knight", "Lewis", "Lopez", "Mason", "Miller", "Mitchell", "Moore", "Morris",
+    "Murray", "Nelson", "Owens", "Parker", "Porter", "Price", "Reed", "Rivers",
+    "Robinson", "Ross", "Russell", "Scott", "Simmons", "Smith", "Stewart", "Tatum",
+    "Thomas", "Turner", "Walker", "Wallace", "Warren", "Watson", "White", "Williams",
+    "Wright", "Young",
+]
+
+REGULATION_PERIODS = 4
+PERIOD_SECONDS = 12 * 60
+OVERTIME_SECONDS = 5 * 60
+
+TWO_PT_SHOTS = ["Driving Layup", "Jump Shot", "Pullup Jump Shot", "Dunk", "Floating Jump Shot", "Hook Shot"]
+THREE_PT_SHOTS = ["Jump Shot", "Pullup Jump Shot", "Step Back Jump Shot", "Running Jump Shot"]
+
+
+def synthetic_game_id(index: int, season: int = 25) -> str:
+    """Regular-season style game id: 002<season><5-digit index>."""
+    return f"002{season:02d}{index + 1:05d}"
+
+
+def format_clock(seconds: float) -> str:
+    seconds = max(0.0, seconds)
+    minutes = int(seconds // 60)
+    return f"PT{minutes:02d}M{seconds - minutes * 60:05.2f}S"
+
+
+def _make_roster(rng: random.Random, team: str, used_names: set, first_id: int) -> list[dict]:
+    roster = []
+    while len(roster) < 10:
+        name = f"{rng.choice(FIRST_INITIALS)}. {rng.choice(LAST_NAMES)}"
+        if name in used_names:
+            continue
+        used_names.add(name)
+        roster.append({"personId": first_id + len(roster), "nameI": name, "team": team})
+    return roster
+
+
+def _shot_location(rng: random.Random, is_three: bool, shot: str) -> dict:
+    """Pick a plausible spot in legacy half-court coordinates (tenths of feet, hoop at origin)."""
+    if is_three:
+        if rng.random() < 0.25:
+            side = rng.choice((-1, 1))
+            x_legacy = side * rng.randint(222, 245)
+            y_legacy = rng.randint(-40, 80)
+            area = "Left Corner 3" if side < 0 else "Right Corner 3"
+        else:
+            angle = rng.uniform(0.35, math.pi - 0.35)
+            radius = rng.uniform(238, 290)
+            x_legacy = int(radius * math.cos(angle))
+            y_legacy = int(radius * math.sin(angle))
+            area = "Above the Break 3"
+    elif shot in ("Driving Layup", "Dunk") or rng.random() < 0.35:
+        x_legacy = rng.randint(-40, 40)
+        y_legacy = rng.randint(-20, 40)
+        area = "Restricted Area"
+    elif rng.random() < 0.5:
+        x_legacy = rng.randint(-80, 80)
+        y_legacy = rng.randint(40, 140)
+        area = "In The Paint (Non-RA)"
+    else:
+        x_legacy = rng.randint(-210, 210)
+        y_legacy = rng.randint(60, 200)
+        area = "Mid-Range"
+
+    distance = int(round(((x_legacy ** 2 + y_legacy ** 2) ** 0.5) / 10))
+    return {
+        "xLegacy": x_legacy,
+        "yLegacy": y_legacy,
+        "shotDistance": float(distance),
+        "area": area,
+        # CDN x/y are percentages of the full court; approximate from the half-court coords.
+        "x": round(5.3 + (y_legacy + 52.5) / 940 * 100, 2),
+        "y": round(50 + x_legacy / 500 * 100, 2),
+    }
+
+
+class _GameSimulator:
+    def __init__(self, game_id: str, rng: random.Random, home: str, away: str, start: datetime):
+        self.game_id = game_id
+        self.rng = rng
+        self.home = home
+        self.away = away
+        used: set = set()
+        self.rosters = {
+            home: _make_roster(rng, home, used, 1_630_000),
+            away: _make_roster(rng, away, used, 1_640_000),
+        }
+        self.on_court = {t: list(self.rosters[t][:5]) for t in (home, away)}
+        self.score = {home: 0, away: 0}
+        self.player_points = {}
+        self.actions = []
+        self.period = 1
+        self.clock = float(PERIOD_SECONDS)
+        self.wall = start
+
+    # -- helpers -------------------------------------------------------
+    def _emit(self, action_type: str, description: str, team: str | None = None,
+              player: dict | None = None, **extra) -> dict:
+        self.wall += timedelta(seconds=self.rng.uniform(2, 20))
+        action = {
+            "actionNumber": len(self.actions) + 1,
+            "clock": format_clock(self.clock),
+            "timeActual": self.wall.strftime("%Y-%m-%dT%H:%M:%S.%fZ")[:-4] + "Z",
+            "period": self.period,
+            "periodType": "REGULAR" if self.period <= REGULATION_PERIODS else "OVERTIME",
+            "actionType": action_type,
+            "subType": extra.pop("subType", ""),
+            "qualifiers": [],
+            "personId": player["personId"] if player else 0,
+            "x": None,
+            "y": None,
+            "possession": 0,
+            "scoreHome": str(self.score[self.home]),
+            "scoreAway": str(self.score[self.away]),
+            "description": description,
+        }
+        if team:
+            action["teamTricode"] = team
+            action["teamId"] = 1_610_612_700 + TEAMS.index(team)
+        if player:
+            action["playerName"] = player["nameI"].split(". ", 1)[-1]
+            action["playerNameI"] = player["nameI"]
+        action.update(extra)
+        self.actions.append(action)
+        return action
+
+    def _other(self, team: str) -> str:
+        return self.away if team == self.home else self.home
+
+    def _pick(self, team: str) -> dict:
+        return self.rng.choice(self.on_court[team])
+
+    def _tick(self, seconds: float) -> bool:
+        """Advance the game clock; returns False when the period has expired."""
+        self.clock -= seconds
+        if self.clock <= 0:
+            self.clock = 0.0
+            return False
+        return True
+
+    def _add_points(self, player: dict, team: str, pts: int) -> int:
+        self.score[team] += pts
+        total = self.player_points.get(player["personId"], 0) + pts
+        self.player_points[player["personId"]] = total
+        return total
+
+    # -- events --------------------------------------------------------
+    def _free_throws(self, team: str, n: int, shooter: dict) -> bool:
+        """Shoot `n` free throws; returns True if the last one was made."""
+        made = False
+        for i in range(1, n + 1):
+            made = self.rng.random() < 0.78
+            if made:
+                total = self._add_points(shooter, team, 1)
+                desc = f"{shooter['nameI']} Free Throw {i} of {n} ({total} PTS)"
+            else:
+                desc = f"MISS {shooter['nameI']} Free Throw {i} of {n}"
+            self._emit("freethrow", desc, team, shooter,
+                       subType=f"{i} of {n}", shotResult="Made" if made else "Missed")
+        return made
+
+    def _rebound(self, offense: str) -> str:
+        """Resolve a missed shot; returns the team with the next possession."""
+        if self.rng.random() < 0.05:
+            team = offense if self.rng.random() < 0.3 else self._other(offense)
+            self._emit("rebound", f"{team} TEAM REBOUND", team, None, subType="team")
+            return team
+        team = offense if self.rng.random() < 0.25 else self._other(offense)
+        player = self._pick(team)
+        kind = "offensive" if team == offense else "defensive"
+        self._emit("rebound", f"{player['nameI']} REBOUND (Off:{int(kind == 'offensive')} Def:{int(kind == 'defensive')})",
+                   team, player, subType=kind)
+        return team
+
+    def _substitution(self, team: str):
+        bench = [p for p in self.rosters[team] if p not in self.on_court[team]]
+        if not bench:
+            return
+        out_player = self._pick(team)
+        in_player = self.rng.choice(bench)
+        self._emit("substitution", f"SUB out: {out_player['nameI']}", team, out_player, subType="out")
+        self._emit("substitution", f"SUB in: {in_player['nameI']}", team, in_player, subType="in")
+        self.on_court[team][self.on_court[team].index(out_player)] = in_player
+
+    def _possession(self, offense: str, mean_seconds: float) -> tuple[str, bool]:
+        """Play one possession; returns (next offense, period still running)."""
+        rng = self.rng
+        defense = self._other(offense)
+        if not self._tick(max(1.0, rng.gauss(mean_seconds, mean_seconds / 3))):
+            return offense, False
+
+        roll = rng.random()
+        if roll < 0.13:
+            player = self._pick(offense)
+            self._emit("turnover", f"{player['nameI']} Bad Pass Turnover (P1.T1)", offense, player, subType="bad pass")
+            if rng.random() < 0.5:
+                stealer = self._pick(defense)
+                self._emit("steal", f"{stealer['nameI']} STEAL (1 STL)", defense, stealer)
+            return defense, True
+
+        if roll < 0.19:
+            fouler = self._pick(defense)
+            self._emit("foul", f"{fouler['nameI']} P.FOUL (P1.T1)", defense, fouler, subType="personal")
+            if rng.random() < 0.3:
+                self._substitution(rng.choice((offense, defense)))
+            return offense, True
+
+        if roll < 0.21:
+            self._emit("timeout", f"{offense} Timeout: Regular", offense, None, subType="full")
+            self._substitution(offense)
+            self._substitution(defense)
+            return offense, True
+
+        shooter = self._pick(offense)
+        is_three = rng.random() < 0.38
+        shot = rng.choice(THREE_PT_SHOTS if is_three else TWO_PT_SHOTS)
+        loc = _shot_location(rng, is_three, shot)
+        made = rng.random() < (0.36 if is_three else 0.53)
+        fouled = rng.random() < 0.09
+        action_type = "3pt" if is_three else "2pt"
+        label = "3PT " if is_three else ""
+        dist = int(loc["shotDistance"])
+
+        if made:
+            total = self._add_points(shooter, offense, 3 if is_three else 2)
+            desc = f"{shooter['nameI']} {dist}' {label}{shot} ({total} PTS)"
+            self._emit(action_type, desc, offense, shooter, subType=shot, shotResult="Made", **loc)
+            if fouled:
+                fouler = self._pick(defense)
+                self._emit("foul", f"{fouler['nameI']} S.FOUL (P1.T1)", defense, fouler, subType="shooting")
+                if not self._free_throws(offense, 1, shooter):
+                    return self._rebound(offense), True
+            return defense, True
+
+        desc = f"MISS {shooter['nameI']} {dist}' {label}{shot}"
+        self._emit(action_type, desc, offense, shooter, subType=shot, shotResult="Missed", **loc)
+        if fouled:
+            fouler = self._pick(defense)
+            self._emit("foul", f"{fouler['nameI']} S.FOUL (P1.T1)", defense, fouler, subType="shooting")
+            if self._free_throws(offense, 3 if is_three else 2, shooter):
+                return defense, True
+            return self._rebound(offense), True
+        if not is_three and rng.random() < 0.08:
+            blocker = self._pick(defense)
+            self._emit("block", f"{blocker['nameI']} BLOCK (1 BLK)", defense, blocker)
+        return self._rebound(offense), True
+
+    def _run_period(self, seconds: int, mean_possession: float, offense: str) -> str:
+        self.clock = float(seconds)
+        self._emit("period", "Period Start", None, None, subType="start")
+        if self.period == 1:
+            home_c, away_c = self.on_court[self.home][0], self.on_court[self.away][0]
+            winner = self.rng.choice((self.home, self.away))
+            tip_to = self._pick(winner)
+            self._emit("jumpball", f"Jump Ball {home_c['nameI']} vs. {away_c['nameI']}: Tip to {tip_to['nameI']}",
+                       winner, tip_to, subType="recovered")
+            offense = winner
+        running = True
+        while running:
+            offense, running = self._possession(offense, mean_possession)
+        self.clock = 0.0
+        self._emit("period", "Period End", None, None, subType="end")
+        return self._other(offense)
+
+    def simulate(self, n_actions: int, overtime_periods: int) -> list[dict]:
+        total_seconds = REGULATION_PERIODS * PERIOD_SECONDS + overtime_periods * OVERTIME_SECONDS
+        # ~2.2 actions per possession on average (shot + rebound, FTs, subs, ...)
+        mean_possession = max(2.0, total_seconds * 2.2 / max(n_actions, 50))
+        offense = self.home
+        for period in range(1, REGULATION_PERIODS + overtime_periods + 1):
+            self.period = period
+            seconds = PERIOD_SECONDS if period <= REGULATION_PERIODS else OVERTIME_SECONDS
+            offense = self._run_period(seconds, mean_possession, offense)
+        self._emit("game", "Game End", None, None, subType="end")
+        return self.actions
+
+
+def generate_game(index: int, n_actions: int = 480, overtime_periods: int = 0,
+                  seed: int = 2025, start_date: str = "2025-10-21") -> dict:
+    """Generate one synthetic CDN play-by-play document.
+
+    `n_actions` is a target; the simulator tunes possession length so the
+    game lands close to it.
+    """
+    rng = random.Random(f"{seed}:{index}")
+    home, away = rng.sample(TEAMS, 2)
+    game_id = synthetic_game_id(index)
+    start = datetime.fromisoformat(start_date) + timedelta(days=index // 8, hours=19 + (index % 8) // 3)
+    actions = _GameSimulator(game_id, rng, home, away, start).simulate(n_actions, overtime_periods)
+    return {
+        "meta": {"version": 1, "code": 200, "request": f"synthetic://playbyplay_{game_id}.json"},
+        "game": {"gameId": game_id, "actions": actions},
+    }
+
+
+def write_synthetic_games(out_dir: str | Path, n_games: int, n_actions: int = 480,
+                          overtime_periods: int = 0, seed: int = 2025) -> list[str]:
+    """Write `playbyplay_<GAMEID>.json` files (CDN layout) and return the game ids."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    game_ids = []
+    for i in range(n_games):
+        # Spread overtime across the set so OT handling is always covered.
+        ot = overtime_periods if i % 3 == 0 else 0
+        doc = generate_game(i, n_actions=n_actions, overtime_periods=ot, seed=seed)
+        game_id = doc["game"]["gameId"]
+        with open(out_dir / f"playbyplay_{game_id}.json", "w") as f:
+            json.dump(doc, f)
+        game_ids.append(game_id)
+    return game_ids
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 3:
+        print("Usage: python -m src.benchmarks.synthetic_games <OUT_DIR> <N_GAMES> [N_ACTIONS] [OT_PERIODS]")
+        sys.exit(1)
+
+    out = sys.argv[1]
+    n = int(sys.argv[2])
+    actions = int(sys.argv[3]) if len(sys.argv) > 3 else 480
+    ot = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    ids = write_synthetic_games(out, n, actions, ot)
+    print(f"Wrote {len(ids)} synthetic games to {out}")
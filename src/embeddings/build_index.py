@@ -1,21 +1,40 @@
 # src/embeddings/build_index.py
 
+import json
+
 import pandas as pd
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 from pathlib import Path
 
+from src.utils.game_state import clock_to_seconds, format_clock
+
 DATA_PATH = Path("data/raw")
 INDEX_PATH = Path("data/processed/chroma_index")
 INDEX_PATH.mkdir(parents=True, exist_ok=True)
 
+# Play-level index used by hybrid retrieval (src/rag/hybrid_retrieval.py)
+PLAY_INDEX_PATH = Path("data/processed/play_index")
+PLAY_COLLECTION = "plays"
+# Bump when play_text or the metadata change; ingestion then re-embeds every game it touches.
+PLAY_VECTORS_VERSION = "1"
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
 
-def build_index(csv_filename: str = "0022500142_game_data.csv"):
+def build_index(
+    csv_filename: str = "0022500142_game_data.csv",
+    data_dir: Path = DATA_PATH,
+    index_path: Path = INDEX_PATH,
+    embeddings=None,
+):
     """
     Builds a Chroma vector index from NBA play-by-play data
     using a local Hugging Face embedding model.
+
+    `embeddings` can be any LangChain `Embeddings` implementation; it defaults
+    to MiniLM (benchmarks pass a cheap deterministic stand-in).
     """
-    csv_path = DATA_PATH / csv_filename
+    csv_path = Path(data_dir) / csv_filename
     if not csv_path.exists():
         raise FileNotFoundError(f"File not found: {csv_path}")
 
@@ -28,19 +47,111 @@ def build_index(csv_filename: str = "0022500142_game_data.csv"):
         .agg(" ".join, axis=1)
     )
 
-    print("Initializing Hugging Face embedding model...")
-    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    if embeddings is None:
+        print("Initializing Hugging Face embedding model...")
+        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
 
     print("Creating Chroma vector index...")
     db = Chroma.from_texts(
         texts=df["text"].tolist(),
         embedding=embeddings,
         metadatas=df.to_dict("records"),
-        persist_directory=str(INDEX_PATH)
+        persist_directory=str(index_path)
+    )
+
+    print(f"Chroma index successfully saved to {index_path}")
+    return db
+
+
+def play_text(play: dict) -> str:
+    """Embedded text for one parsed play, e.g. "Q4 11:42 S. Curry 26' 3PT Jump Shot (3 PTS)"."""
+    return f"Q{play.get('period', 0)} {format_clock(clock_to_seconds(play.get('time')))} {play['description']}"
+
+
+def replace_game_plays(db, game_id: str, plays: list[dict]) -> int:
+    """Replace `game_id`'s documents in the play index; returns the number of plays indexed.
+
+    Everything stored for the game is deleted first, so plays that disappeared
+    from a corrected feed (or shifted to a new seq) leave no stale documents.
+    """
+    texts, metadatas, ids = [], [], []
+    for seq, play in enumerate(plays):
+        if not play.get("description"):
+            continue
+        texts.append(play_text(play))
+        metadatas.append({
+            "game_id": game_id,
+            "seq": seq,
+            "period": int(play.get("period", 0) or 0),
+            "team": play.get("team") or "",
+            "player": play.get("player") or "",
+        })
+        ids.append(f"{game_id}:{seq}")
+
+    db.delete(where={"game_id": game_id})
+    if texts:
+        db.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+    return len(texts)
+
+
+def indexed_vector_count(db, game_id: str) -> int:
+    """Documents currently in the play index for `game_id`."""
+    return len(db.get(where={"game_id": game_id}, include=[])["ids"])
+
+
+def build_play_index(
+    plays_by_game: dict[str, list[dict]],
+    index_path: Path = PLAY_INDEX_PATH,
+    embeddings=None,
+):
+    """
+    Builds the play-level Chroma index: one document per parsed play, with
+    game, period, team and player metadata for filtered similarity search.
+
+    Document ids are "<GAME_ID>:<seq>" where seq is the play's position in
+    the game's _parsed.json, the same key the full-text play index uses, so
+    hits from both can be fused. Once the index exists, ingestion keeps each
+    game's documents in sync (see the play_vectors stage in data_service).
+    """
+    if embeddings is None:
+        print("Initializing Hugging Face embedding model...")
+        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+
+    print(f"Creating play index ({len(plays_by_game)} games)...")
+    db = Chroma(
+        collection_name=PLAY_COLLECTION,
+        embedding_function=embeddings,
+        persist_directory=str(index_path),
     )
+    indexed = sum(replace_game_plays(db, game_id, plays) for game_id, plays in plays_by_game.items())
+    print(f"Play index ({indexed} plays) saved to {index_path}")
+    return db
 
-    print(f"Chroma index successfully saved to {INDEX_PATH}")
+
+def load_play_index(index_path: Path = PLAY_INDEX_PATH, embeddings=None):
+    if embeddings is None:
+        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+    return Chroma(
+        collection_name=PLAY_COLLECTION,
+        embedding_function=embeddings,
+        persist_directory=str(index_path),
+    )
 
 
 if __name__ == "__main__":
-    build_index()
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "plays":
+        # python -m src.embeddings.build_index plays [GAME_ID ...]
+        structured = Path("data/structured")
+        paths = (
+            [structured / f"{gid}_parsed.json" for gid in sys.argv[2:]]
+            if len(sys.argv) > 2 else sorted(structured.glob("*_parsed.json"))
+        )
+        plays_by_game = {}
+        for path in paths:
+            with open(path, "r") as f:
+                plays_by_game[path.name.split("_parsed.json")[0]] = json.load(f)
+        build_play_index(plays_by_game)
+    else:
+        build_index()
@@ -1,119 +1,294 @@
 # src/ingestion/nba_data_loader.py
 
+import codecs
+import csv
+import json
+import os
+import re
 from pathlib import Path
 
-import pandas as pd
 import requests
 
+from src.utils.metrics import record_bytes
+
+
+# Bump when the CSV layout written by the pipeline changes (invalidates downstream stages).
+LOADER_VERSION = "5"
 
 DATA_PATH = Path("data/raw")
 DATA_PATH.mkdir(parents=True, exist_ok=True)
 
+# Overridable so benchmarks can point the loader at a local fixture server.
+CDN_BASE_URL = os.getenv(
+    "PLAYMIND_CDN_BASE_URL",
+    "https://cdn.nba.com/static/json/liveData/playbyplay",
+)
 
-def fetch_game(game_id: str):
-    """Fetch play-by-play data for a game from the new NBA CDN JSON endpoint.
 
-    The endpoint format is:
-      https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_<GAMEID>.json
+# Columns of data/raw/<GAME_ID>_game_data.csv, in order
+CSV_COLUMNS = (
+    "PCTIMESTRING",
+    "HOMEDESCRIPTION",
+    "VISITORDESCRIPTION",
+    "PERIOD",
+    "SCORE_HOME",
+    "SCORE_AWAY",
+    "ACTION_TYPE",
+    "SUB_TYPE",
+    "PLAYER_ID",
+    "PLAYER_NAME",
+    "TEAM_TRICODE",
+    "TIME_ACTUAL",
+    "X_LEGACY",
+    "Y_LEGACY",
+    "X",
+    "Y",
+    "SHOT_DISTANCE",
+    "AREA",
+)
+
+# Bytes read from the CDN response per chunk while streaming
+CHUNK_SIZE = 64 * 1024
 
-    We normalize the JSON "actions" list into a DataFrame with at least the
-    columns used elsewhere in the pipeline (e.g. build_index):
-      - PCTIMESTRING
-      - HOMEDESCRIPTION
-      - VISITORDESCRIPTION
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = ",:]} \t\n\r"
+_DECODER = json.JSONDecoder()
 
-    For each action, we map the `description` field into either
-    HOMEDESCRIPTION or VISITORDESCRIPTION based on the teamTricode.
+
+class _JSONStream:
+    """Minimal pull parser over a chunked JSON document.
+
+    Values are decoded with `json.JSONDecoder.raw_decode` directly from a
+    sliding text buffer, so only the value being decoded (e.g. one action)
+    has to be resident, never the whole payload.
     """
 
-    print(f"Fetching play-by-play data for game {game_id} from NBA CDN...")
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
 
-    url = f"https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_{game_id}.json"
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer (dropping consumed text); False at end of input."""
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self.buf = self.buf[self.pos:] + text
+                self.pos = 0
+                return True
+        self.buf = self.buf[self.pos:] + self._utf8.decode(b"", final=True)
+        self.pos = 0
+        self.eof = True
+        return False
 
-    try:
-        resp = requests.get(url, timeout=15)
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ("" at end of input)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Malformed CDN payload: expected {char!r}, found {found!r}")
+        self.pos += 1
+
+    def skip_comma(self):
+        if self.peek() == ",":
+            self.pos += 1
+
+    def value(self):
+        """Decode one complete JSON value at the current position."""
+        while True:
+            self.peek()
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number or literal is only complete once a delimiter follows it
+            # ("1." of "1.5" decodes as 1 until the next chunk arrives).
+            scalar = self.buf[self.pos] not in '{["'
+            if scalar and (end >= len(self.buf) or self.buf[end] not in _DELIMITERS) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_actions(chunks, game_meta: dict | None = None):
+    """Yield each element of `game.actions` from a chunked CDN play-by-play document.
+
+    Other keys of the `game` object seen before the actions (e.g. gameId,
+    homeTeam) are stored in `game_meta` if given.
+    """
+    stream = _JSONStream(chunks)
+    stream.expect("{")
+    while stream.peek() != "}":
+        key = stream.value()
+        stream.expect(":")
+        if key != "game":
+            stream.value()
+            stream.skip_comma()
+            continue
+        stream.expect("{")
+        while stream.peek() != "}":
+            game_key = stream.value()
+            stream.expect(":")
+            if game_key == "actions":
+                stream.expect("[")
+                while stream.peek() != "]":
+                    yield stream.value()
+                    stream.skip_comma()
+                stream.expect("]")
+            else:
+                value = stream.value()
+                if game_meta is not None:
+                    game_meta[game_key] = value
+            stream.skip_comma()
+        stream.expect("}")
+        stream.skip_comma()
+
+
+def action_row(action: dict, home_code: str | None, away_code: str | None) -> dict:
+    """Normalize one CDN action into a CSV row (see CSV_COLUMNS).
+
+    The description goes to HOMEDESCRIPTION or VISITORDESCRIPTION based on
+    the teamTricode; neutral events (jump balls, timeouts, etc.) and feeds
+    without team info use HOMEDESCRIPTION.
+    """
+    description = action.get("description", "") or ""
+    team_tricode = action.get("teamTricode")
+
+    home_desc = ""
+    visitor_desc = ""
+    if description:
+        if team_tricode == home_code:
+            home_desc = description
+        elif team_tricode == away_code:
+            visitor_desc = description
+        else:
+            home_desc = description
+
+    return {
+        "PCTIMESTRING": action.get("clock", ""),
+        "HOMEDESCRIPTION": home_desc,
+        "VISITORDESCRIPTION": visitor_desc,
+        "PERIOD": action.get("period"),
+        "SCORE_HOME": action.get("scoreHome"),
+        "SCORE_AWAY": action.get("scoreAway"),
+        "ACTION_TYPE": action.get("actionType"),
+        "SUB_TYPE": action.get("subType"),
+        "PLAYER_ID": action.get("personId"),
+        "PLAYER_NAME": action.get("playerNameI"),  # or another name field
+        "TEAM_TRICODE": team_tricode,
+        "TIME_ACTUAL": action.get("timeActual"),
+        # Shot location: legacy half-court coords (tenths of feet, hoop at origin),
+        # CDN court percentages, distance in feet and the CDN zone name
+        "X_LEGACY": action.get("xLegacy"),
+        "Y_LEGACY": action.get("yLegacy"),
+        "X": action.get("x"),
+        "Y": action.get("y"),
+        "SHOT_DISTANCE": action.get("shotDistance"),
+        "AREA": action.get("area"),
+    }
+
+
+def stream_game_rows(game_id: str, chunk_size: int = CHUNK_SIZE):
+    """Yield normalized rows for a game straight off the CDN response.
+
+    The endpoint format is:
+      https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_<GAMEID>.json
+
+    The response is read in `chunk_size` pieces and decoded one action at a
+    time, so memory stays flat regardless of the game's length.
+    """
+    print(f"Fetching play-by-play data for game {game_id} from NBA CDN...")
+    url = f"{CDN_BASE_URL}/playbyplay_{game_id}.json"
+
+    n_bytes = 0
+    with requests.get(url, timeout=15, stream=True) as resp:
         resp.raise_for_status()
 
-        data = resp.json()
-
-        game = data.get("game") or {}
-        actions = game.get("actions") or []
-
-        if not actions:
-            print("⚠️ No actions found in CDN response.")
-            return None
-
-        home_team = game.get("homeTeam") or {}
-        away_team = game.get("awayTeam") or {}
-        home_code = home_team.get("teamTricode")
-        away_code = away_team.get("teamTricode")
-
-        rows = []
-        for action in actions:
-            clock = action.get("clock", "")
-            description = action.get("description", "") or ""
-            team_tricode = action.get("teamTricode")
-
-            # Map description into home/visitor columns based on team code
-            home_desc = ""
-            visitor_desc = ""
-            if description:
-                if team_tricode == home_code:
-                    home_desc = description
-                elif team_tricode == away_code:
-                    visitor_desc = description
-                else:
-                    # Neutral events (jump balls, timeouts, etc.)
-                    home_desc = description
-
-            row = {
-                "PCTIMESTRING": clock,
-                "HOMEDESCRIPTION": home_desc,
-                "VISITORDESCRIPTION": visitor_desc,
-                "PERIOD": action.get("period"),
-                "SCORE_HOME": action.get("scoreHome"),
-                "SCORE_AWAY": action.get("scoreAway"),
-                "ACTION_TYPE": action.get("actionType"),
-                "PLAYER_ID": action.get("personId"),
-                "PLAYER_NAME": action.get("playerNameI"),  # or another name field
-                "TEAM_TRICODE": team_tricode,
-            }
-            rows.append(row)
-
-        df = pd.DataFrame(rows)
-        if df.empty:
-            print("CDN response produced an empty DataFrame.")
-            return None
-
-        return df
+        def chunks():
+            nonlocal n_bytes
+            for chunk in resp.iter_content(chunk_size):
+                n_bytes += len(chunk)
+                yield chunk
+
+        meta = {}
+        for action in iter_actions(chunks(), meta):
+            home_code = (meta.get("homeTeam") or {}).get("teamTricode")
+            away_code = (meta.get("awayTeam") or {}).get("teamTricode")
+            yield action_row(action, home_code, away_code)
+    record_bytes("fetch", n_bytes)
 
+
+def save_game_csv(game_id: str, out_path: Path) -> dict:
+    """Stream the game's rows from the CDN into `out_path`.
+
+    Returns {"rows": n, "time_actual": first non-empty timeActual or None}.
+    """
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    rows, time_actual = 0, None
+    with open(out_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for row in stream_game_rows(game_id):
+            writer.writerow(row)
+            rows += 1
+            if time_actual is None and row["TIME_ACTUAL"]:
+                time_actual = row["TIME_ACTUAL"]
+    return {"rows": rows, "time_actual": time_actual}
+
+
+def fetch_game(game_id: str):
+    """Fetch a game's play-by-play as a pandas DataFrame with CSV_COLUMNS (None if empty).
+
+    Convenience for notebooks and analysis; the pipeline itself streams rows
+    with `save_game_csv` and never builds a DataFrame.
+    """
+    import pandas as pd
+
+    try:
+        rows = list(stream_game_rows(game_id))
     except Exception:
         import traceback
         print("Exception while fetching data from NBA CDN:")
         traceback.print_exc()
         raise
 
+    if not rows:
+        print("⚠️ No actions found in CDN response.")
+        return None
+    return pd.DataFrame(rows, columns=list(CSV_COLUMNS))
+
 
 def main():
     import sys
-    from pathlib import Path
 
     if len(sys.argv) < 2:
         print("Usage: python -m src.ingestion.nba_data_loader <GAME_ID>")
         sys.exit(1)
 
     game_id = sys.argv[1]
-    df = fetch_game(game_id)
+    out_path = DATA_PATH / f"{game_id}_game_data.csv"
+    result = save_game_csv(game_id, out_path)
 
-    if df is None:
+    if not result["rows"]:
+        out_path.unlink(missing_ok=True)
         print("No data saved because the API did not return valid data.")
         sys.exit(1)
 
-    out_dir = Path("data/raw")
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / f"{game_id}_game_data.csv"
-    df.to_csv(out_path, index=False)
-    print(f"Saved play-by-play data to {out_path}")
+    print(f"Saved {result['rows']} play-by-play rows to {out_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+"""Answer several questions about the same game context in one LLM round trip.
+
+The context is sent once and the model returns a JSON object with one answer
+per numbered question:
+
+  {"answers": [{"id": 1, "answer": "..."}, {"id": 2, "answer": "..."}]}
+
+If the completion is not valid JSON or misses some questions, only the missing
+ones are answered individually, with at most `FANOUT_CONCURRENCY` calls in
+flight at once.
+"""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from src.rag.llm_client import LLMUnavailable
+from src.utils.metrics import REGISTRY, time_stage
+
+
+# Keep one completion's answers well inside the model's output budget.
+MAX_BATCH_QUESTIONS = 20
+
+# Output tokens allowed per question in the batched completion (answers are <=25 words).
+TOKENS_PER_ANSWER = 60
+
+# Parallel single-question calls when the batched completion can't be used.
+FANOUT_CONCURRENCY = 4
+
+BATCH_SYSTEM_PROMPT = (
+    "You are an NBA analyst. Answer every numbered question in one short sentence (<=25 words). "
+    "Use only the provided game context. If the context lacks the information for a question, "
+    "its answer must be exactly: 'Not enough information.' "
+    'Respond with only a JSON object of the form {"answers": [{"id": 1, "answer": "..."}]} '
+    "containing one entry per question."
+)
+
+BATCH_ANSWERS = REGISTRY.counter(
+    "playmind_batch_answers_total",
+    "Batch-ask answers by how they were produced (one batched completion vs. per-question fan-out).",
+    ("mode",),
+)
+
+
+def build_batch_input(context: str, questions: list[str]) -> str:
+    numbered = "\n".join(f"Q{i}: {q.strip()}" for i, q in enumerate(questions, start=1))
+    return f"Game Data:\n{context}\n\nQuestions:\n{numbered}"
+
+
+def parse_batch_answers(text: str, n_questions: int) -> dict[int, str]:
+    """Map question number (1-based) -> answer for every usable entry in `text`."""
+    text = str(text or "").strip()
+    # Tolerate ```json fences around the object
+    fenced = re.fullmatch(r"```(?:json)?\s*(.*?)\s*```", text, re.S)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+
+    entries = data.get("answers", []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return {}
+
+    answers = {}
+    for pos, entry in enumerate(entries, start=1):
+        if isinstance(entry, dict):
+            try:
+                qid = int(entry.get("id", pos))
+            except (TypeError, ValueError):
+                continue
+            answer = entry.get("answer")
+        else:
+            qid, answer = pos, entry
+        if 1 <= qid <= n_questions and isinstance(answer, str) and answer.strip():
+            answers[qid] = answer.strip()
+    return answers
+
+
+def answer_batch(llm, context: str, questions: list[str], answer_one) -> list[tuple[str, str]]:
+    """Answer `questions` against one `context`.
+
+    `answer_one(question)` is the single-question path used as fallback.
+    Returns [(answer, mode)] in question order, mode being "batch", "fanout" or
+    "single" (only one question, nothing to batch).
+    """
+    if not questions:
+        return []
+    if len(questions) == 1:
+        BATCH_ANSWERS.inc(mode="single")
+        return [(answer_one(questions[0]), "single")]
+
+    answers: dict[int, str] = {}
+    try:
+        with time_stage("batch_llm"):
+            raw = llm.invoke(
+                build_batch_input(context, questions),
+                system=BATCH_SYSTEM_PROMPT,
+                max_completion_tokens=TOKENS_PER_ANSWER * len(questions) + 40,
+                json_mode=True,
+            )
+        answers = parse_batch_answers(raw, len(questions))
+    except LLMUnavailable:
+        # Provider down or deadline spent: fanning out would only multiply the failure.
+        raise
+    except Exception as e:
+        print(f"Batched completion failed, answering questions individually: {e}")
+
+    results = {qid: (answer, "batch") for qid, answer in answers.items()}
+    missing = [qid for qid in range(1, len(questions) + 1) if qid not in answers]
+    if missing:
+        with time_stage("batch_fanout"):
+            with ThreadPoolExecutor(max_workers=min(FANOUT_CONCURRENCY, len(missing))) as pool:
+                fanned = list(pool.map(lambda qid: answer_one(questions[qid - 1]), missing))
+        for qid, answer in zip(missing, fanned):
+            results[qid] = (answer, "fanout")
+
+    for _, mode in results.values():
+        BATCH_ANSWERS.inc(mode=mode)
+    return [results[qid] for qid in range(1, len(questions) + 1)]
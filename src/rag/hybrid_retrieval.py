@@ -0,0 +1,190 @@
+"""Hybrid play retrieval: BM25 over the FTS5 play index fused with embedding similarity.
+
+MiniLM similarity alone is weak on exact names and numbers ("Curry", "26'",
+"(31 PTS)"), and bm25 alone misses paraphrases ("threes" vs "3PT Jump Shot").
+Each question is answered by both retrievers under the same structured
+filters and the ranked lists are merged with reciprocal-rank fusion:
+
+  score(play) = sum over retrievers of 1 / (RRF_K + rank)
+
+Filters are parsed from the question itself: period ("4th quarter", "Q2",
+"second half", "overtime"), team (tricode or nickname) and player (a known
+name or surname), and applied inside each retriever so they narrow the
+candidates instead of post-filtering a top-k.
+"""
+
+import re
+from pathlib import Path
+
+from src.rag.stat_router import PERIOD_WORDS, TEAM_NAMES
+from src.service.play_search import get_plays, player_names, search_plays
+from src.utils.game_state import REGULATION_PERIODS
+from src.utils.metrics import time_stage
+
+
+# Reciprocal-rank fusion constant (the usual 60: damps the head of each list)
+RRF_K = 60
+
+# Candidates taken from each retriever before fusion
+CANDIDATES = 50
+
+MODES = ("lexical", "vector", "hybrid")
+
+# Question words that carry no retrieval signal for play descriptions
+STOPWORDS = frozenset(
+    "a an and are at by did do does for from game had has have how in is it many much of on "
+    "or the their there to was were what when where which who with".split()
+)
+
+_QUARTER = re.compile(r"\b(first|1st|second|2nd|third|3rd|fourth|4th) (quarter|period|qtr)\b|\bq([1-4])\b")
+_HALF = re.compile(r"\b(first|1st|second|2nd) half\b")
+_OVERTIME = re.compile(r"\b(overtime|ot)\b")
+
+
+def parse_filters(question: str, teams: set[str], players: list[str]) -> dict:
+    """Structured filters named in `question`: {"period": [4], "team": "GSW", "players": ["S. Curry"]}.
+
+    `teams` are the tricodes that may be matched and `players` the player
+    names in the searched games, so only entities that can actually match
+    become filters.
+    """
+    norm = question.lower()
+    filters = {}
+
+    quarter, half = _QUARTER.search(norm), _HALF.search(norm)
+    if quarter:
+        filters["period"] = [PERIOD_WORDS.get(quarter.group(1) or "") or int(quarter.group(3))]
+    elif half:
+        filters["period"] = [1, 2] if PERIOD_WORDS[half.group(1)] == 1 else [3, 4]
+    elif _OVERTIME.search(norm):
+        filters["period"] = list(range(REGULATION_PERIODS + 1, REGULATION_PERIODS + 11))
+
+    tricodes = [t for t in re.findall(r"\b[A-Z]{3}\b", question) if t in teams]
+    tricodes += [code for name, code in TEAM_NAMES.items()
+                 if code in teams and re.search(rf"\b{re.escape(name)}\b", norm)]
+    if len(set(tricodes)) == 1:
+        filters["team"] = tricodes[0]
+
+    # Full "S. Curry" style names first, then unambiguous surnames.
+    named = [p for p in players if p and re.search(rf"(?<!\w){re.escape(p.lower())}(?!\w)", norm)]
+    if not named:
+        words = set(re.findall(r"[a-z][a-z'-]+", norm)) - STOPWORDS
+        surnames = {}
+        for p in players:
+            last = p.split(". ", 1)[-1].lower() if p else ""
+            if last in words:
+                surnames.setdefault(last, []).append(p)
+        if len(surnames) == 1:
+            named = next(iter(surnames.values()))
+    if named:
+        filters["players"] = sorted(set(named))
+    return filters
+
+
+def _content_terms(question: str) -> str:
+    return " ".join(w for w in re.findall(r"\w+", question.lower()) if w not in STOPWORDS)
+
+
+def _chroma_filter(filters: dict, game_ids: list[str] | None) -> dict | None:
+    clauses = []
+    if game_ids is not None:
+        clauses.append({"game_id": {"$in": list(game_ids)}})
+    if "period" in filters:
+        clauses.append({"period": {"$in": filters["period"]}})
+    if "team" in filters:
+        clauses.append({"team": filters["team"]})
+    if "players" in filters:
+        clauses.append({"player": {"$in": filters["players"]}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+class HybridRetriever:
+    """Retrieve plays for a question from the FTS5 index, a play-level vector store, or both.
+
+    `vector_store` is a LangChain vector store built by
+    `src.embeddings.build_index.build_play_index` (Chroma); without one only
+    the lexical retriever is available.
+    """
+
+    def __init__(self, vector_store=None, db_path: Path | None = None,
+                 rrf_k: int = RRF_K, candidates: int = CANDIDATES):
+        self.vector_store = vector_store
+        self.db_path = db_path
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+
+    def filters(self, question: str, game_ids: list[str] | None = None) -> dict:
+        return parse_filters(question, set(TEAM_NAMES.values()), player_names(game_ids, self.db_path))
+
+    def lexical(self, question: str, filters: dict, game_ids: list[str] | None, n: int) -> list[tuple[str, int]]:
+        terms = _content_terms(question)
+        if not terms:
+            return []
+        players = filters.get("players", [])
+        page = search_plays(
+            terms, game_ids, filters.get("team"),
+            # The player column filter takes one name; several same-surname players share it.
+            (players[0] if len(players) == 1 else players[0].split(". ", 1)[-1]) if players else None,
+            filters.get("period"), limit=n, db_path=self.db_path, any_term=True, count=False,
+        )
+        return [(r["game_id"], r["seq"]) for r in page["results"]]
+
+    def vector(self, question: str, filters: dict, game_ids: list[str] | None, n: int) -> list[tuple[str, int]]:
+        if self.vector_store is None:
+            return []
+        docs = self.vector_store.similarity_search(question, k=n, filter=_chroma_filter(filters, game_ids))
+        return [(d.metadata["game_id"], int(d.metadata["seq"])) for d in docs]
+
+    def retrieve(self, question: str, k: int = 10, game_ids: list[str] | None = None,
+                 mode: str = "hybrid") -> list[dict]:
+        """Top `k` plays for `question`, each with its fused score and per-retriever ranks."""
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        with time_stage(f"retrieve_{mode}"):
+            filters = self.filters(question, game_ids)
+            n = max(k, self.candidates)
+            ranked = {}
+            if mode in ("lexical", "hybrid"):
+                ranked["lexical"] = self.lexical(question, filters, game_ids, n)
+            if mode in ("vector", "hybrid"):
+                ranked["vector"] = self.vector(question, filters, game_ids, n)
+
+            scores, ranks = {}, {}
+            for source, keys in ranked.items():
+                for rank, key in enumerate(keys, start=1):
+                    scores[key] = scores.get(key, 0.0) + 1.0 / (self.rrf_k + rank)
+                    ranks.setdefault(key, {})[source] = rank
+            top = sorted(scores, key=lambda key: (-scores[key], key))[:k]
+            plays = get_plays(top, self.db_path)
+
+        results = []
+        for key in top:
+            if key in plays:
+                results.append({**plays[key], "score": round(scores[key], 5), "ranks": ranks[key]})
+        return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Retrieve plays for a question.")
+    parser.add_argument("question")
+    parser.add_argument("--game", action="append", dest="game_ids", help="restrict to a game id (repeatable)")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--mode", choices=MODES, default="hybrid")
+    args = parser.parse_args()
+
+    store = None
+    if args.mode != "lexical":
+        from src.embeddings.build_index import PLAY_INDEX_PATH, load_play_index
+        if PLAY_INDEX_PATH.exists():
+            store = load_play_index()
+        else:
+            print("No play vector index; build it with: python -m src.embeddings.build_index plays")
+    retriever = HybridRetriever(store)
+    print(json.dumps(retriever.filters(args.question, args.game_ids)))
+    for r in retriever.retrieve(args.question, args.k, args.game_ids, args.mode):
+        print(f"{r['score']:.4f} {r['ranks']} {r['game_id']} Q{r['period']} {r['description']}")
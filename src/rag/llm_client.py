@@ -0,0 +1,349 @@
+"""OpenAI chat client with deadlines, a concurrency cap, backoff, a circuit breaker and hedging.
+
+Every `invoke` call:
+
+  - has one overall deadline (`PLAYMIND_LLM_TIMEOUT`) covering queueing,
+    retries and backoff, and raises `LLMTimeout` when it passes;
+  - waits for one of `PLAYMIND_LLM_MAX_CONCURRENCY` process-wide slots, so a
+    slow provider queues requests here (visible in /metrics) instead of piling
+    up open connections;
+  - retries rate limits (429), 5xx and connection errors up to
+    `PLAYMIND_LLM_MAX_RETRIES` times with exponential backoff and jitter,
+    honouring Retry-After;
+  - fails fast with `LLMUnavailable` while the circuit breaker is open, i.e.
+    after `BREAKER_FAILURES` consecutive timeouts / server errors, until a
+    probe request succeeds `BREAKER_RESET_SECONDS` later;
+  - optionally sends a second, identical request when the first has not
+    answered after `PLAYMIND_LLM_HEDGE_AFTER` seconds and takes whichever
+    finishes first (only if a spare slot is free, so hedges never queue).
+
+Test it against `python -m src.benchmarks.fake_openai` via OPENAI_BASE_URL.
+`build_llm` returns this client, or the local CPU model in src.rag.local_llm
+when PLAYMIND_LLM_BACKEND=local.
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import openai
+from openai import OpenAI
+
+from src.utils.metrics import REGISTRY, record_tokens, time_stage
+
+
+SYSTEM_PROMPT = (
+    "You are an NBA analyst. Answer in one short sentence (<=25 words). "
+    "Use only the provided game context. If the context lacks the information, reply exactly: 'Not enough information.' "
+    "Return only the answer with no preamble."
+)
+
+LLM_BACKENDS = ("openai", "local")
+LLM_BACKEND = os.getenv("PLAYMIND_LLM_BACKEND", "openai").strip().lower()
+
+DEFAULT_TIMEOUT = float(os.getenv("PLAYMIND_LLM_TIMEOUT", "30"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("PLAYMIND_LLM_MAX_CONCURRENCY", "8"))
+DEFAULT_MAX_RETRIES = int(os.getenv("PLAYMIND_LLM_MAX_RETRIES", "3"))
+# 0 disables hedging; a good value is around the provider's p95 latency.
+DEFAULT_HEDGE_AFTER = float(os.getenv("PLAYMIND_LLM_HEDGE_AFTER", "0"))
+
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+BREAKER_FAILURES = 5
+BREAKER_RESET_SECONDS = 30.0
+
+# Worth retrying: the provider is overloaded or briefly unreachable.
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+LLM_REQUESTS = REGISTRY.counter(
+    "playmind_llm_requests_total",
+    "LLM invocations by final outcome (ok, timeout, queue_timeout, rate_limited, unavailable, circuit_open, error).",
+    ("outcome",),
+)
+LLM_RETRIES = REGISTRY.counter(
+    "playmind_llm_retries_total",
+    "Retried LLM requests by reason.",
+    ("reason",),
+)
+LLM_HEDGES = REGISTRY.counter(
+    "playmind_llm_hedges_total",
+    "Hedged LLM requests by which copy answered first (primary / hedge).",
+    ("winner",),
+)
+LLM_QUEUE_SECONDS = REGISTRY.histogram(
+    "playmind_llm_queue_seconds",
+    "Time spent waiting for an LLM concurrency slot.",
+)
+LLM_QUEUED = REGISTRY.gauge(
+    "playmind_llm_queued",
+    "Requests currently waiting for an LLM concurrency slot.",
+)
+LLM_IN_FLIGHT = REGISTRY.gauge(
+    "playmind_llm_in_flight",
+    "LLM requests currently being sent to the provider.",
+)
+LLM_CIRCUIT_OPEN = REGISTRY.gauge(
+    "playmind_llm_circuit_open",
+    "1 while the LLM circuit breaker is open (requests fail fast).",
+)
+
+
+class LLMUnavailable(RuntimeError):
+    """The provider could not produce an answer (circuit open, retries exhausted)."""
+
+
+class LLMTimeout(LLMUnavailable):
+    """The per-request deadline passed before an answer arrived."""
+
+
+class LLMQueueTimeout(LLMTimeout):
+    """The deadline passed while waiting for a concurrency slot (local overload, not a provider failure)."""
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; lets one probe through after `reset_after`."""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURES, reset_after: float = BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._probe_thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._probing and time.monotonic() - self._opened_at >= self.reset_after:
+                self._probing = True  # half-open: exactly one request tests the provider
+                self._probe_thread = threading.get_ident()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+        LLM_CIRCUIT_OPEN.set(0)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._probing = False
+                opened = True
+            else:
+                opened = self._opened_at is not None
+        LLM_CIRCUIT_OPEN.set(1 if opened else 0)
+
+    def release_probe(self):
+        """End this thread's probe without a verdict (e.g. 429, queue timeout, client error).
+
+        The circuit stays open and the next request after `reset_after` probes
+        again; a no-op when the probe already recorded success or failure, or
+        when the calling thread isn't the probe.
+        """
+        with self._lock:
+            if self._probing and self._probe_thread == threading.get_ident():
+                self._probing = False
+
+
+def _remaining(deadline: float) -> float:
+    return deadline - time.monotonic()
+
+
+def _retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class OpenAIChatLLM:
+    def __init__(self, client, model: str, timeout: float = DEFAULT_TIMEOUT,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, max_retries: int = DEFAULT_MAX_RETRIES,
+                 hedge_after: float = DEFAULT_HEDGE_AFTER, breaker: CircuitBreaker | None = None):
+        self.client = client
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        # Hedged requests run on worker threads so the caller can wait on both copies.
+        self._pool = ThreadPoolExecutor(max_workers=2 * max_concurrency, thread_name_prefix="llm") if hedge_after > 0 else None
+
+    # -- one HTTP request ---------------------------------------------------
+    def _acquire(self, deadline: float):
+        start = time.monotonic()
+        LLM_QUEUED.inc()
+        try:
+            acquired = self._slots.acquire(timeout=max(0.0, _remaining(deadline)))
+        finally:
+            LLM_QUEUED.dec()
+            LLM_QUEUE_SECONDS.observe(time.monotonic() - start)
+        if not acquired:
+            raise LLMQueueTimeout("Timed out waiting for an LLM slot")
+
+    def _send(self, request: dict, deadline: float, slot_held: bool = False):
+        if not slot_held:
+            self._acquire(deadline)
+        LLM_IN_FLIGHT.inc()
+        try:
+            remaining = _remaining(deadline)
+            if remaining <= 0:
+                raise LLMTimeout("LLM deadline passed before the request was sent")
+            return self.client.chat.completions.create(timeout=remaining, **request)
+        finally:
+            LLM_IN_FLIGHT.dec()
+            self._slots.release()
+
+    def _send_hedged(self, request: dict, deadline: float):
+        primary = self._pool.submit(self._send, request, deadline)
+        done, _ = wait([primary], timeout=max(0.0, min(self.hedge_after, _remaining(deadline))))
+        if done:
+            return primary.result()
+
+        pending = {primary}
+        hedge = None
+        # Only hedge with spare capacity: a hedge that has to queue can't beat the primary.
+        if _remaining(deadline) > 0 and self._slots.acquire(blocking=False):
+            hedge = self._pool.submit(self._send, request, deadline, True)
+            pending.add(hedge)
+
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, _remaining(deadline)), return_when=FIRST_COMPLETED)
+            if not done:
+                raise LLMTimeout(f"No LLM response within {self.timeout:.0f}s")
+            for future in done:
+                if future.exception() is None:
+                    if hedge is not None:
+                        LLM_HEDGES.inc(winner="hedge" if future is hedge else "primary")
+                    # The losing copy finishes in the background and frees its slot.
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        hinted = _retry_after(error)
+        if hinted is not None:
+            return min(hinted, BACKOFF_MAX_SECONDS)
+        delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempt - 1), BACKOFF_MAX_SECONDS)
+        return delay * random.uniform(0.5, 1.0)
+
+    # -- public API -----------------------------------------------------------
+    def invoke(self, input_text: str, system: str | None = None,
+               max_completion_tokens: int = 80, json_mode: bool = False):
+        # `system`, `max_completion_tokens` and `json_mode` are overridden by batch asks
+        request = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system or SYSTEM_PROMPT},
+                {"role": "user", "content": input_text},
+            ],
+            "max_completion_tokens": max_completion_tokens,
+        }
+        if json_mode:
+            request["response_format"] = {"type": "json_object"}
+
+        if not self.breaker.allow():
+            LLM_REQUESTS.inc(outcome="circuit_open")
+            raise LLMUnavailable("LLM provider unavailable (circuit open); try again shortly")
+
+        try:
+            return self._call(request)
+        finally:
+            # Whatever happened, a half-open probe must not keep the circuit stuck open.
+            self.breaker.release_probe()
+
+    def _call(self, request: dict) -> str:
+        deadline = time.monotonic() + self.timeout
+        attempt = 0
+        empty_retry = True
+        while True:
+            try:
+                with time_stage("llm"):
+                    if self._pool is not None:
+                        resp = self._send_hedged(request, deadline)
+                    else:
+                        resp = self._send(request, deadline)
+            except LLMQueueTimeout:
+                LLM_REQUESTS.inc(outcome="queue_timeout")
+                raise
+            except LLMTimeout:
+                self.breaker.record_failure()
+                LLM_REQUESTS.inc(outcome="timeout")
+                raise
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, openai.APITimeoutError) and _remaining(deadline) <= 0:
+                    self.breaker.record_failure()
+                    LLM_REQUESTS.inc(outcome="timeout")
+                    raise LLMTimeout(f"No LLM response within {self.timeout:.0f}s") from e
+                rate_limited = isinstance(e, openai.RateLimitError)
+                # 429 means "slow down", not "down": it doesn't count towards opening the circuit.
+                if not rate_limited:
+                    self.breaker.record_failure()
+                attempt += 1
+                delay = self._backoff(attempt, e)
+                if attempt > self.max_retries or self.breaker.is_open or delay >= _remaining(deadline):
+                    LLM_REQUESTS.inc(outcome="rate_limited" if rate_limited else "unavailable")
+                    raise LLMUnavailable(f"LLM request failed after {attempt} attempt(s): {e}") from e
+                LLM_RETRIES.inc(reason="rate_limit" if rate_limited else type(e).__name__)
+                time.sleep(delay)
+                continue
+            except Exception:
+                LLM_REQUESTS.inc(outcome="error")
+                raise
+
+            self.breaker.record_success()
+            usage = getattr(resp, "usage", None)
+            if usage is not None:
+                record_tokens(usage.prompt_tokens, usage.completion_tokens)
+            content = resp.choices[0].message.content or ""
+            if content.strip() or not empty_retry or _remaining(deadline) <= 0:
+                LLM_REQUESTS.inc(outcome="ok")
+                # Possibly empty: return whatever we have to keep the flow moving
+                return content
+            # Simple retry to avoid sporadic empty responses
+            empty_retry = False
+            LLM_RETRIES.inc(reason="empty")
+            print("⚠️ Received empty content from model, retrying...")
+
+
+def build_llm(backend: str | None = None, **overrides):
+    """LLM client for PLAYMIND_LLM_BACKEND: "openai" (default) or "local" (see src.rag.local_llm).
+
+    The OpenAI client uses OPENAI_MODEL and honours OPENAI_BASE_URL (e.g. the
+    fake server) and the PLAYMIND_LLM_* settings.
+    """
+    backend = (backend or LLM_BACKEND).strip().lower()
+    if backend == "local":
+        from src.rag.local_llm import build_local_llm
+        return build_local_llm(**overrides)
+    if backend != "openai":
+        raise ValueError(f"PLAYMIND_LLM_BACKEND must be one of {LLM_BACKENDS}, got {backend!r}")
+
+    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    print(f"Using OpenAI model: {model}")
+    # Retries and timeouts are handled here, not by the SDK, so they share one deadline.
+    client = OpenAI(max_retries=0)
+    return OpenAIChatLLM(client, model, **overrides)
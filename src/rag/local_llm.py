@@ -0,0 +1,198 @@
+"""Local CPU chat model with the same `invoke` interface as the OpenAI client.
+
+Selected with PLAYMIND_LLM_BACKEND=local. A small instruction-tuned model
+(`PLAYMIND_LOCAL_MODEL`) is loaded through transformers once per process and
+stays resident, so only the first call (or `warm()`, which the API runs at
+startup) pays for loading it.
+
+Concurrent `invoke` calls are micro-batched. Callers enqueue their prompt and
+wait; one worker thread takes the oldest request, collects whatever else
+arrives within `PLAYMIND_LOCAL_BATCH_WAIT_MS` (up to `PLAYMIND_LOCAL_MAX_BATCH`
+requests) and runs a single left-padded `generate` for all of them. On CPU a
+batch of 8 costs far less than 8 sequential calls, so throughput under load
+grows with the batch instead of with the queue.
+
+Decoding is greedy. The model has no constrained decoding, so `json_mode` is
+emulated with an extra instruction and by trimming the reply to its
+outermost JSON object.
+"""
+
+import importlib.util
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from src.rag.llm_client import DEFAULT_TIMEOUT, LLM_REQUESTS, SYSTEM_PROMPT, LLMTimeout, LLMUnavailable
+from src.utils.metrics import REGISTRY, record_tokens, time_stage
+
+
+LOCAL_MODEL = os.getenv("PLAYMIND_LOCAL_MODEL", "Qwen/Qwen2.5-0.5B-Instruct")
+MAX_BATCH = int(os.getenv("PLAYMIND_LOCAL_MAX_BATCH", "8"))
+# How long the batcher waits for more requests after the first one arrives
+BATCH_WAIT_SECONDS = float(os.getenv("PLAYMIND_LOCAL_BATCH_WAIT_MS", "10")) / 1000
+# Torch intra-op threads (0 leaves torch's default, one per physical core)
+NUM_THREADS = int(os.getenv("PLAYMIND_LOCAL_THREADS", "0"))
+
+JSON_INSTRUCTION = " Reply with a single JSON object and nothing else."
+
+LOCAL_BATCH_SIZE = REGISTRY.histogram(
+    "playmind_llm_local_batch_size",
+    "Requests per local-model generate call.",
+    buckets=(1, 2, 4, 8, 16, 32),
+)
+LOCAL_QUEUED = REGISTRY.gauge(
+    "playmind_llm_local_queued",
+    "Requests waiting for the local model's next batch.",
+)
+
+_models: dict[str, tuple] = {}
+_models_lock = threading.Lock()
+
+
+def load_model(name: str = LOCAL_MODEL) -> tuple:
+    """(tokenizer, model) for `name`, loaded on first use and kept for the life of the process."""
+    with _models_lock:
+        if name not in _models:
+            import torch
+            from transformers import AutoModelForCausalLM, AutoTokenizer
+
+            if NUM_THREADS > 0:
+                torch.set_num_threads(NUM_THREADS)
+            print(f"Loading local model: {name}")
+            with time_stage("llm_local_load"):
+                tokenizer = AutoTokenizer.from_pretrained(name)
+                # Decoder-only models continue from the last position, so batches pad on the left.
+                tokenizer.padding_side = "left"
+                if tokenizer.pad_token is None:
+                    tokenizer.pad_token = tokenizer.eos_token
+                model = AutoModelForCausalLM.from_pretrained(name, torch_dtype=torch.float32)
+                model.eval()
+            _models[name] = (tokenizer, model)
+        return _models[name]
+
+
+def json_object(text: str) -> str:
+    """The outermost {...} in `text` (fences and chatter around it dropped), else `text` unchanged."""
+    match = re.search(r"\{.*\}", text, re.S)
+    return match.group(0) if match else text
+
+
+class LocalChatLLM:
+    def __init__(self, model_name: str = LOCAL_MODEL, timeout: float = DEFAULT_TIMEOUT,
+                 max_batch: int = MAX_BATCH, batch_wait: float = BATCH_WAIT_SECONDS):
+        self.model_name = model_name
+        self.timeout = timeout
+        self.max_batch = max(1, max_batch)
+        self.batch_wait = batch_wait
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def warm(self):
+        """Load the model and start the batcher now instead of on the first call."""
+        load_model(self.model_name)
+        self._ensure_worker()
+
+    # -- batching worker ------------------------------------------------------
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="llm-local", daemon=True)
+                self._worker.start()
+
+    def _next_batch(self) -> list[tuple]:
+        batch = [self._queue.get()]
+        until = time.monotonic() + self.batch_wait
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, until - time.monotonic())))
+            except queue.Empty:
+                break
+        LOCAL_QUEUED.dec(len(batch))
+        return batch
+
+    def _run(self):
+        while True:
+            # Callers that already timed out cancelled their future; don't generate for them.
+            batch = [r for r in self._next_batch() if r[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            LOCAL_BATCH_SIZE.observe(len(batch))
+            try:
+                with time_stage("llm_local_batch"):
+                    outputs = self._generate([(messages, budget) for messages, budget, _ in batch])
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, _, future), output in zip(batch, outputs):
+                future.set_result(output)
+
+    def _generate(self, requests: list[tuple[list[dict], int]]) -> list[tuple[str, int, int]]:
+        """One generate call for every (messages, max_new_tokens); returns (text, prompt_tokens, completion_tokens)."""
+        import torch
+
+        tokenizer, model = load_model(self.model_name)
+        prompts = [tokenizer.apply_chat_template(m, tokenize=False, add_generation_prompt=True) for m, _ in requests]
+        enc = tokenizer(prompts, return_tensors="pt", padding=True)
+        with torch.inference_mode():
+            out = model.generate(
+                **enc,
+                max_new_tokens=max(budget for _, budget in requests),
+                do_sample=False,
+                pad_token_id=tokenizer.pad_token_id,
+            )
+        # Rows that finished early are padded out to the longest completion.
+        completions = out[:, enc["input_ids"].shape[1]:]
+        results = []
+        for i, (_, budget) in enumerate(requests):
+            ids = completions[i][:budget]
+            ids = ids[ids != tokenizer.pad_token_id]
+            text = tokenizer.decode(ids, skip_special_tokens=True).strip()
+            results.append((text, int(enc["attention_mask"][i].sum()), len(ids)))
+        return results
+
+    # -- public API -----------------------------------------------------------
+    def invoke(self, input_text: str, system: str | None = None,
+               max_completion_tokens: int = 80, json_mode: bool = False):
+        system = system or SYSTEM_PROMPT
+        if json_mode:
+            system += JSON_INSTRUCTION
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": input_text},
+        ]
+
+        self._ensure_worker()
+        future = Future()
+        LOCAL_QUEUED.inc()
+        self._queue.put((messages, max_completion_tokens, future))
+        try:
+            with time_stage("llm"):
+                text, prompt_tokens, completion_tokens = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            LLM_REQUESTS.inc(outcome="timeout")
+            raise LLMTimeout(f"No local model response within {self.timeout:.0f}s") from None
+        except Exception as e:
+            LLM_REQUESTS.inc(outcome="unavailable")
+            raise LLMUnavailable(f"Local model failed: {e}") from e
+
+        record_tokens(prompt_tokens, completion_tokens)
+        LLM_REQUESTS.inc(outcome="ok")
+        return json_object(text) if json_mode else text
+
+
+def build_local_llm(**overrides) -> LocalChatLLM:
+    """Local backend for PLAYMIND_LOCAL_MODEL; the model itself loads lazily (see `warm`)."""
+    # Checked here rather than on the first ask, which would fail with a bare ModuleNotFoundError.
+    missing = [m for m in ("torch", "transformers") if importlib.util.find_spec(m) is None]
+    if missing:
+        raise ImportError(
+            f"PLAYMIND_LLM_BACKEND=local needs {' and '.join(missing)}: pip install torch transformers"
+        )
+    print(f"Using local model: {overrides.get('model_name', LOCAL_MODEL)}")
+    return LocalChatLLM(**overrides)
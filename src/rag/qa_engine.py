@@ -1,91 +1,29 @@
 import json
 import time
 from pathlib import Path
-from openai import OpenAI
-import os
 from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate
 
+from src.rag.llm_client import build_llm
+from src.rag.stat_router import answer_with_router
+from src.utils.context_snapshot import load_context_snapshot, save_context_snapshot
+from src.utils.game_state import load_game_state
+from src.utils.metrics import time_stage
 
-# Automatically load the most recent summary file
-SUMMARY_DIR = Path("data/structured")
-SUMMARY_PATH = max(SUMMARY_DIR.glob("*_summary.json"), key=lambda p: p.stat().st_mtime)
-
-
-# Load environment variables from .env (if present)
-load_dotenv()
 
-# -------------------------------------------------------------
-# Load and format summarized game data
-# -------------------------------------------------------------
-def load_summary(path=SUMMARY_PATH):
-    with open(path, "r") as f:
-        data = json.load(f)
-
-    teams = data.get("teams", [])
-    summary_text = []
-
-    summary_text.append(f"This game featured {teams[0]} vs {teams[1]}.")
-    fs = data.get("final_score", {})
-    summary_text.append(
-        f"Final Score — {teams[0]}: {fs.get(teams[0], 'N/A')}, {teams[1]}: {fs.get(teams[1], 'N/A')}."
-    )
-
-    def fmt_stat(stat):
-        s = data.get(stat, {})
-        return f"{stat.replace('_', ' ').title()} — {teams[0]}: {s.get(teams[0], 'N/A')}, {teams[1]}: {s.get(teams[1], 'N/A')}."
-
-    for stat in ["three_pointers", "field_goals", "free_throws", "turnovers", "rebounds", "fouls", "steals", "blocks", "timeouts", "substitutions"]:
-        summary_text.append(fmt_stat(stat))
+SUMMARY_DIR = Path("data/structured")
 
-    narrative = data.get("narrative", "")
-    if narrative:
-        summary_text.append(f"Game summary: {narrative}")
 
-    return "\n".join(summary_text)
+def latest_summary_path() -> Path:
+    """Most recently written summary file (the CLI chats about this game)."""
+    summaries = list(SUMMARY_DIR.glob("*_summary.json"))
+    if not summaries:
+        raise FileNotFoundError(f"No *_summary.json files found in {SUMMARY_DIR}")
+    return max(summaries, key=lambda p: p.stat().st_mtime)
 
 
-# -------------------------------------------------------------
-# Build and load the model
-# -------------------------------------------------------------
-def build_llm():
-    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-    print(f"Using OpenAI model: {model}")
-    client = OpenAI()
-
-    class OpenAIChatLLM:
-        def __init__(self, client, model):
-            self.client = client
-            self.model = model
-        def invoke(self, input_text: str):
-            # Simple retry to avoid sporadic empty responses
-            last_content = None
-            for attempt in range(1, 3):
-                resp = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": (
-                                "You are an NBA analyst. Answer in one short sentence (<=25 words). "
-                                "Use only the provided game context. If the context lacks the information, reply exactly: 'Not enough information.' "
-                                "Return only the answer with no preamble."
-                            ),
-                        },
-                        {"role": "user", "content": input_text},
-                    ],
-                    max_completion_tokens=80,
-                )
-                content = resp.choices[0].message.content or ""
-                if content.strip():
-                    return content
-                last_content = content
-                print("⚠️ Received empty content from model, retrying... (attempt", attempt, ")")
-            # Fallback: return whatever we have (possibly empty) to keep flow moving
-            return last_content or ""
-
-    return OpenAIChatLLM(client, model)
-
+# Load environment variables from .env (if present)
+load_dotenv()
 
 # -------------------------------------------------------------
 # Prompt and QA logic
@@ -100,18 +38,22 @@ def build_prompt():
     )
 
 
-def ask(llm, prompt, context, question):
+def ask(llm, prompt, context, question, summary=None, state=None):
     start = time.time()
 
-    input_text = prompt.format(context=context, question=question)
-    result = llm.invoke(input_text)
+    def call_llm():
+        input_text = prompt.format(context=context, question=question)
+        result = llm.invoke(input_text)
+
+        if isinstance(result, dict) and "generated_text" in result:
+            return result["generated_text"]
+        return str(result)
 
-    if isinstance(result, dict) and "generated_text" in result:
-        answer = result["generated_text"]
-    else:
-        answer = str(result)
+    with time_stage("ask"):
+        # Factual stat lookups are answered from the summary without calling the model
+        answer, route = answer_with_router(question, summary, call_llm, state)
 
-    print("\nAnswer:", answer.strip())
+    print("\nAnswer:", answer.strip(), "[from summary]" if route == "fast_path" else "")
     print(f"\n⏱  Completed in {time.time() - start:.1f}s\n")
 
 
@@ -119,7 +61,17 @@ def ask(llm, prompt, context, question):
 # Interactive main loop
 # -------------------------------------------------------------
 def main():
-    context = load_summary()
+    summary_path = latest_summary_path()
+    game_id = summary_path.name.split("_summary.json")[0]
+    with open(summary_path, "r") as f:
+        summary = json.load(f)
+    state = load_game_state(game_id, SUMMARY_DIR)
+
+    # Same context block the API sends for this game, rendered at ingest
+    snapshot = load_context_snapshot(game_id, SUMMARY_DIR)
+    if snapshot is None:
+        snapshot = save_context_snapshot(game_id, str(summary_path), structured_dir=SUMMARY_DIR)
+    context = snapshot["text"]
 
     print("\n================ GAME SUMMARY CONTEXT ================\n")
     print(context)
@@ -128,7 +80,7 @@ def main():
     llm = build_llm()
     prompt = build_prompt()
 
-    print(f"\nLoaded summary file: {SUMMARY_PATH.name}")
+    print(f"\nLoaded summary file: {summary_path.name}")
     print("\nNBA Analyst Chat — type 'quit' to stop.\n")
 
     while True:
@@ -138,7 +90,7 @@ def main():
             break
         if not q:
             continue
-        ask(llm, prompt, context, q)
+        ask(llm, prompt, context, q, summary, state)
 
 
 if __name__ == "__main__":
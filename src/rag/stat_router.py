@@ -0,0 +1,419 @@
+"""Deterministic fast path for factual stat questions.
+
+Questions such as "What was the final score?" or "How many turnovers did SAC
+have?" are answered straight from the summary produced by
+`summarize_parsed_game`, skipping the LLM round trip entirely. Anything the
+router is not confident about returns None and goes to the LLM as before.
+
+Routing decisions are counted in `playmind_router_decisions_total` so the
+fast-path / fallback ratio shows up on /metrics.
+"""
+
+import re
+
+from src.utils.game_state import REGULATION_PERIODS, period_label, period_length
+from src.utils.metrics import REGISTRY
+
+
+ROUTER_DECISIONS = REGISTRY.counter(
+    "playmind_router_decisions_total",
+    "Questions answered by the deterministic stat router vs. sent to the LLM.",
+    ("route",),
+)
+
+# summary key -> (phrases that identify it, noun used in answers)
+STAT_PHRASES = {
+    "three_pointers": (("three pointer", "three-pointer", "3-pointer", "3 pointer", "3pt", "3-pt", "threes", "three point", "3 point", "3-point"), "three-pointers"),
+    "free_throws": (("free throw", "free-throw", "ft"), "free throws"),
+    "field_goals": (("field goal", "field-goal", "fg"), "field goals"),
+    "turnovers": (("turnover", "giveaway"), "turnovers"),
+    "rebounds": (("rebound", "boards"), "rebounds"),
+    "fouls": (("foul",), "fouls"),
+    "steals": (("steal",), "steals"),
+    "blocks": (("block",), "blocks"),
+    "timeouts": (("timeout", "time out", "time-out"), "timeouts"),
+    "substitutions": (("substitution",), "substitutions"),
+    "scoring_runs": (("scoring run", "runs"), "scoring runs"),
+    "final_score": (("points", "score"), "points"),
+}
+
+TEAM_NAMES = {
+    "hawks": "ATL", "celtics": "BOS", "nets": "BKN", "hornets": "CHA", "bulls": "CHI",
+    "cavaliers": "CLE", "cavs": "CLE", "mavericks": "DAL", "mavs": "DAL", "nuggets": "DEN",
+    "pistons": "DET", "warriors": "GSW", "rockets": "HOU", "pacers": "IND", "clippers": "LAC",
+    "lakers": "LAL", "grizzlies": "MEM", "heat": "MIA", "bucks": "MIL", "timberwolves": "MIN",
+    "wolves": "MIN", "pelicans": "NOP", "knicks": "NYK", "thunder": "OKC", "magic": "ORL",
+    "76ers": "PHI", "sixers": "PHI", "suns": "PHX", "blazers": "POR", "trail blazers": "POR",
+    "kings": "SAC", "spurs": "SAS", "raptors": "TOR", "jazz": "UTA", "wizards": "WAS",
+}
+
+# Questions asking for reasoning or about individual players always go to the LLM.
+ANALYTICAL = re.compile(
+    r"\b(why|explain|analy[sz]e|impact|strategy|momentum|because|should|player|who scored|"
+    r"top scorer|leading scorer)\b"
+)
+
+# Time slices are answered from the game-state index when it is available and
+# are otherwise left to the LLM rather than guessed at.
+LLM_ONLY = re.compile(
+    r"\b(quarter|half|halftime|period|overtime|ot|minute|clock|lead|percentage|pct|efficien\w*|"
+    r"per game|average)\b|%"
+)
+
+# summary key -> GameState stat columns (made, attempts) or (count,)
+STATE_COLUMNS = {
+    "three_pointers": ("tpm", "tpa"),
+    "field_goals": ("fgm", "fga"),
+    "free_throws": ("ftm", "fta"),
+    "turnovers": ("tov",),
+    "rebounds": ("reb",),
+    "fouls": ("pf",),
+    "steals": ("stl",),
+    "blocks": ("blk",),
+}
+
+QUARTER_NAMES = {1: "first quarter", 2: "second quarter", 3: "third quarter", 4: "fourth quarter"}
+
+PERIOD_WORDS = {
+    "first": 1, "1st": 1, "second": 2, "2nd": 2, "third": 3, "3rd": 3, "fourth": 4, "4th": 4,
+}
+# Words a plain team stat question may contain besides team names and stat
+# phrases. Anything else ("paint", "bench", "fast break", a player's name)
+# qualifies the stat in a way the summary can't answer, so the question goes
+# to the LLM instead of being answered with the team total.
+PLAIN_WORDS = frozenset(
+    "a an the and or vs versus of in on at by for to with than it its they their there each both this that "
+    "how many much what whats was were is are be been did do does have has had get got "
+    "who which won win wins lost lose loses winner margin beat game games team teams total number "
+    "final current score scored scoring point points "
+    "more most higher highest better outscore outscored fewer less least lower lowest "
+    "make made makes attempt attempts attempted shoot shot hit commit committed commits grab grabbed "
+    "record recorded take took call called use used "
+    "halftime half quarter overtime ot q1 q2 q3 q4 first 1st second 2nd third 3rd fourth 4th "
+    "after through end largest biggest lead leads led change changes changed hands tied ties".split()
+)
+
+# Period phrases the game-state routing understands. Ordinals outside them
+# ("points in the first", "score after the third") name a period the router
+# can't resolve, so the question goes to the LLM instead of getting a
+# whole-game answer.
+PERIOD_PHRASE = re.compile(
+    r"\b(first|1st|second|2nd|third|3rd|fourth|4th) (quarter|half)\b|\bq[1-4]\b|\b(overtime|ot)\b|"
+    r"\bhalf-?time\b|\bthe half\b"
+)
+ORDINALS = frozenset("first 1st second 2nd third 3rd fourth 4th".split())
+MORE = re.compile(r"\b(more|most|higher|highest|better|outscored?)\b")
+FEWER = re.compile(r"\b(fewer|less|least|lower|lowest)\b")
+
+
+def _normalize(question: str) -> str:
+    q = question.lower().replace("’", "'")
+    return re.sub(r"\s+", " ", q).strip(" ?.!")
+
+
+def teams_in_question(question: str, teams) -> list[str]:
+    """Tricodes from `teams` named in `question`: as an uppercase code ("BOS") or a nickname ("celtics").
+
+    Lowercase words are never read as codes, so "was" or "min" don't become WAS / MIN.
+    """
+    norm = question.lower()
+    upper_tokens = set(re.findall(r"\b[A-Z]{3}\b", question))
+    found = sorted(t for t in teams if t in upper_tokens)
+    for name, code in TEAM_NAMES.items():
+        if code in teams and code not in found and re.search(rf"\b{re.escape(name)}\b", norm):
+            found.append(code)
+    return found
+
+
+def _teams_in(question: str, norm: str, teams: list[str]) -> list[str]:
+    # Within one game's two teams a lowercase code ("sac") is unambiguous enough.
+    found = [t for t in teams if t.lower() in norm.split()]
+    return found + [t for t in teams_in_question(question, teams) if t not in found]
+
+
+def _words(text: str) -> list[str]:
+    return [w.removesuffix("'s") for w in re.findall(r"[a-z0-9']+", text)]
+
+
+def _has_qualifier(norm: str, teams: list[str]) -> bool:
+    """True if `norm` has a word beyond teams, stat phrases and PLAIN_WORDS (a player, "paint", "bench"...).
+
+    Multi-word phrases only count as a whole: "times" alone is not "time outs".
+    """
+    rest = norm
+    phrases = [p for ps, _ in STAT_PHRASES.values() for p in ps]
+    phrases += [name for name, code in TEAM_NAMES.items() if code in teams]
+    for phrase in sorted(phrases, key=len, reverse=True):
+        rest = re.sub(rf"\b{re.escape(phrase)}s?\b", " ", rest)
+    known = PLAIN_WORDS | {t.lower() for t in teams}
+    return any(w not in known for w in _words(rest))
+
+
+def _bare_period(norm: str) -> bool:
+    """True if `norm` refers to a period without a phrase PERIOD_PHRASE recognises."""
+    rest = PERIOD_PHRASE.sub(" ", norm)
+    words = set(_words(rest))
+    if words & ORDINALS:
+        return True
+    # "after" / "through" / "end of" only make sense with a period named
+    return rest == norm and bool(words & {"after", "through", "end"})
+
+
+def _stat_keys_in(norm: str) -> list[str]:
+    keys = []
+    for key, (phrases, _) in STAT_PHRASES.items():
+        if any(re.search(rf"\b{re.escape(p)}s?\b", norm) for p in phrases):
+            keys.append(key)
+    # "field goals" also matches the bare "score" phrase of final_score in some phrasings
+    if len(keys) > 1 and "final_score" in keys:
+        keys.remove("final_score")
+    return keys
+
+
+def _value(summary: dict, key: str, team: str):
+    return summary.get(key, {}).get(team)
+
+
+def _magnitude(value) -> float | None:
+    """Comparable number: made count for "m/a" strings, the value itself for counts."""
+    if value is None:
+        return None
+    if isinstance(value, str) and "/" in value:
+        made = value.split("/", 1)[0]
+        return float(made) if made.isdigit() else None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _fmt(key: str, value) -> str:
+    noun = STAT_PHRASES[key][1]
+    if isinstance(value, str) and "/" in value:
+        return f"{value} {noun}"
+    if value == 1 and noun.endswith("s"):
+        noun = noun[:-1]
+    return f"{value} {noun}"
+
+
+def _phrase(team: str, key: str, value) -> str:
+    """'BOS made 15 of 40 three-pointers' / 'SAC had 14 turnovers' / 'BOS scored 112 points'."""
+    if isinstance(value, str) and "/" in value:
+        made, att = value.split("/", 1)
+        return f"{team} made {made} of {att} {STAT_PHRASES[key][1]}"
+    if key == "final_score":
+        return f"{team} scored {value} points"
+    return f"{team} had {_fmt(key, value)}"
+
+
+def _is_final(summary: dict) -> bool:
+    return summary.get("status") == "final"
+
+
+def _score_line(summary: dict, teams: list[str]) -> str | None:
+    fs = summary.get("final_score", {})
+    a, b = teams
+    if a not in fs or b not in fs:
+        return None
+    winner, loser = (a, b) if fs[a] >= fs[b] else (b, a)
+    return f"{winner} {fs[winner]}, {loser} {fs[loser]}"
+
+
+def _split_line(scores: dict, teams: list[str]) -> str:
+    a, b = teams
+    return f"{a} {scores[a]}, {b} {scores[b]}"
+
+
+def _period_window(norm: str, state):
+    """(start period, end period, label) named in `norm`; None if no period is named.
+
+    Returns an answer string instead when the question names overtime in a
+    game that did not have one.
+    """
+    half = re.search(r"\b(first|1st|second|2nd) half\b", norm)
+    quarter = re.search(r"\b(first|1st|second|2nd|third|3rd|fourth|4th) quarter\b|\bq([1-4])\b", norm)
+    overtime = re.search(r"\b(overtime|ot)\b", norm)
+
+    if half:
+        first_half = PERIOD_WORDS[half.group(1)] == 1
+        return (1, 2, "first half") if first_half else (3, 4, "second half")
+    if quarter:
+        start = PERIOD_WORDS.get(quarter.group(1) or "") or int(quarter.group(2))
+        return start, start, QUARTER_NAMES[start]
+    if overtime:
+        if state.last_period() <= REGULATION_PERIODS:
+            return "The game did not go to overtime."
+        return REGULATION_PERIODS + 1, state.last_period(), "overtime"
+    return None
+
+
+def _route_state(norm: str, mentioned: list[str], state) -> str | None:
+    """Halftime / quarter / overtime scores, largest leads and lead changes from a GameState."""
+    teams = state.teams
+    a, b = teams
+    derived = state.derived
+
+    window = _period_window(norm, state)
+    if isinstance(window, str):
+        return window
+    if window is not None and window[0] > state.last_period():
+        return None
+
+    if re.search(r"\b(biggest|largest) lead\b", norm):
+        if window is None:
+            leads, when = derived.get("largest_lead", {}), ""
+        else:
+            start, end, label = window
+            leads = state.largest_lead_between((start, period_length(start)), (end, 0.0))
+            when = f" in the {label}"
+        focus = mentioned if len(mentioned) == 1 else teams
+        parts = []
+        for t in focus:
+            lead = leads.get(t, {})
+            if lead.get("lead"):
+                parts.append(f"{t}'s largest lead{when} was {lead['lead']} ({period_label(lead['period'])} {lead['clock']})")
+            else:
+                parts.append(f"{t} never led{when}")
+        return "; ".join(parts) + "."
+
+    if re.search(r"\blead changes?\b|\bchanges? of the lead\b", norm):
+        if window is not None:
+            return None  # only whole-game lead changes are precomputed
+        return f"The lead changed hands {derived.get('lead_changes', 0)} times and the game was tied {derived.get('ties', 0)} times."
+
+    if re.search(r"\b(at|by) (halftime|the half)\b|\bhalftime\b|\bhalf-time\b|\bscore at the half\b", norm):
+        return f"At halftime it was {_split_line(state.score_at(2), teams)}."
+
+    if window is None:
+        return None
+    start, end, label = window
+
+    keys = [k for k in _stat_keys_in(norm) if k != "final_score"]
+    if keys:
+        # "How many turnovers did SAC have in the third quarter?"
+        cols = STATE_COLUMNS.get(keys[0]) if len(keys) == 1 else None
+        if cols is None:
+            return None
+        cumulative = re.search(r"\b(after|through)\b", norm)
+        window_start = (1, period_length(1)) if cumulative else (start, period_length(start))
+        split = state.stats_between(window_start, (end, 0.0))
+        values = {
+            t: f"{split[t][cols[0]]}/{split[t][cols[1]]}" if len(cols) == 2 else split[t][cols[0]]
+            for t in teams
+        }
+        focus = mentioned if len(mentioned) == 1 else teams
+        when = f"through the {label}" if cumulative else f"in the {label}"
+        return " and ".join(_phrase(t, keys[0], values[t]) for t in focus) + f" {when}."
+
+    # "Score after / at the end of the third quarter" -> cumulative; otherwise the split itself
+    if re.search(r"\b(after|end of|through|at the end)\b", norm):
+        return f"After the {label} it was {_split_line(state.score_at(end), teams)}."
+
+    split = state.stats_between((start, period_length(start)), (end, 0.0))
+    pts = {t: split[t]["pts"] for t in teams}
+    if pts[a] == pts[b]:
+        return f"The {label} was even: {_split_line(pts, teams)}."
+    winner = a if pts[a] > pts[b] else b
+    return f"{winner} won the {label} {max(pts.values())}-{min(pts.values())}."
+
+
+def route_question(question: str, summary: dict | None, state=None) -> str | None:
+    """Answer `question` from `summary` (and the optional GameState) if it is a plain lookup, else None."""
+    if not summary or not question.strip():
+        return None
+    teams = summary.get("teams", [])[:2]
+    if len(teams) < 2 or "UNK" in teams:
+        return None
+
+    norm = _normalize(question)
+    if ANALYTICAL.search(norm) or len(norm.split()) > 16 or _has_qualifier(norm, teams) or _bare_period(norm):
+        return None
+
+    fs = summary.get("final_score", {})
+    mentioned = _teams_in(question, norm, teams)
+
+    if state is not None and state.teams == teams:
+        answer = _route_state(norm, mentioned, state)
+        if answer is not None:
+            return answer
+
+    if LLM_ONLY.search(norm):
+        return None
+
+    # Who won / lost, and by how much
+    if re.search(
+        r"\b(who|which team) (won|win|lost|lose)\b|\bwinner\b|\bby how (many|much)\b|\bmargin\b|"
+        r"\b(win|won|lose|lost) by\b",
+        norm,
+    ):
+        line = _score_line(summary, teams)
+        if line is None or fs.get(teams[0]) == fs.get(teams[1]):
+            return None
+        winner, loser = (teams[0], teams[1]) if fs[teams[0]] > fs[teams[1]] else (teams[1], teams[0])
+        margin = fs[winner] - fs[loser]
+        if not _is_final(summary):
+            return f"The game is still in progress: {winner} leads by {margin} points ({line})."
+        if re.search(r"\b(lost|lose)\b", norm):
+            return f"{loser} lost to {winner} by {margin} points ({line})."
+        return f"{winner} won by {margin} points ({line})."
+
+    if re.search(r"\b(final score|what was the score|what's the score|what is the score)\b", norm):
+        line = _score_line(summary, teams)
+        if line is None:
+            return None
+        return f"The final score was {line}." if _is_final(summary) else f"The current score is {line}."
+
+    keys = _stat_keys_in(norm)
+    if len(keys) != 1:
+        return None
+    key = keys[0]
+    if key not in summary:
+        return None
+
+    # Comparison: "Who had more rebounds?", "Which team committed fewer turnovers?"
+    more, fewer = MORE.search(norm), FEWER.search(norm)
+    if (more or fewer) and not (more and fewer):
+        values = {t: _magnitude(_value(summary, key, t)) for t in teams}
+        if any(v is None for v in values.values()):
+            return None
+        a, b = teams
+        if values[a] == values[b]:
+            return f"They were even: {_phrase(a, key, _value(summary, key, a))} and {_phrase(b, key, _value(summary, key, b))}."
+        pick_high = bool(more)
+        best = a if (values[a] > values[b]) == pick_high else b
+        other = b if best == a else a
+        return (f"{best} had {'more' if pick_high else 'fewer'} {STAT_PHRASES[key][1]} "
+                f"({_value(summary, key, best)} vs {other}'s {_value(summary, key, other)}).")
+
+    # Lookup: "How many turnovers did SAC have?", "What were the team fouls?"
+    if not re.search(r"\b(how many|what (was|were|is|are)|what's|number of|total)\b", norm):
+        return None
+    if len(mentioned) == 1:
+        t = mentioned[0]
+        v = _value(summary, key, t)
+        return f"{_phrase(t, key, v)}." if v is not None else None
+    a, b = teams
+    va, vb = _value(summary, key, a), _value(summary, key, b)
+    if va is None or vb is None:
+        return None
+    return f"{_phrase(a, key, va)} and {_phrase(b, key, vb)}."
+
+
+def answer_with_router(question: str, summary: dict | None, llm_call, state=None):
+    """Try the fast path first; otherwise call `llm_call()`.
+
+    Returns (answer, route) where route is "fast_path" or "llm".
+    """
+    answer = route_question(question, summary, state)
+    if answer is not None:
+        ROUTER_DECISIONS.inc(route="fast_path")
+        return answer, "fast_path"
+    ROUTER_DECISIONS.inc(route="llm")
+    return llm_call(), "llm"
+
+
+def routed_ratio() -> float:
+    """Share of questions answered without the LLM since process start."""
+    fast = ROUTER_DECISIONS.value(route="fast_path")
+    total = fast + ROUTER_DECISIONS.value(route="llm")
+    return fast / total if total else 0.0
@@ -0,0 +1,183 @@
+"""Pre-aggregated multi-game context for comparison questions.
+
+Instead of sending every raw summary to the LLM, games are reduced to one row
+per (game, team) and rolled up in Python. The rendered context holds the
+aggregates plus at most MAX_DETAIL_ROWS per-game rows, so the prompt size stays
+roughly constant whether a question spans 3 games or 80.
+"""
+
+from collections import defaultdict
+
+
+MAX_DETAIL_ROWS = 8
+MAX_TEAMS = 10
+
+
+def _made_att(value) -> tuple[int, int]:
+    try:
+        made, att = str(value).split("/")
+        return int(made), int(att)
+    except (ValueError, TypeError):
+        return 0, 0
+
+
+def _num(value) -> int:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+
+def _pct(made: int, att: int) -> float:
+    return round(100 * made / att, 1) if att else 0.0
+
+
+def team_game_row(game_id: str, summary: dict, team: str, date: str | None = None) -> dict | None:
+    """One team's line from a single game summary (None if the team didn't play)."""
+    teams = summary.get("teams", [])
+    if team not in teams or len(teams) < 2:
+        return None
+    opp = teams[1] if teams[0] == team else teams[0]
+    fs = summary.get("final_score", {})
+    fgm, fga = _made_att(summary.get("field_goals", {}).get(team))
+    tpm, tpa = _made_att(summary.get("three_pointers", {}).get(team))
+    ftm, fta = _made_att(summary.get("free_throws", {}).get(team))
+    pts, opp_pts = _num(fs.get(team)), _num(fs.get(opp))
+    return {
+        "game_id": game_id,
+        "date": date,
+        "status": summary.get("status"),
+        "team": team,
+        "opp": opp,
+        # teams[0] is treated as home throughout the API
+        "home": teams[0] == team,
+        "pts": pts,
+        "opp_pts": opp_pts,
+        "margin": pts - opp_pts,
+        "fgm": fgm, "fga": fga,
+        "tpm": tpm, "tpa": tpa,
+        "ftm": ftm, "fta": fta,
+        "reb": _num(summary.get("rebounds", {}).get(team)),
+        "tov": _num(summary.get("turnovers", {}).get(team)),
+        "stl": _num(summary.get("steals", {}).get(team)),
+        "blk": _num(summary.get("blocks", {}).get(team)),
+    }
+
+
+def _result(r: dict) -> str:
+    """"W" / "L" for finished games, "in progress" otherwise (live scores aren't results)."""
+    if r["status"] != "final":
+        return "in progress"
+    return "W" if r["margin"] > 0 else "L"
+
+
+def build_rows(summaries: dict[str, dict], dates: dict[str, str | None], team: str | None = None) -> list[dict]:
+    """Rows for `team` in every game, or for both teams when no team is given. Oldest first."""
+    rows = []
+    for game_id, summary in summaries.items():
+        teams = [team] if team else summary.get("teams", [])[:2]
+        for t in teams:
+            row = team_game_row(game_id, summary, t, dates.get(game_id))
+            if row:
+                rows.append(row)
+    rows.sort(key=lambda r: (r["date"] or "", r["game_id"]))
+    return rows
+
+
+def aggregate(rows: list[dict]) -> dict:
+    n = len(rows)
+    if not n:
+        return {"games": 0}
+    tot = defaultdict(int)
+    for r in rows:
+        for k in ("pts", "opp_pts", "fgm", "fga", "tpm", "tpa", "ftm", "fta", "reb", "tov", "stl", "blk"):
+            tot[k] += r[k]
+    # Only finished games count toward the record and the best / worst results.
+    final = [r for r in rows if r["status"] == "final"]
+    return {
+        "games": n,
+        "wins": sum(1 for r in final if r["margin"] > 0),
+        "losses": sum(1 for r in final if r["margin"] < 0),
+        "in_progress": n - len(final),
+        "ppg": round(tot["pts"] / n, 1),
+        "opp_ppg": round(tot["opp_pts"] / n, 1),
+        "margin": round((tot["pts"] - tot["opp_pts"]) / n, 1),
+        "fg_pct": _pct(tot["fgm"], tot["fga"]),
+        "tp_pct": _pct(tot["tpm"], tot["tpa"]),
+        "ft_pct": _pct(tot["ftm"], tot["fta"]),
+        "rpg": round(tot["reb"] / n, 1),
+        "tpg": round(tot["tov"] / n, 1),
+        "spg": round(tot["stl"] / n, 1),
+        "bpg": round(tot["blk"] / n, 1),
+        "best": max(final, key=lambda r: r["margin"]) if final else None,
+        "worst": min(final, key=lambda r: r["margin"]) if final else None,
+    }
+
+
+def _result_text(r: dict) -> str:
+    where = "vs" if r["home"] else "@"
+    date = r["date"] or r["game_id"]
+    return f"{date} {where} {r['opp']} {_result(r)} {r['pts']}-{r['opp_pts']}"
+
+
+def _record(agg: dict) -> str:
+    record = f"{agg['wins']}-{agg['losses']}"
+    return record + (f" ({agg['in_progress']} in progress)" if agg["in_progress"] else "")
+
+
+def _aggregate_lines(team: str, agg: dict) -> list[str]:
+    lines = [
+        f"{team}: {agg['games']} games, record {_record(agg)}, "
+        f"{agg['ppg']} pts for / {agg['opp_ppg']} against (avg margin {agg['margin']:+}).",
+        f"{team} shooting: FG {agg['fg_pct']}%, 3PT {agg['tp_pct']}%, FT {agg['ft_pct']}%. "
+        f"Per game: {agg['rpg']} REB, {agg['tpg']} TOV, {agg['spg']} STL, {agg['bpg']} BLK.",
+    ]
+    if agg["best"]:
+        lines.append(f"{team} best result: {_result_text(agg['best'])}; worst result: {_result_text(agg['worst'])}.")
+    return lines
+
+
+def _table_lines(rows: list[dict], max_rows: int) -> list[str]:
+    shown = rows[-max_rows:]
+    lines = [
+        f"Per-game table ({'most recent ' + str(len(shown)) + ' of ' if len(shown) < len(rows) else ''}{len(rows)} rows):",
+        "date | team | opp | H/A | result | FG | 3PT | FT | REB | TOV",
+    ]
+    for r in shown:
+        lines.append(
+            f"{r['date'] or r['game_id']} | {r['team']} | {r['opp']} | {'H' if r['home'] else 'A'} | "
+            f"{_result(r)} {r['pts']}-{r['opp_pts']} | "
+            f"{r['fgm']}/{r['fga']} | {r['tpm']}/{r['tpa']} | {r['ftm']}/{r['fta']} | {r['reb']} | {r['tov']}"
+        )
+    return lines
+
+
+def format_comparison_context(rows: list[dict], team: str | None = None,
+                              max_rows: int = MAX_DETAIL_ROWS) -> str:
+    """Render aggregated rows as a compact, bounded-size LLM context block."""
+    if not rows:
+        return ""
+    dates = [r["date"] for r in rows if r["date"]]
+    span = f" ({dates[0]} to {dates[-1]})" if dates else ""
+    n_games = len({r["game_id"] for r in rows})
+
+    if team:
+        lines = [f"Multi-game comparison for {team} across {n_games} games{span}."]
+        lines += _aggregate_lines(team, aggregate(rows))
+    else:
+        by_team = defaultdict(list)
+        for r in rows:
+            by_team[r["team"]].append(r)
+        ranked = sorted(by_team.items(), key=lambda kv: (-len(kv[1]), kv[0]))
+        lines = [f"Multi-game comparison across {n_games} games and {len(by_team)} teams{span}."]
+        for t, team_rows in ranked[:MAX_TEAMS]:
+            agg = aggregate(team_rows)
+            lines.append(
+                f"{t}: {agg['games']} games, {_record(agg)}, {agg['ppg']} ppg / {agg['opp_ppg']} allowed, "
+                f"FG {agg['fg_pct']}%, 3PT {agg['tp_pct']}%, {agg['rpg']} REB, {agg['tpg']} TOV."
+            )
+        if len(ranked) > MAX_TEAMS:
+            lines.append(f"({len(ranked) - MAX_TEAMS} more teams omitted.)")
+
+    lines += _table_lines(rows, max_rows)
+    return "\n".join(lines)
@@ -1,21 +1,319 @@
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
-from src.ingestion.nba_data_loader import fetch_game
-from src.utils.parse_game_data import get_raw_csv_path, save_parsed_game
+from src.ingestion.nba_data_loader import LOADER_VERSION, save_game_csv
+from src.service.game_catalog import game_date_from_timestamp, update_catalog
+from src.service.lineup_store import store_game_stints
+from src.service.pipeline_manifest import (
+    fingerprint,
+    load_manifest,
+    record_stage,
+    run_stage,
+    save_manifest,
+    stage_is_fresh,
+)
+from src.service.play_search import PLAY_INDEX_VERSION, index_game_plays, indexed_play_count
+from src.utils.columnar_export import (
+    COLUMNAR_VERSION,
+    get_plays_parquet_path,
+    get_summary_parquet_path,
+    save_columnar,
+)
+from src.utils.context_snapshot import CONTEXT_VERSION, get_context_path, save_context_snapshot
+from src.utils.game_state import STATE_VERSION, get_state_path, save_game_state
+from src.utils.lineups import LINEUP_VERSION, get_stints_path, save_stints
+from src.utils.metrics import record_bytes, record_cache, time_stage
+from src.utils.parse_game_data import PARSER_VERSION, get_raw_csv_path, save_parsed_game
+from src.utils.shot_charts import (
+    SHOT_CHART_VERSION,
+    get_shots_path,
+    rebuild_season_rollup,
+    save_shot_charts,
+    season_of,
+    update_season_rollup,
+)
 from src.utils.summarize_parsed_data import (
+    STRUCTURED_DIR,
+    SUMMARIZER_VERSION,
     get_parsed_path,
     get_summary_path,
     summarize_parsed_game,
 )
 
 
-def ingest_game(game_id: str) -> Path:
+# Concurrent CDN fetches during a backfill (each holds one streaming response)
+BACKFILL_WORKERS = 4
+
+# Callables notified as listener(game_id, summary) after ingest_game rebuilt a summary
+_ingest_listeners = []
+
+# One lock per game id: the live refresh loop, POST /ingest and backfills may
+# ingest the same game concurrently, and their stages share files and a manifest.
+_game_locks: dict[str, threading.Lock] = {}
+_game_locks_guard = threading.Lock()
+
+
+def _game_lock(game_id: str) -> threading.Lock:
+    with _game_locks_guard:
+        return _game_locks.setdefault(game_id, threading.Lock())
+
+
+# The play vector index (Chroma + MiniLM) is optional and opened once per process.
+_play_vectors = None
+_play_vectors_lock = threading.Lock()
+
+
+def _play_vector_store():
+    """The play vector index if it has been built and its dependencies are installed, else None."""
+    global _play_vectors
+    with _play_vectors_lock:
+        if _play_vectors is None:
+            try:
+                from src.embeddings.build_index import PLAY_INDEX_PATH, load_play_index
+            except ImportError:
+                return None
+            if not PLAY_INDEX_PATH.exists():
+                return None
+            _play_vectors = load_play_index(PLAY_INDEX_PATH)
+        return _play_vectors
+
+
+def add_ingest_listener(listener):
+    """Register `listener(game_id, summary)`; called from the ingesting thread."""
+    _ingest_listeners.append(listener)
+
+
+def remove_ingest_listener(listener):
+    if listener in _ingest_listeners:
+        _ingest_listeners.remove(listener)
+
+
+def _notify(game_id: str, summary: dict):
+    for listener in list(_ingest_listeners):
+        try:
+            listener(game_id, summary)
+        except Exception as e:
+            print(f"Ingest listener failed for {game_id}: {e}")
+
+
+def _fetch_stage(game_id: str, manifest: dict, force: bool) -> str | None:
+    """Fetch from the CDN and write the raw CSV; returns the game date if it was fetched.
+
+    Finished games are never refetched unless forced. For live games the new
+    CSV only replaces the old one when its content changed, so unchanged feeds
+    leave every downstream stage fresh.
+    """
+    csv_path = get_raw_csv_path(game_id)
+    if not force and manifest.get("final") and stage_is_fresh(manifest, "fetch", LOADER_VERSION, {}, {"csv": csv_path}):
+        record_cache("stage_fetch", True)
+        print(f"Skipping fetch for {game_id} (final game already stored)")
+        return None
+    record_cache("stage_fetch", False)
+
+    # Rows are streamed from the response straight into the CSV, so the fetch
+    # timing includes the write and memory stays flat however long the game is.
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = csv_path.with_suffix(".csv.tmp")
+    with time_stage("fetch"):
+        result = save_game_csv(game_id, tmp_path)
+    if not result["rows"]:
+        tmp_path.unlink(missing_ok=True)
+        raise RuntimeError(f"No data returned from CDN for game {game_id}.")
+    record_bytes("csv_write", tmp_path.stat().st_size)
+
+    previous = manifest["stages"].get("fetch", {}).get("outputs", {}).get("csv")
+    if (
+        csv_path.exists()
+        and previous
+        and manifest["stages"]["fetch"].get("version") == LOADER_VERSION
+        and fingerprint(tmp_path)["sha256"] == previous["sha256"]
+    ):
+        tmp_path.unlink()
+        print(f"CDN data for {game_id} unchanged since last ingest")
+    else:
+        os.replace(tmp_path, csv_path)
+        record_stage(manifest, "fetch", LOADER_VERSION, {}, {"csv": csv_path})
+
+    if result["time_actual"]:
+        return game_date_from_timestamp(result["time_actual"])
+    return None
+
+
+def _play_vectors_stage(game_id: str, manifest: dict, force: bool) -> None:
+    """Re-embed the game's plays in the play vector index, when one has been built."""
+    store = _play_vector_store()
+    if store is None:
+        return
+    from src.embeddings.build_index import PLAY_VECTORS_VERSION, indexed_vector_count, replace_game_plays
+
+    parsed_path = get_parsed_path(game_id)
+
+    def build_play_vectors():
+        with open(parsed_path, "r") as f:
+            plays = json.load(f)
+        with time_stage("play_vectors"):
+            return {"rows": replace_game_plays(store, game_id, plays)}
+
+    run_stage(
+        manifest, "play_vectors", PLAY_VECTORS_VERSION, {"parsed": parsed_path}, {},
+        build_play_vectors, force, check=lambda rec: rec.get("rows") == indexed_vector_count(store, game_id),
+    )
+
+
+def _derived_stages(game_id: str, manifest: dict, force: bool, from_stage: str = "parse",
+                    in_worker: bool = False) -> tuple[Path, dict | None]:
+    """Run parse -> summarize -> ... -> play_index -> columnar for stale stages.
+
+    Returns (summary_path, summary) where summary is None if summarize was skipped.
+    With in_worker=True (the multi-process rebuild) the season shot-chart
+    totals and the play vector index are left to the parent process.
+    """
+    csv_path = get_raw_csv_path(game_id)
+    parsed_path = get_parsed_path(game_id)
+    summary_path = get_summary_path(game_id)
+    state_path = get_state_path(game_id)
+    context_path = get_context_path(game_id)
+    stints_path = get_stints_path(game_id)
+    shots_path = get_shots_path(game_id)
+    plays_parquet_path = get_plays_parquet_path(game_id)
+    summary_parquet_path = get_summary_parquet_path(game_id)
+
+    # 1️⃣ Parse raw CSV into structured play events
+    if from_stage == "parse":
+        def parse():
+            with time_stage("parse"):
+                save_parsed_game(game_id)
+            record_bytes("parse", parsed_path.stat().st_size)
+
+        run_stage(manifest, "parse", PARSER_VERSION, {"csv": csv_path}, {"parsed": parsed_path}, parse, force)
+
+    # 2️⃣ Summarize parsed game into team-level stats
+    summary = None
+
+    def summarize():
+        nonlocal summary
+        with time_stage("summarize"):
+            summary = summarize_parsed_game(str(parsed_path), str(summary_path))
+        record_bytes("summarize", summary_path.stat().st_size)
+
+    run_stage(manifest, "summarize", SUMMARIZER_VERSION, {"parsed": parsed_path}, {"summary": summary_path}, summarize, force)
+
+    # 3️⃣ Precompute the per-period / point-in-time game-state index
+    def build_state():
+        with open(summary_path, "r") as f:
+            teams = json.load(f)["teams"]
+        with time_stage("game_state"):
+            save_game_state(str(parsed_path), teams, str(state_path))
+
+    run_stage(
+        manifest, "game_state", STATE_VERSION,
+        {"parsed": parsed_path, "summary": summary_path}, {"state": state_path},
+        build_state, force,
+    )
+
+    # 4️⃣ Render the canonical LLM context block used by the API and CLI
+    def build_context():
+        with time_stage("context_snapshot"):
+            save_context_snapshot(game_id, str(summary_path), str(context_path))
+        record_bytes("context_snapshot", context_path.stat().st_size)
+
+    run_stage(
+        manifest, "context", CONTEXT_VERSION,
+        {"summary": summary_path, "state": state_path}, {"context": context_path},
+        build_context, force,
+    )
+
+    # 5️⃣ Reconstruct lineups / stints and mirror them into SQLite for season queries
+    def build_lineups():
+        with open(summary_path, "r") as f:
+            teams = json.load(f)["teams"]
+        with time_stage("lineups"):
+            data = save_stints(str(parsed_path), teams, str(stints_path))
+            store_game_stints(game_id, data)
+
+    run_stage(
+        manifest, "lineups", LINEUP_VERSION,
+        {"parsed": parsed_path, "summary": summary_path}, {"stints": stints_path},
+        build_lineups, force,
+    )
+
+    # 6️⃣ Bin shot locations into per-team / per-player grids and roll them into the season
+    def build_shot_charts():
+        with open(summary_path, "r") as f:
+            teams = json.load(f)["teams"]
+        with time_stage("shot_charts"):
+            previous, arrays = save_shot_charts(game_id, str(parsed_path), teams)
+            if not in_worker:
+                update_season_rollup(game_id, previous, arrays)
+
+    run_stage(
+        manifest, "shot_charts", SHOT_CHART_VERSION,
+        {"parsed": parsed_path, "summary": summary_path}, {"shots": shots_path},
+        build_shot_charts, force,
+    )
+
+    # 7️⃣ Replace the game's rows in the full-text play index
+    def build_play_index():
+        with open(parsed_path, "r") as f:
+            plays = json.load(f)
+        with time_stage("play_index"):
+            return {"rows": index_game_plays(game_id, plays)}
+
+    # The output lives in the shared DB, so freshness is the recorded row count still being there.
+    def play_index_present(rec: dict) -> bool:
+        return rec.get("rows") == indexed_play_count(game_id)
+
+    run_stage(
+        manifest, "play_index", PLAY_INDEX_VERSION, {"parsed": parsed_path}, {},
+        build_play_index, force, check=play_index_present,
+    )
+
+    # ... and the game's documents in the play vector index, when one has been built
+    if not in_worker:
+        _play_vectors_stage(game_id, manifest, force)
+
+    # 8️⃣ Columnar (Parquet) copies of the plays and box score for Arrow / Parquet exports
+    def build_columnar():
+        with time_stage("columnar"):
+            save_columnar(game_id, str(parsed_path), str(summary_path))
+        record_bytes("columnar", plays_parquet_path.stat().st_size)
+
+    run_stage(
+        manifest, "columnar", COLUMNAR_VERSION,
+        {"parsed": parsed_path, "summary": summary_path},
+        {"plays": plays_parquet_path, "summary": summary_parquet_path},
+        build_columnar, force,
+    )
+
+    if summary is not None:
+        manifest["final"] = summary.get("status") == "final"
+    return summary_path, summary
+
+
+def ingest_game(game_id: str, force: bool = False) -> Path:
     """End-to-end ingestion pipeline for a single NBA game.
 
     Steps:
-      1. Fetch play-by-play JSON from the NBA CDN and write it to data/raw/<GAME_ID>_game_data.csv.
+      1. Stream play-by-play JSON from the NBA CDN into data/raw/<GAME_ID>_game_data.csv.
       2. Parse the raw CSV into structured play events and write data/structured/<GAME_ID>_parsed.json.
       3. Summarize the parsed game into team-level stats and write data/structured/<GAME_ID>_summary.json.
+      4. Build the point-in-time game-state index and write data/structured/<GAME_ID>_state.json.
+      5. Render the LLM context snapshot and write data/structured/<GAME_ID>_context.json.
+      6. Reconstruct lineups and stints, write data/structured/<GAME_ID>_stints.json and load them into data/playmind.db.
+      7. Bin shot locations into data/structured/<GAME_ID>_shots.npz and update the season totals.
+      8. Index the play descriptions for full-text search in data/playmind.db (and re-embed
+         them in data/processed/play_index if the play vector index has been built).
+      9. Write the plays and box score as data/structured/<GAME_ID>_plays.parquet / _summary.parquet.
+     10. Record the game (teams, date, score) in data/structured/catalog.json.
+     11. Notify ingest listeners (live WebSocket subscribers) when the summary changed.
+
+    Every stage is recorded in data/structured/<GAME_ID>_manifest.json and is
+    skipped when its inputs and code version are unchanged (pass force=True to
+    rerun everything). Concurrent calls for the same game in this process run
+    one after the other; the second then finds its stages fresh.
 
     Returns the path to the summary JSON file.
     """
@@ -24,29 +322,161 @@ def ingest_game(game_id: str) -> Path:
     if not game_id:
         raise ValueError("game_id must not be empty")
 
-    try:
-        # 0️⃣ Fetch raw play-by-play data from CDN and save to CSV
-        df = fetch_game(game_id)
-        if df is None:
-            raise RuntimeError(f"No data returned from CDN for game {game_id}.")
-
-        csv_path = get_raw_csv_path(game_id)
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(csv_path, index=False)
-
-        # 1️⃣ Parse raw CSV into structured play events
-        parsed_path_str = save_parsed_game(game_id)
-        parsed_path = Path(parsed_path_str)
-
-        # 2️⃣ Summarize parsed game into team-level stats
-        parsed_json_path = get_parsed_path(game_id)
-        summary_path = get_summary_path(game_id)
-        summarize_parsed_game(str(parsed_json_path), str(summary_path))
-
-        return summary_path
-        
-    except Exception as e:
-        import traceback
-        print(f"Error in ingest_game for {game_id}: {e}")
-        traceback.print_exc()
-        raise
+    with _game_lock(game_id):
+        try:
+            manifest = load_manifest(game_id)
+
+            # 0️⃣ Fetch raw play-by-play data from CDN and save to CSV
+            game_date = _fetch_stage(game_id, manifest, force)
+
+            summary_path, summary = _derived_stages(game_id, manifest, force)
+            save_manifest(manifest)
+            rebuilt = summary is not None
+
+            # 9️⃣ Register the game in the catalog used by multi-game queries
+            if summary is not None or game_date is not None:
+                if summary is None:
+                    with open(summary_path, "r") as f:
+                        summary = json.load(f)
+                update_catalog(game_id, summary, game_date)
+
+            # 🔟 Tell live subscribers (e.g. the API's WebSocket broadcaster) about the new summary
+            if rebuilt:
+                _notify(game_id, summary)
+
+            return summary_path
+
+        except Exception as e:
+            import traceback
+            print(f"Error in ingest_game for {game_id}: {e}")
+            traceback.print_exc()
+            raise
+
+
+def backfill_games(game_ids: list[str], max_workers: int = BACKFILL_WORKERS, force: bool = False) -> dict[str, str]:
+    """Ingest many games with at most `max_workers` fetches in flight.
+
+    Each worker streams its game from the CDN, so peak memory is bounded by
+    the number of workers rather than by the size of the backfill. Returns
+    {game_id: error message} for the games that failed; the rest are stored.
+    """
+    failed = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(ingest_game, gid, force): gid for gid in game_ids}
+        for fut, gid in futures.items():
+            try:
+                fut.result()
+            except Exception as e:
+                failed[gid] = str(e)
+    return failed
+
+
+def _rebuild_game(game_id: str, from_stage: str, force: bool) -> tuple[str, dict | None]:
+    manifest = load_manifest(game_id)
+    _, summary = _derived_stages(game_id, manifest, force, from_stage, in_worker=True)
+    save_manifest(manifest)
+    return game_id, summary
+
+
+def stored_game_ids(from_stage: str = "summarize") -> list[str]:
+    """Games whose input artifact for `from_stage` exists on disk."""
+    if from_stage == "parse":
+        raw_dir = get_raw_csv_path("x").parent
+        return sorted(p.name.split("_game_data.csv")[0] for p in raw_dir.glob("*_game_data.csv"))
+    return sorted(p.name.split("_parsed.json")[0] for p in Path(STRUCTURED_DIR).glob("*_parsed.json"))
+
+
+def rebuild_games(game_ids: list[str] | None = None, from_stage: str = "summarize",
+                  force: bool = False, max_workers: int | None = None) -> tuple[list[str], dict[str, str]]:
+    """Rerun stored games from `from_stage` ("parse" or "summarize") without touching the CDN.
+
+    Stages whose inputs and versions are unchanged are still skipped, so after
+    bumping SUMMARIZER_VERSION only summarize (and what depends on it) reruns.
+    Games are processed in parallel worker processes; the play vector index,
+    if built, is then updated from this process. A game that fails does
+    not stop the others; returns (ids whose summary was rebuilt,
+    {game_id: error message} for the games that failed).
+    """
+    if from_stage not in ("parse", "summarize"):
+        raise ValueError("from_stage must be 'parse' or 'summarize'")
+    game_ids = game_ids or stored_game_ids(from_stage)
+    if not game_ids:
+        return [], {}
+
+    rebuilt, failed = [], {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_rebuild_game, gid, from_stage, force): gid for gid in game_ids}
+        for fut, gid in futures.items():
+            try:
+                game_id, summary = fut.result()
+            except Exception as e:
+                print(f"Error rebuilding {gid}: {e}")
+                failed[gid] = str(e)
+                continue
+            if summary is not None:
+                # Catalog writes stay in this process so workers never race on catalog.json.
+                update_catalog(game_id, summary)
+                _notify(game_id, summary)
+                rebuilt.append(game_id)
+
+    # Workers skip the play vector index: each would load its own embedding model
+    # and Chroma's client is not safe across processes. Reindex here, one game at a time.
+    if _play_vector_store() is not None:
+        for gid in game_ids:
+            if gid in failed:
+                continue
+            try:
+                with _game_lock(gid):
+                    manifest = load_manifest(gid)
+                    _play_vectors_stage(gid, manifest, force)
+                    save_manifest(manifest)
+            except Exception as e:
+                print(f"Error reindexing plays for {gid}: {e}")
+                failed[gid] = str(e)
+
+    # Workers skip the incremental season update (they would race on one file); recompute instead.
+    for season in sorted({season_of(gid) for gid in game_ids}):
+        rebuild_season_rollup(season)
+    return rebuilt, failed
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PlayMind ingestion pipeline")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="fetch and process one or more games")
+    ingest.add_argument("game_ids", nargs="+")
+    ingest.add_argument("--force", action="store_true", help="rerun every stage")
+
+    backfill = sub.add_parser("backfill", help="ingest many games with bounded concurrency")
+    backfill.add_argument("game_ids", nargs="+")
+    backfill.add_argument("--workers", type=int, default=BACKFILL_WORKERS)
+    backfill.add_argument("--force", action="store_true")
+
+    rebuild = sub.add_parser("rebuild-summaries", help="rerun stale summarize stages for all stored games")
+    rebuild.add_argument("game_ids", nargs="*")
+    rebuild.add_argument("--from-parse", action="store_true", help="also re-parse the stored raw CSVs")
+    rebuild.add_argument("--force", action="store_true")
+    rebuild.add_argument("--workers", type=int, default=None)
+
+    args = parser.parse_args()
+    if args.command == "ingest":
+        for gid in args.game_ids:
+            print(f"Ingested {gid}: {ingest_game(gid, force=args.force)}")
+    elif args.command == "backfill":
+        failed = backfill_games(args.game_ids, args.workers, args.force)
+        print(f"Backfilled {len(args.game_ids) - len(failed)}/{len(args.game_ids)} games.")
+        for gid, error in failed.items():
+            print(f"  {gid}: {error}")
+    else:
+        from_stage = "parse" if args.from_parse else "summarize"
+        rebuilt, failed = rebuild_games(args.game_ids or None, from_stage, args.force, args.workers)
+        print(f"Rebuilt {len(rebuilt)} summaries.")
+        for gid, error in failed.items():
+            print(f"  {gid}: {error}")
+
+
+if __name__ == "__main__":
+    main()
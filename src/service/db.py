@@ -0,0 +1,119 @@
+"""SQLite store for per-game analytics that are queried across many games.
+
+Per-game JSON artifacts stay the source of truth; ingestion mirrors the rows
+that season-level queries need into data/playmind.db so those queries are an
+indexed SQL aggregate instead of opening every game's files.
+
+Tables:
+  stints         one row per (game, stint, team): lineup, opponent lineup,
+                 seconds, points and possessions for / against
+  stint_players  (player_id, game_id, stint, team) — which players were on
+                 court in each stint, clustered by player for on/off queries
+  players        player_id -> name, team
+  plays          one row per parsed play (game, sequence, period, clock,
+                 team, player, event type, description)
+  plays_fts      FTS5 index over plays.description / plays.player, kept in
+                 sync with plays by triggers
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from src.utils.summarize_parsed_data import STRUCTURED_DIR
+
+
+DB_PATH = Path(STRUCTURED_DIR).parent / "playmind.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stints (
+    game_id      TEXT    NOT NULL,
+    stint        INTEGER NOT NULL,
+    team         TEXT    NOT NULL,
+    opponent     TEXT    NOT NULL,
+    period       INTEGER NOT NULL,
+    start        REAL    NOT NULL,
+    seconds      REAL    NOT NULL,
+    lineup       TEXT    NOT NULL,
+    opp_lineup   TEXT    NOT NULL,
+    pts_for      INTEGER NOT NULL,
+    pts_against  INTEGER NOT NULL,
+    poss_for     REAL    NOT NULL,
+    poss_against REAL    NOT NULL,
+    PRIMARY KEY (game_id, stint, team)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS stints_team_lineup ON stints (team, lineup);
+
+CREATE TABLE IF NOT EXISTS stint_players (
+    player_id INTEGER NOT NULL,
+    game_id   TEXT    NOT NULL,
+    stint     INTEGER NOT NULL,
+    team      TEXT    NOT NULL,
+    PRIMARY KEY (player_id, game_id, stint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS stint_players_game ON stint_players (game_id);
+
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    name      TEXT,
+    team      TEXT
+);
+
+CREATE TABLE IF NOT EXISTS plays (
+    id          INTEGER PRIMARY KEY,
+    game_id     TEXT    NOT NULL,
+    seq         INTEGER NOT NULL,
+    period      INTEGER NOT NULL,
+    clock       TEXT,
+    team        TEXT,
+    player_id   INTEGER,
+    player      TEXT,
+    event_type  TEXT,
+    points      INTEGER NOT NULL,
+    description TEXT    NOT NULL,
+    UNIQUE (game_id, seq)
+);
+CREATE INDEX IF NOT EXISTS plays_team_period ON plays (team, period);
+CREATE INDEX IF NOT EXISTS plays_player ON plays (player_id);
+CREATE INDEX IF NOT EXISTS plays_event_type ON plays (event_type);
+
+-- Porter stemming so "dunks" finds "Dunk"; content lives in plays (external-content table).
+CREATE VIRTUAL TABLE IF NOT EXISTS plays_fts USING fts5(
+    description, player,
+    content='plays', content_rowid='id',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS plays_fts_insert AFTER INSERT ON plays BEGIN
+    INSERT INTO plays_fts (rowid, description, player) VALUES (new.id, new.description, new.player);
+END;
+CREATE TRIGGER IF NOT EXISTS plays_fts_delete AFTER DELETE ON plays BEGIN
+    INSERT INTO plays_fts (plays_fts, rowid, description, player) VALUES ('delete', old.id, old.description, old.player);
+END;
+"""
+
+_initialized: set[str] = set()
+_init_lock = threading.Lock()
+
+
+@contextmanager
+def connect(db_path: Path | None = None):
+    """Short-lived connection with the schema applied; commits on success, rolls back on error."""
+    path = Path(db_path or DB_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        with _init_lock:
+            if str(path) not in _initialized:
+                # WAL lets API reads proceed while ingestion writes.
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                _initialized.add(str(path))
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
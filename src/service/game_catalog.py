@@ -0,0 +1,145 @@
+"""Catalog of ingested games (teams, date, final score).
+
+The catalog lets multi-game queries resolve "all BOS games between two dates"
+without opening every summary. It is maintained incrementally by ingestion and
+can be rebuilt from the summaries on disk at any time.
+
+Layout of data/structured/catalog.json:
+  {"games": {"<GAME_ID>": {"date": "2025-10-21", "teams": ["BOS", "NYK"],
+                           "home": "BOS", "away": "NYK",
+                           "final_score": {"BOS": 112, "NYK": 105}}}}
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from src.utils.summarize_parsed_data import STRUCTURED_DIR
+
+
+_lock = threading.Lock()
+
+
+def get_catalog_path(structured_dir: Path = STRUCTURED_DIR) -> Path:
+    return Path(structured_dir) / "catalog.json"
+
+
+def game_date_from_timestamp(time_actual: str | None) -> str | None:
+    """Convert a CDN `timeActual` (UTC ISO timestamp) to the US/Eastern calendar date.
+
+    Night games tip off after midnight UTC, so the raw UTC date would often be
+    one day late.
+    """
+    if not time_actual:
+        return None
+    try:
+        ts = datetime.fromisoformat(str(time_actual).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    try:
+        from zoneinfo import ZoneInfo
+        ts = ts.astimezone(ZoneInfo("America/New_York"))
+    except Exception:
+        pass
+    return ts.date().isoformat()
+
+
+def catalog_entry(summary: dict, game_date: str | None = None) -> dict:
+    teams = summary.get("teams", [])
+    teams = (list(teams) + ["UNK", "UNK"])[:2]
+    return {
+        "date": game_date,
+        "teams": teams,
+        # Same convention as the API: teams[0] is treated as home.
+        "home": teams[0],
+        "away": teams[1],
+        "final_score": summary.get("final_score", {}),
+    }
+
+
+def load_catalog(structured_dir: Path = STRUCTURED_DIR) -> dict:
+    path = get_catalog_path(structured_dir)
+    if not path.exists():
+        return {"games": {}}
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {"games": {}}
+    data.setdefault("games", {})
+    return data
+
+
+def _write_catalog(catalog: dict, structured_dir: Path):
+    path = get_catalog_path(structured_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(catalog, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def update_catalog(game_id: str, summary: dict, game_date: str | None = None,
+                   structured_dir: Path = STRUCTURED_DIR) -> dict:
+    """Insert or refresh one game's entry. Keeps a previously known date if none is given."""
+    with _lock:
+        catalog = load_catalog(structured_dir)
+        previous = catalog["games"].get(game_id, {})
+        entry = catalog_entry(summary, game_date or previous.get("date"))
+        catalog["games"][game_id] = entry
+        _write_catalog(catalog, structured_dir)
+    return entry
+
+
+def rebuild_catalog(structured_dir: Path = STRUCTURED_DIR) -> dict:
+    """Recreate the catalog from every *_summary.json, preserving known dates."""
+    with _lock:
+        old = load_catalog(structured_dir)["games"]
+        games = {}
+        for path in sorted(Path(structured_dir).glob("*_summary.json")):
+            game_id = path.name.split("_summary.json")[0]
+            try:
+                with open(path, "r") as f:
+                    summary = json.load(f)
+            except (OSError, ValueError):
+                continue
+            games[game_id] = catalog_entry(summary, old.get(game_id, {}).get("date"))
+        catalog = {"games": games}
+        _write_catalog(catalog, structured_dir)
+    return catalog
+
+
+def find_games(team: str | None = None, start_date: str | None = None, end_date: str | None = None,
+               structured_dir: Path = STRUCTURED_DIR) -> list[str]:
+    """Game ids matching a team and/or inclusive ISO date range, oldest first.
+
+    Games with an unknown date only match when no date bounds are given.
+    """
+    team = team.upper() if team else None
+    matches = []
+    for game_id, entry in load_catalog(structured_dir)["games"].items():
+        if team and team not in entry.get("teams", []):
+            continue
+        date = entry.get("date")
+        if (start_date or end_date) and not date:
+            continue
+        if start_date and date < start_date:
+            continue
+        if end_date and date > end_date:
+            continue
+        matches.append((date or "", game_id))
+    return [gid for _, gid in sorted(matches)]
+
+
+def known_teams(structured_dir: Path = STRUCTURED_DIR) -> set[str]:
+    teams = set()
+    for entry in load_catalog(structured_dir)["games"].values():
+        teams.update(t for t in entry.get("teams", []) if t != "UNK")
+    return teams
+
+
+if __name__ == "__main__":
+    catalog = rebuild_catalog()
+    print(f"Catalog rebuilt with {len(catalog['games'])} games: {get_catalog_path()}")
@@ -0,0 +1,110 @@
+"""Persist per-game stints to SQLite and answer multi-game lineup / on-off queries."""
+
+from pathlib import Path
+
+from src.service.db import connect
+from src.utils.lineups import with_ratings
+
+
+def store_game_stints(game_id: str, data: dict, db_path: Path | None = None):
+    """Replace `game_id`'s stints (as produced by `save_stints`) in the database."""
+    teams = data["teams"]
+    stint_rows, player_rows = [], []
+    for i, s in enumerate(data["stints"]):
+        for team in teams:
+            opp = teams[1] if team == teams[0] else teams[0]
+            stint_rows.append((
+                game_id, i, team, opp, s["period"], s["start"], s["seconds"],
+                s["lineups"][team], s["lineups"][opp],
+                s["pts"][team], s["pts"][opp], s["poss"][team], s["poss"][opp],
+            ))
+            player_rows.extend((int(pid), game_id, i, team) for pid in s["lineups"][team].split("-") if pid)
+
+    with connect(db_path) as conn:
+        conn.execute("DELETE FROM stints WHERE game_id = ?", (game_id,))
+        conn.execute("DELETE FROM stint_players WHERE game_id = ?", (game_id,))
+        conn.executemany("INSERT INTO stints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", stint_rows)
+        conn.executemany("INSERT INTO stint_players VALUES (?, ?, ?, ?)", player_rows)
+        conn.executemany(
+            "INSERT INTO players (player_id, name, team) VALUES (?, ?, ?) "
+            "ON CONFLICT (player_id) DO UPDATE SET name = excluded.name, team = excluded.team",
+            [(int(pid), p["name"], p["team"]) for pid, p in data.get("players", {}).items()],
+        )
+
+
+def _game_filter(game_ids: list[str] | None, column: str = "game_id") -> tuple[str, list]:
+    if game_ids is None:
+        return "", []
+    return f" AND {column} IN ({', '.join('?' * len(game_ids))})", list(game_ids)
+
+
+_SUMS = (
+    "SUM(seconds) AS seconds, SUM(pts_for) AS pts_for, SUM(pts_against) AS pts_against, "
+    "SUM(poss_for) AS poss_for, SUM(poss_against) AS poss_against"
+)
+
+
+def _names(conn, player_ids) -> dict:
+    ids = list(player_ids)
+    if not ids:
+        return {}
+    rows = conn.execute(
+        f"SELECT player_id, name FROM players WHERE player_id IN ({', '.join('?' * len(ids))})", ids
+    ).fetchall()
+    return {r["player_id"]: r["name"] for r in rows}
+
+
+def query_lineups(team: str, game_ids: list[str] | None = None, min_seconds: float = 0,
+                  limit: int = 20, db_path: Path | None = None) -> list[dict]:
+    """Most-used lineups for `team` (optionally restricted to `game_ids`) with plus-minus and net rating."""
+    where, params = _game_filter(game_ids)
+    with connect(db_path) as conn:
+        rows = conn.execute(
+            f"SELECT lineup, COUNT(*) AS stints, COUNT(DISTINCT game_id) AS games, {_SUMS} "
+            f"FROM stints WHERE team = ?{where} GROUP BY lineup HAVING SUM(seconds) >= ? "
+            "ORDER BY SUM(seconds) DESC LIMIT ?",
+            [team, *params, min_seconds, limit],
+        ).fetchall()
+        result = [with_ratings(dict(r)) for r in rows]
+        names = _names(conn, {int(pid) for r in result for pid in r["lineup"].split("-") if pid})
+    for r in result:
+        r["players"] = [names.get(int(pid), pid) for pid in r["lineup"].split("-") if pid]
+    return result
+
+
+def query_on_off(team: str, game_ids: list[str] | None = None, db_path: Path | None = None) -> list[dict]:
+    """Per-player on-court vs off-court splits for `team`, summed over the selected games."""
+    where, params = _game_filter(game_ids, "s.game_id")
+    with connect(db_path) as conn:
+        totals = conn.execute(
+            f"SELECT {_SUMS} FROM stints s WHERE team = ?{where}", [team, *params]
+        ).fetchone()
+        if totals is None or totals["seconds"] is None:
+            return []
+        rows = conn.execute(
+            "SELECT sp.player_id, COUNT(DISTINCT s.game_id) AS games, "
+            "SUM(s.seconds) AS seconds, SUM(s.pts_for) AS pts_for, SUM(s.pts_against) AS pts_against, "
+            "SUM(s.poss_for) AS poss_for, SUM(s.poss_against) AS poss_against "
+            "FROM stint_players sp JOIN stints s "
+            "ON s.game_id = sp.game_id AND s.stint = sp.stint AND s.team = sp.team "
+            f"WHERE sp.team = ?{where} GROUP BY sp.player_id ORDER BY SUM(s.seconds) DESC",
+            [team, *params],
+        ).fetchall()
+        names = _names(conn, [r["player_id"] for r in rows])
+
+    keys = ("seconds", "pts_for", "pts_against", "poss_for", "poss_against")
+    result = []
+    for r in rows:
+        on = {k: r[k] for k in keys}
+        off = {k: totals[k] - r[k] for k in keys}
+        on, off = with_ratings(on), with_ratings(off)
+        result.append({
+            "player_id": r["player_id"],
+            "name": names.get(r["player_id"]),
+            "games": r["games"],
+            "on": on,
+            "off": off,
+            "on_off_net": round(on["net_rating"] - off["net_rating"], 1)
+            if on["net_rating"] is not None and off["net_rating"] is not None else None,
+        })
+    return result
@@ -0,0 +1,212 @@
+"""Push summary updates for live games to WebSocket subscribers.
+
+One in-process `Broadcaster` owns every subscription. When ingestion writes a
+new summary for a game it calls `publish` (from whatever thread ran the
+ingest); the broadcaster computes a JSON Merge Patch (RFC 7386) against the
+last summary it sent, serializes it once, and hands the same text to every
+subscriber's queue on the event loop. Server work is therefore proportional
+to the number of updates, not to clients x polls.
+
+Messages (JSON text frames):
+
+  {"type": "snapshot", "gameId": "...", "version": 3, "summary": {...}}
+  {"type": "patch",    "gameId": "...", "version": 4, "patch": {"final_score": {"BOS": 57}}}
+
+A subscriber gets a snapshot first, then patches in version order. A client
+that falls `QUEUE_SIZE` messages behind is sent a fresh snapshot instead of
+the backlog.
+
+While a non-final game has at least one subscriber, the broadcaster also
+re-ingests it every `refresh_seconds` (one refresh loop per game however
+many clients watch it); incremental ingestion makes unchanged feeds cheap.
+"""
+
+import asyncio
+import json
+import os
+import threading
+
+from src.utils.metrics import REGISTRY
+
+
+# Pending messages per subscriber before it is resynced with a snapshot
+QUEUE_SIZE = 32
+
+# Seconds between re-ingests of a watched live game (0 disables refreshing)
+REFRESH_SECONDS = float(os.getenv("PLAYMIND_LIVE_REFRESH", "15"))
+
+LIVE_SUBSCRIBERS = REGISTRY.gauge(
+    "playmind_live_subscribers",
+    "Open live-update subscriptions.",
+)
+LIVE_MESSAGES = REGISTRY.counter(
+    "playmind_live_messages_total",
+    "Live-update messages published (once per update, not per client).",
+    ("type",),
+)
+
+
+def merge_patch(old: dict, new: dict) -> dict:
+    """RFC 7386 merge patch turning `old` into `new` ({} if they are equal)."""
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            sub = merge_patch(old[key], value)
+            if sub:
+                patch[key] = sub
+        elif old[key] != value:
+            patch[key] = value
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    return patch
+
+
+def _encode(message: dict) -> str:
+    return json.dumps(message, separators=(",", ":"))
+
+
+class Broadcaster:
+    """Fan-out of per-game summary updates to asyncio subscriber queues."""
+
+    def __init__(self, load_summary=None, refresh=None, refresh_seconds: float = REFRESH_SECONDS):
+        # load_summary(game_id) -> dict | None, refresh(game_id) -> None (blocking, run in a thread)
+        self.load_summary = load_summary
+        self.refresh = refresh
+        self.refresh_seconds = refresh_seconds
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._state: dict[str, tuple[int, dict]] = {}
+        self._refreshers: dict[str, asyncio.Task] = {}
+        # Version of the snapshot a resynced queue was given; older messages are skipped.
+        self._floors: dict[asyncio.Queue, int] = {}
+        self._lock = threading.Lock()
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    # -- subscriptions (event loop thread) ------------------------------
+    def subscribe(self, game_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.setdefault(game_id, set()).add(queue)
+        LIVE_SUBSCRIBERS.inc()
+
+        snapshot = self._snapshot(game_id)
+        if snapshot is not None:
+            self._floors[queue], text = snapshot
+            queue.put_nowait(text)
+        self._ensure_refresher(game_id)
+        return queue
+
+    def unsubscribe(self, game_id: str, queue: asyncio.Queue):
+        subs = self._subscribers.get(game_id)
+        if subs is None or queue not in subs:
+            return
+        subs.discard(queue)
+        self._floors.pop(queue, None)
+        LIVE_SUBSCRIBERS.dec()
+        if not subs:
+            del self._subscribers[game_id]
+            with self._lock:
+                self._state.pop(game_id, None)
+            task = self._refreshers.pop(game_id, None)
+            if task is not None:
+                task.cancel()
+
+    def subscriber_count(self, game_id: str | None = None) -> int:
+        if game_id is not None:
+            return len(self._subscribers.get(game_id, ()))
+        return sum(len(s) for s in self._subscribers.values())
+
+    def _snapshot(self, game_id: str) -> tuple[int, str] | None:
+        with self._lock:
+            state = self._state.get(game_id)
+        if state is None and self.load_summary is not None:
+            summary = self.load_summary(game_id)
+            if summary is None:
+                return None
+            with self._lock:
+                state = self._state.setdefault(game_id, (1, summary))
+        if state is None:
+            return None
+        version, summary = state
+        return version, _encode({"type": "snapshot", "gameId": game_id, "version": version, "summary": summary})
+
+    # -- publishing (any thread) ----------------------------------------
+    def publish(self, game_id: str, summary: dict):
+        """Record `summary` as the game's latest state and push the change to subscribers.
+
+        Safe to call from ingestion worker threads; no-op when nothing changed.
+        """
+        with self._lock:
+            if game_id not in self._subscribers:
+                # Nobody is watching; a later subscriber loads the summary from disk.
+                self._state.pop(game_id, None)
+                return
+            previous = self._state.get(game_id)
+            if previous is None:
+                version, message = 1, {"type": "snapshot", "summary": summary}
+            else:
+                patch = merge_patch(previous[1], summary)
+                if not patch:
+                    return
+                version, message = previous[0] + 1, {"type": "patch", "patch": patch}
+            self._state[game_id] = (version, summary)
+
+        LIVE_MESSAGES.inc(type=message["type"])
+        text = _encode({"type": message["type"], "gameId": game_id, "version": version,
+                        **{k: v for k, v in message.items() if k != "type"}})
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(game_id, version, text)
+        else:
+            loop.call_soon_threadsafe(self._deliver, game_id, version, text)
+
+    def _deliver(self, game_id: str, version: int, text: str):
+        for queue in list(self._subscribers.get(game_id, ())):
+            if version <= self._floors.get(queue, 0):
+                continue  # already covered by the snapshot this queue was given
+            if queue.full():
+                # Too far behind: drop the backlog and resync with the current state.
+                while not queue.empty():
+                    queue.get_nowait()
+                snapshot = self._snapshot(game_id)
+                if snapshot is not None:
+                    self._floors[queue], snapshot_text = snapshot
+                    queue.put_nowait(snapshot_text)
+            else:
+                queue.put_nowait(text)
+
+    # -- live refresh -----------------------------------------------------
+    def _is_final(self, game_id: str) -> bool:
+        with self._lock:
+            state = self._state.get(game_id)
+        return state is not None and state[1].get("status") == "final"
+
+    def _ensure_refresher(self, game_id: str):
+        if self.refresh is None or self.refresh_seconds <= 0 or game_id in self._refreshers:
+            return
+        if self._is_final(game_id):
+            return
+        self._refreshers[game_id] = asyncio.get_running_loop().create_task(self._refresh_loop(game_id))
+
+    async def _refresh_loop(self, game_id: str):
+        try:
+            while self._subscribers.get(game_id) and not self._is_final(game_id):
+                await asyncio.sleep(self.refresh_seconds)
+                try:
+                    # Ingestion publishes through its listener hook if the summary changed.
+                    await asyncio.to_thread(self.refresh, game_id)
+                except Exception as e:
+                    print(f"Live refresh failed for {game_id}: {e}")
+        finally:
+            if self._refreshers.get(game_id) is asyncio.current_task():
+                del self._refreshers[game_id]
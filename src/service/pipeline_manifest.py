@@ -0,0 +1,121 @@
+"""Per-game artifact manifest so only stale pipeline stages rerun.
+
+data/structured/<GAME_ID>_manifest.json records, for every stage that has
+run, the stage's code version and the content hashes of its inputs and
+outputs:
+
+  {"final": true,
+   "stages": {"parse": {"version": "2",
+                        "inputs": {"csv": {"sha256": "...", "size": 81234, "mtime_ns": ...}},
+                        "outputs": {"parsed": {...}}}}}
+
+A stage is fresh when its version matches, every input still hashes to the
+recorded value and every output still exists unmodified. Hashes are only
+recomputed when a file's (size, mtime) changed since it was recorded.
+
+Stages whose output is not a file of their own (rows in the shared SQLite
+DB) record a row count instead and pass a `check` that compares it with
+what the DB currently holds.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from src.utils.metrics import record_cache
+from src.utils.summarize_parsed_data import STRUCTURED_DIR
+
+
+def get_manifest_path(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> Path:
+    return Path(structured_dir) / f"{game_id}_manifest.json"
+
+
+def load_manifest(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> dict:
+    path = get_manifest_path(game_id, structured_dir)
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault("game_id", game_id)
+    manifest.setdefault("stages", {})
+    return manifest
+
+
+def save_manifest(manifest: dict, structured_dir: Path = STRUCTURED_DIR):
+    path = get_manifest_path(manifest["game_id"], structured_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint(path: Path, previous: dict | None = None) -> dict | None:
+    """Hash record for `path`; reuses `previous` when size and mtime are unchanged."""
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    if previous and previous.get("size") == st.st_size and previous.get("mtime_ns") == st.st_mtime_ns:
+        return previous
+    return {"sha256": file_sha256(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _same(recorded: dict | None, current: dict | None) -> bool:
+    return bool(recorded and current and recorded["sha256"] == current["sha256"])
+
+
+def stage_is_fresh(manifest: dict, stage: str, version: str, inputs: dict, outputs: dict) -> bool:
+    rec = manifest["stages"].get(stage)
+    if not rec or rec.get("version") != str(version):
+        return False
+    for name, path in inputs.items():
+        if not _same(rec["inputs"].get(name), fingerprint(path, rec["inputs"].get(name))):
+            return False
+    for name, path in outputs.items():
+        if not _same(rec["outputs"].get(name), fingerprint(path, rec["outputs"].get(name))):
+            return False
+    return True
+
+
+def record_stage(manifest: dict, stage: str, version: str, inputs: dict, outputs: dict):
+    manifest["stages"][stage] = {
+        "version": str(version),
+        "inputs": {name: fingerprint(path) for name, path in inputs.items()},
+        "outputs": {name: fingerprint(path) for name, path in outputs.items()},
+    }
+
+
+def run_stage(manifest: dict, stage: str, version: str, inputs: dict, outputs: dict,
+              fn, force: bool = False, check=None) -> bool:
+    """Run `fn()` unless the stage is fresh; returns True if it ran.
+
+    `check(record)`, if given, must also return True for a fresh stage; it
+    receives the stage's manifest record and verifies outputs that are not
+    files. When `fn()` returns a dict it is stored in the record for `check`.
+    """
+    rec = manifest["stages"].get(stage)
+    if (
+        not force
+        and stage_is_fresh(manifest, stage, version, inputs, outputs)
+        and (check is None or check(rec))
+    ):
+        record_cache(f"stage_{stage}", True)
+        print(f"Skipping {stage} for {manifest['game_id']} (inputs and version unchanged)")
+        return False
+    record_cache(f"stage_{stage}", False)
+    extra = fn()
+    record_stage(manifest, stage, version, inputs, outputs)
+    if isinstance(extra, dict):
+        manifest["stages"][stage].update(extra)
+    return True
@@ -0,0 +1,169 @@
+"""Full-text search over play descriptions, backed by SQLite FTS5.
+
+Ingestion mirrors each game's parsed plays into the `plays` table of
+data/playmind.db (replacing the game's previous rows); triggers keep the
+`plays_fts` inverted index in sync, so the index is maintained incrementally
+one game at a time and never rebuilt wholesale.
+
+Queries combine an FTS5 MATCH on the free-text terms with indexed filters on
+game, team, player, period and event type, ranked by bm25 when there are
+terms and in game order otherwise.
+"""
+
+import re
+from pathlib import Path
+
+from src.service.db import connect
+
+
+# Bump when the indexed columns or tokenization change; the pipeline then reindexes every game.
+PLAY_INDEX_VERSION = "1"
+
+MAX_PAGE_SIZE = 200
+
+_TERM = re.compile(r"\w+\*?")
+
+_COLUMNS = "p.game_id, p.seq, p.period, p.clock, p.team, p.player_id, p.player, p.event_type, p.points, p.description"
+
+
+def index_game_plays(game_id: str, plays: list[dict], db_path: Path | None = None) -> int:
+    """Replace `game_id`'s rows in the play index; returns the number of plays indexed."""
+    rows = [
+        (
+            game_id, seq, int(p.get("period", 0) or 0), p.get("time") or None, p.get("team") or None,
+            p.get("player_id"), p.get("player") or None, p.get("event_type"),
+            int(p.get("points", 0) or 0), p["description"],
+        )
+        for seq, p in enumerate(plays)
+        if p.get("description")
+    ]
+    with connect(db_path) as conn:
+        conn.execute("DELETE FROM plays WHERE game_id = ?", (game_id,))
+        conn.executemany(
+            "INSERT INTO plays (game_id, seq, period, clock, team, player_id, player, event_type, points, description) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return len(rows)
+
+
+def indexed_play_count(game_id: str, db_path: Path | None = None) -> int:
+    """Rows currently in the play index for `game_id` (0 if the DB was recreated)."""
+    with connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM plays WHERE game_id = ?", (game_id,)).fetchone()[0]
+
+
+def match_expression(text: str | None, any_term: bool = False) -> str | None:
+    """FTS5 query matching every word of `text` (a trailing * keeps prefix matching).
+
+    With any_term=True a play matches if it contains any of the words (ranked
+    by bm25), which suits natural-language questions. Words are quoted, so
+    user input can never inject FTS5 operators.
+    """
+    terms = []
+    for term in _TERM.findall(text or ""):
+        prefix = term.endswith("*")
+        word = term.rstrip("*").replace('"', "")
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return (" OR " if any_term else " ").join(terms) or None
+
+
+def search_plays(
+    query: str | None = None,
+    game_ids: list[str] | None = None,
+    team: str | None = None,
+    player: str | None = None,
+    period: int | list[int] | None = None,
+    event_type: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    db_path: Path | None = None,
+    any_term: bool = False,
+    count: bool = True,
+) -> dict:
+    """One page of plays matching `query` and the filters, with the total match count.
+
+    `player` is a person id or a (partial) name matched against the indexed
+    player column; `period` is one period or a list of them. Pass
+    count=False to skip the total (returned as None) when only the top page
+    is needed.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = max(0, offset)
+
+    match = match_expression(query, any_term)
+    if player and not player.strip().isdigit():
+        name = match_expression(player.replace("*", ""))
+        if name:
+            match = f"{{player}} : ({name})" + (f" AND ({match})" if match else "")
+
+    where, params = [], []
+    if match:
+        where.append("plays_fts MATCH ?")
+        params.append(match)
+    if game_ids is not None:
+        where.append(f"p.game_id IN ({', '.join('?' * len(game_ids))})")
+        params.extend(game_ids)
+    if team:
+        where.append("p.team = ?")
+        params.append(team.upper())
+    if player and player.strip().isdigit():
+        where.append("p.player_id = ?")
+        params.append(int(player))
+    if isinstance(period, (list, tuple)):
+        where.append(f"p.period IN ({', '.join('?' * len(period))})")
+        params.extend(period)
+    elif period is not None:
+        where.append("p.period = ?")
+        params.append(period)
+    if event_type:
+        where.append("p.event_type = ?")
+        params.append(event_type.upper())
+
+    # CROSS JOIN pins the MATCH as the outer loop; otherwise the planner may walk a
+    # filter index and probe the FTS table once per row.
+    source = "plays_fts CROSS JOIN plays p ON p.id = plays_fts.rowid" if match else "plays p"
+    clause = f" WHERE {' AND '.join(where)}" if where else ""
+    highlight = "highlight(plays_fts, 0, '[', ']')" if match else "p.description"
+    order = "bm25(plays_fts), p.game_id, p.seq" if match else "p.game_id, p.seq"
+
+    with connect(db_path) as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM {source}{clause}", params).fetchone()[0] if count else None
+        rows = conn.execute(
+            f"SELECT {_COLUMNS}, {highlight} AS highlight "
+            f"FROM {source}{clause} ORDER BY {order} LIMIT ? OFFSET ?",
+            [*params, limit, offset],
+        ).fetchall()
+
+    return {"total": total, "limit": limit, "offset": offset, "results": [dict(r) for r in rows]}
+
+
+def get_plays(keys: list[tuple[str, int]], db_path: Path | None = None) -> dict[tuple[str, int], dict]:
+    """Indexed plays by (game_id, seq), for hits that came from another retriever."""
+    if not keys:
+        return {}
+    found = {}
+    with connect(db_path) as conn:
+        for game_id in {gid for gid, _ in keys}:
+            seqs = [seq for gid, seq in keys if gid == game_id]
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM plays p WHERE p.game_id = ? AND p.seq IN ({', '.join('?' * len(seqs))})",
+                [game_id, *seqs],
+            ).fetchall()
+            found.update(((r["game_id"], r["seq"]), dict(r)) for r in rows)
+    return found
+
+
+def player_names(game_ids: list[str] | None = None, db_path: Path | None = None) -> list[str]:
+    """Distinct player names in `game_ids`, or every known player (from the lineups' players table)."""
+    with connect(db_path) as conn:
+        if game_ids is None:
+            rows = conn.execute("SELECT DISTINCT name FROM players WHERE name IS NOT NULL").fetchall()
+        else:
+            rows = conn.execute(
+                f"SELECT DISTINCT player FROM plays WHERE game_id IN ({', '.join('?' * len(game_ids))}) "
+                "AND player IS NOT NULL",
+                list(game_ids),
+            ).fetchall()
+    return [r[0] for r in rows]
@@ -0,0 +1,75 @@
+"""Cached, parallel access to per-game summary JSON files.
+
+Summaries are small but read on almost every request. Parsed results are kept
+in memory keyed by (path, mtime, size), so a re-ingested game is picked up
+automatically while unchanged games are never re-read from disk.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.utils.metrics import record_cache
+from src.utils.summarize_parsed_data import STRUCTURED_DIR
+
+
+MAX_WORKERS = 8
+
+_cache: dict[str, tuple[tuple[int, int], dict]] = {}
+_lock = threading.Lock()
+
+
+def summary_path(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> Path:
+    return Path(structured_dir) / f"{game_id}_summary.json"
+
+
+def load_summary(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> dict | None:
+    """Return the summary for `game_id`, or None if it has not been ingested.
+
+    The returned dict is shared with the cache; callers must not mutate it.
+    """
+    path = summary_path(game_id, structured_dir)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+
+    key = str(path)
+    version = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == version:
+        record_cache("summary", True)
+        return cached[1]
+
+    record_cache("summary", False)
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    with _lock:
+        _cache[key] = (version, data)
+    return data
+
+
+def load_summaries(game_ids: list[str], structured_dir: Path = STRUCTURED_DIR) -> dict[str, dict]:
+    """Load many summaries concurrently; missing games are omitted from the result."""
+    if len(game_ids) <= 1:
+        loaded = {gid: load_summary(gid, structured_dir) for gid in game_ids}
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(game_ids))) as pool:
+            results = pool.map(lambda gid: load_summary(gid, structured_dir), game_ids)
+            loaded = dict(zip(game_ids, results))
+    return {gid: s for gid, s in loaded.items() if s is not None}
+
+
+def invalidate(game_id: str | None = None, structured_dir: Path = STRUCTURED_DIR):
+    """Drop one game (or everything) from the cache."""
+    with _lock:
+        if game_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(str(summary_path(game_id, structured_dir)), None)
@@ -0,0 +1,274 @@
+"""Columnar (Arrow / Parquet) copies of each game's parsed plays and team box score.
+
+At ingest a game's parsed plays and summary are written once to
+data/structured/<GAME_ID>_plays.parquet and <GAME_ID>_summary.parquet with the
+fixed schemas below. Exports over many games then memory-map those files and
+hand their record batches straight to an Arrow IPC stream or a Parquet writer,
+so exporting a season never builds a Python object per play.
+
+Tables:
+  plays      one row per parsed play; `seq` is the play's index in
+             <GAME_ID>_parsed.json (the same key the play search index uses)
+  summaries  one row per team per game (box score totals); exports add the
+             game date from the catalog
+"""
+
+import io
+import json
+import os
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.summarize_parsed_data import STRUCTURED_DIR
+
+
+COLUMNAR_VERSION = "1"
+
+EXPORT_KINDS = ("plays", "summaries")
+EXPORT_FORMATS = ("arrow", "parquet")
+
+MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+PLAYS_SCHEMA = pa.schema([
+    ("game_id", pa.string()),
+    ("seq", pa.int32()),
+    ("period", pa.int16()),
+    ("clock", pa.string()),
+    ("home_away", pa.string()),
+    ("team", pa.string()),
+    ("player_id", pa.int64()),
+    ("player", pa.string()),
+    ("event_type", pa.string()),
+    ("sub_type", pa.string()),
+    ("points", pa.int16()),
+    ("description", pa.string()),
+    ("x", pa.float32()),
+    ("y", pa.float32()),
+    ("shot_distance", pa.float32()),
+    ("area", pa.string()),
+])
+
+# (column, parsed event key) for the PLAYS_SCHEMA columns taken as-is
+_PLAY_FIELDS = (
+    ("period", "period"),
+    ("clock", "time"),
+    ("home_away", "HoA"),
+    ("team", "team"),
+    ("player_id", "player_id"),
+    ("player", "player"),
+    ("event_type", "event_type"),
+    ("sub_type", "sub_type"),
+    ("points", "points"),
+    ("description", "description"),
+    ("x", "x"),
+    ("y", "y"),
+    ("shot_distance", "shot_distance"),
+    ("area", "area"),
+)
+
+# Summary keys holding "made/attempted" strings, split into two columns each
+_SHOOTING = (("fg", "field_goals"), ("three", "three_pointers"), ("ft", "free_throws"))
+_COUNTS = ("turnovers", "rebounds", "fouls", "steals", "blocks", "timeouts", "substitutions", "scoring_runs")
+
+SUMMARY_SCHEMA = pa.schema(
+    [
+        ("game_id", pa.string()),
+        ("status", pa.string()),
+        ("team", pa.string()),
+        ("opponent", pa.string()),
+        ("points", pa.int32()),
+        ("opponent_points", pa.int32()),
+    ]
+    + [(f"{prefix}_{part}", pa.int32()) for prefix, _ in _SHOOTING for part in ("made", "attempted")]
+    + [(name, pa.int32()) for name in _COUNTS]
+)
+
+# Exported summaries carry the catalog date right after the game id
+EXPORT_SUMMARY_SCHEMA = SUMMARY_SCHEMA.insert(1, pa.field("date", pa.string()))
+
+
+def get_plays_parquet_path(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> Path:
+    return Path(structured_dir) / f"{game_id}_plays.parquet"
+
+
+def get_summary_parquet_path(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> Path:
+    return Path(structured_dir) / f"{game_id}_summary.parquet"
+
+
+def plays_table(game_id: str, plays: list[dict]) -> pa.Table:
+    columns = {
+        "game_id": pa.array([game_id] * len(plays), pa.string()),
+        "seq": pa.array(range(len(plays)), pa.int32()),
+    }
+    for column, key in _PLAY_FIELDS:
+        columns[column] = pa.array([p.get(key) for p in plays], PLAYS_SCHEMA.field(column).type)
+    return pa.table(columns, schema=PLAYS_SCHEMA)
+
+
+def _made_attempted(value) -> tuple[int, int]:
+    made, _, attempted = str(value or "0/0").partition("/")
+    return int(made or 0), int(attempted or 0)
+
+
+def summary_table(game_id: str, summary: dict) -> pa.Table:
+    teams = list(summary.get("teams", []))[:2]
+    score = summary.get("final_score", {})
+    rows = []
+    for team in teams:
+        opponent = next((t for t in teams if t != team), None)
+        row = {
+            "game_id": game_id,
+            "status": summary.get("status"),
+            "team": team,
+            "opponent": opponent,
+            "points": score.get(team),
+            "opponent_points": score.get(opponent),
+        }
+        for prefix, key in _SHOOTING:
+            row[f"{prefix}_made"], row[f"{prefix}_attempted"] = _made_attempted(summary.get(key, {}).get(team))
+        for name in _COUNTS:
+            row[name] = summary.get(name, {}).get(team)
+        rows.append(row)
+    return pa.Table.from_pylist(rows, schema=SUMMARY_SCHEMA)
+
+
+def _write_parquet(path: Path, table: pa.Table):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+
+
+def save_columnar(game_id: str, parsed_path: str, summary_path: str,
+                  structured_dir: Path = STRUCTURED_DIR) -> tuple[Path, Path]:
+    """Write the game's plays and summary Parquet files; returns their paths."""
+    with open(parsed_path, "r") as f:
+        plays = json.load(f)
+    with open(summary_path, "r") as f:
+        summary = json.load(f)
+    plays_path = get_plays_parquet_path(game_id, structured_dir)
+    summary_out = get_summary_parquet_path(game_id, structured_dir)
+    _write_parquet(plays_path, plays_table(game_id, plays))
+    _write_parquet(summary_out, summary_table(game_id, summary))
+    print(f"Saved columnar plays ({len(plays)} rows): {plays_path}")
+    return plays_path, summary_out
+
+
+# ------------------------------------------------------------------
+# Export
+# ------------------------------------------------------------------
+def export_schema(kind: str) -> pa.Schema:
+    return PLAYS_SCHEMA if kind == "plays" else EXPORT_SUMMARY_SCHEMA
+
+
+def exportable_games(kind: str, game_ids: list[str], structured_dir: Path = STRUCTURED_DIR) -> tuple[list[str], list[str]]:
+    """Split `game_ids` into (games with a `kind` Parquet file, games without one).
+
+    Games ingested before columnar files existed get them written now from
+    their parsed plays and summary; only games lacking those too are missing.
+    """
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"kind must be one of {EXPORT_KINDS}")
+    get_path = get_plays_parquet_path if kind == "plays" else get_summary_parquet_path
+    available, missing = [], []
+    for game_id in game_ids:
+        if not get_path(game_id, structured_dir).exists():
+            parsed_path = Path(structured_dir) / f"{game_id}_parsed.json"
+            summary_path = Path(structured_dir) / f"{game_id}_summary.json"
+            if not (parsed_path.exists() and summary_path.exists()):
+                missing.append(game_id)
+                continue
+            save_columnar(game_id, str(parsed_path), str(summary_path), structured_dir)
+        available.append(game_id)
+    return available, missing
+
+
+def iter_game_tables(kind: str, game_ids: list[str], dates: dict[str, str | None] | None = None,
+                     structured_dir: Path = STRUCTURED_DIR):
+    """Yield each game's stored table (memory-mapped); filter `game_ids` with `exportable_games` first.
+
+    Summary tables get a `date` column from `dates` (game id -> ISO date).
+    """
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"kind must be one of {EXPORT_KINDS}")
+    get_path = get_plays_parquet_path if kind == "plays" else get_summary_parquet_path
+    for game_id in game_ids:
+        table = pq.read_table(get_path(game_id, structured_dir), memory_map=True)
+        if kind == "summaries":
+            date = (dates or {}).get(game_id)
+            table = table.add_column(1, "date", pa.array([date] * table.num_rows, pa.string()))
+        yield table.cast(export_schema(kind))
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_arrow_stream(kind: str, tables):
+    """Arrow IPC stream bytes for `tables`, yielded one game at a time."""
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, export_schema(kind)) as writer:
+        for table in tables:
+            writer.write_table(table)
+            yield sink.drain()
+    yield sink.drain()  # end-of-stream marker
+
+
+def write_parquet_export(kind: str, tables, out_path: Path) -> int:
+    """Write `tables` into one Parquet file (a row group per game); returns the row count."""
+    rows = 0
+    with pq.ParquetWriter(out_path, export_schema(kind), compression="zstd") as writer:
+        for table in tables:
+            writer.write_table(table)
+            rows += table.num_rows
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.service.game_catalog import find_games, load_catalog
+
+    parser = argparse.ArgumentParser(description="Export stored plays or summaries as Arrow / Parquet.")
+    parser.add_argument("kind", choices=EXPORT_KINDS)
+    parser.add_argument("out", type=Path, help="output file (.arrow for an IPC stream, otherwise Parquet)")
+    parser.add_argument("--game", action="append", dest="game_ids", help="game id (repeatable)")
+    parser.add_argument("--team")
+    parser.add_argument("--start-date")
+    parser.add_argument("--end-date")
+    args = parser.parse_args()
+
+    game_ids, missing = exportable_games(args.kind, args.game_ids or find_games(args.team, args.start_date, args.end_date))
+    if missing:
+        print(f"Skipping {len(missing)} games with no stored plays: {', '.join(missing)}")
+    dates = {gid: e.get("date") for gid, e in load_catalog()["games"].items()}
+    tables = iter_game_tables(args.kind, game_ids, dates)
+    if args.out.suffix == ".arrow":
+        with open(args.out, "wb") as f:
+            for chunk in iter_arrow_stream(args.kind, tables):
+                f.write(chunk)
+        print(f"Wrote {args.kind} for {len(game_ids)} games to {args.out}")
+    else:
+        rows = write_parquet_export(args.kind, tables, args.out)
+        print(f"Wrote {rows} {args.kind} rows for {len(game_ids)} games to {args.out}")
@@ -0,0 +1,193 @@
+"""Canonical LLM context block for one game, rendered once at ingest.
+
+Both the API (`/ask`, `/ask/batch`) and the CLI (`qa_engine`) build prompts by
+concatenating these snapshots, so every entry point sends the model exactly
+the same text for a game and no request re-formats summary stats.
+
+data/structured/<GAME_ID>_context.json:
+
+  {"version": "1", "game_id": "...", "text": "...", "tokens": 142, "sha256": "..."}
+
+`tokens` uses tiktoken when it is installed and a ~4 characters/token
+estimate otherwise.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from src.utils.game_state import load_game_state
+from src.utils.metrics import record_cache
+from src.utils.summarize_parsed_data import STRUCTURED_DIR
+
+try:  # optional: exact token counts for OpenAI models
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# Bump when the rendered text changes; the pipeline then re-renders every snapshot.
+CONTEXT_VERSION = "1"
+
+# Encoding used by the gpt-4o family
+TOKEN_ENCODING = "o200k_base"
+
+# Per-team stats in the order they are rendered
+STAT_LINES = (
+    "field_goals",
+    "three_pointers",
+    "free_throws",
+    "rebounds",
+    "turnovers",
+    "steals",
+    "blocks",
+    "fouls",
+    "timeouts",
+    "substitutions",
+    "scoring_runs",
+)
+
+
+def get_context_path(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> Path:
+    return Path(structured_dir) / f"{game_id}_context.json"
+
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding(TOKEN_ENCODING)
+        return len(_encoding.encode(text))
+    return max(1, round(len(text) / 4)) if text else 0
+
+
+def render_context(game_id: str, summary: dict, state=None) -> str:
+    """Compact, deterministic text block describing one game."""
+    teams = summary.get("teams", [])
+    if len(teams) < 2:
+        return f"Game {game_id}: no team data."
+    a, b = teams[:2]
+    fs = summary.get("final_score", {})
+    status = "Final" if summary.get("status") == "final" else "In progress"
+
+    lines = [f"Game {game_id}: {a} vs {b} ({status}). Score: {a} {fs.get(a, 'N/A')}, {b} {fs.get(b, 'N/A')}."]
+    for stat in STAT_LINES:
+        s = summary.get(stat)
+        if s:
+            lines.append(f"{stat.replace('_', ' ').title()}: {a} {s.get(a, 'N/A')}, {b} {s.get(b, 'N/A')}.")
+
+    if state is not None and state.derived.get("period_scores"):
+        splits = "; ".join(f"{p['label']} {a} {p.get(a, 0)}-{p.get(b, 0)} {b}" for p in state.derived["period_scores"])
+        lines.append(f"By period: {splits}.")
+        lines.append(f"Lead changes: {state.derived.get('lead_changes', 0)}, ties: {state.derived.get('ties', 0)}.")
+
+    narrative = summary.get("narrative", "")
+    if narrative:
+        lines.append(f"Narrative: {narrative.strip()}")
+    return "\n".join(lines)
+
+
+def build_snapshot(game_id: str, summary: dict, state=None) -> dict:
+    text = render_context(game_id, summary, state)
+    return {
+        "version": CONTEXT_VERSION,
+        "game_id": game_id,
+        "text": text,
+        "tokens": count_tokens(text),
+        "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+    }
+
+
+def save_context_snapshot(game_id: str, summary_path: str, save_path: str | None = None,
+                          structured_dir: Path = STRUCTURED_DIR) -> dict:
+    with open(summary_path, "r") as f:
+        summary = json.load(f)
+    snapshot = build_snapshot(game_id, summary, load_game_state(game_id, structured_dir))
+    out_path = Path(save_path) if save_path else get_context_path(game_id, structured_dir)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp, out_path)
+    print(f"Saved context snapshot ({snapshot['tokens']} tokens): {out_path}")
+    return snapshot
+
+
+_cache: dict[str, tuple[int, dict]] = {}
+_lock = threading.Lock()
+
+
+def load_context_snapshot(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> dict | None:
+    """Snapshot for `game_id` (memoized by mtime); None if the game has no current snapshot."""
+    path = get_context_path(game_id, structured_dir)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _lock:
+        cached = _cache.get(str(path))
+    if cached is not None and cached[0] == mtime:
+        record_cache("context_snapshot", True)
+        return cached[1]
+
+    record_cache("context_snapshot", False)
+    try:
+        with open(path, "r") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get("version") != CONTEXT_VERSION:
+        return None
+    with _lock:
+        _cache[str(path)] = (mtime, snapshot)
+    return snapshot
+
+
+def ensure_context_snapshot(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> dict | None:
+    """Snapshot for `game_id`, rendered from its summary and saved if missing or outdated.
+
+    Covers games ingested before snapshots existed (or before a CONTEXT_VERSION
+    bump) until `rebuild-summaries` has run; None if the game has no summary either.
+    """
+    snapshot = load_context_snapshot(game_id, structured_dir)
+    if snapshot is not None:
+        return snapshot
+    summary_path = Path(structured_dir) / f"{game_id}_summary.json"
+    if not summary_path.exists():
+        return None
+    try:
+        return save_context_snapshot(game_id, str(summary_path), structured_dir=structured_dir)
+    except (OSError, ValueError) as e:
+        print(f"Could not render context snapshot for {game_id}: {e}")
+        return None
+
+
+def assemble_context(game_ids: list[str], structured_dir: Path = STRUCTURED_DIR) -> tuple[str, int]:
+    """Concatenate the snapshots of `game_ids`; returns (text, total tokens).
+
+    Missing snapshots are rendered from the game's summary; games without a
+    summary are skipped.
+    """
+    snapshots = [s for s in (ensure_context_snapshot(gid, structured_dir) for gid in game_ids) if s]
+    return "\n\n".join(s["text"] for s in snapshots), sum(s["tokens"] for s in snapshots)
+
+
+if __name__ == "__main__":
+    import sys
+    from src.utils.summarize_parsed_data import get_summary_path
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.utils.context_snapshot <GAME_ID>")
+        sys.exit(1)
+
+    game_id = sys.argv[1]
+    summary_path = get_summary_path(game_id)
+    if not summary_path.exists():
+        print(f"Summary not found for {game_id}")
+        sys.exit(1)
+    print(save_context_snapshot(game_id, str(summary_path))["text"])
@@ -0,0 +1,392 @@
+"""Precomputed game-state index for point-in-time and range questions.
+
+`summarize_parsed_game` only produces end-of-game totals. This module turns the
+parsed plays into a compact columnar index:
+
+  - `t`: game time elapsed (seconds) at each stat-changing event, non-decreasing
+  - `prefix[team][stat]`: cumulative stat totals after each event (prefix sums,
+    with a leading 0 so `prefix[i]` is the state *before* event i)
+
+so the score or any team stat at a given moment is a binary search on `t`, and
+any range (a quarter, a half, the last five minutes) is a difference of two
+prefix entries — O(log n) per query with no rescans of the plays.
+
+Also precomputed once per game: per-period splits, lead changes, ties, largest
+lead per team, scoring runs with their start/end clocks, and sparse tables of
+the score margin so the largest lead in any window is two lookups.
+"""
+
+import json
+import re
+from bisect import bisect_right
+from pathlib import Path
+
+from src.utils.summarize_parsed_data import STRUCTURED_DIR
+
+
+STATE_VERSION = 2
+
+REGULATION_PERIODS = 4
+PERIOD_SECONDS = 12 * 60
+OVERTIME_SECONDS = 5 * 60
+
+# Same threshold the summarizer uses for `scoring_runs`
+RUN_THRESHOLD = 8
+
+STATS = ("pts", "fgm", "fga", "tpm", "tpa", "ftm", "fta", "reb", "tov", "stl", "blk", "pf")
+
+
+def get_state_path(game_id: str) -> Path:
+    return STRUCTURED_DIR / f"{game_id}_state.json"
+
+
+def clock_to_seconds(clock: str | None) -> float:
+    """Seconds remaining in the period from "PT11M42.00S" (CDN) or "11:42"."""
+    clock = str(clock or "").strip()
+    m = re.fullmatch(r"PT(?:(\d+)M)?(?:([\d.]+)S)?", clock)
+    if m:
+        return int(m.group(1) or 0) * 60 + float(m.group(2) or 0)
+    m = re.fullmatch(r"(\d+):(\d+(?:\.\d+)?)", clock)
+    if m:
+        return int(m.group(1)) * 60 + float(m.group(2))
+    return 0.0
+
+
+def format_clock(seconds: float) -> str:
+    seconds = max(0.0, seconds)
+    return f"{int(seconds // 60)}:{int(seconds % 60):02d}"
+
+
+def period_length(period: int) -> int:
+    return PERIOD_SECONDS if period <= REGULATION_PERIODS else OVERTIME_SECONDS
+
+
+def period_start(period: int) -> int:
+    """Elapsed game seconds at the start of `period`."""
+    if period <= REGULATION_PERIODS:
+        return (period - 1) * PERIOD_SECONDS
+    return REGULATION_PERIODS * PERIOD_SECONDS + (period - 1 - REGULATION_PERIODS) * OVERTIME_SECONDS
+
+
+def elapsed(period: int, clock_remaining: float) -> float:
+    return period_start(period) + period_length(period) - clock_remaining
+
+
+def period_label(period: int) -> str:
+    if period <= REGULATION_PERIODS:
+        return f"Q{period}"
+    ot = period - REGULATION_PERIODS
+    return "OT" if ot == 1 else f"{ot}OT"
+
+
+def event_deltas(play: dict) -> dict:
+    """Stat increments for one parsed play, mirroring summarize_parsed_game."""
+    evt = str(play.get("event_type", "") or "").upper()
+    desc = str(play.get("description", "") or "").upper()
+    d = {}
+    if evt.startswith("3PT_"):
+        d["fga"] = d["tpa"] = 1
+        if "MADE" in evt:
+            d["fgm"] = d["tpm"] = 1
+            d["pts"] = 3
+    elif evt.startswith("FT_"):
+        d["fta"] = 1
+        if "MADE" in evt:
+            d["ftm"] = 1
+            d["pts"] = 1
+    elif evt.startswith("SHOT_"):
+        d["fga"] = 1
+        if "MADE" in evt:
+            d["fgm"] = 1
+            d["pts"] = 2
+    elif evt == "TURNOVER":
+        d["tov"] = 1
+    elif evt == "REBOUND" and "TEAM" not in desc:
+        d["reb"] = 1
+    elif evt == "FOUL":
+        d["pf"] = 1
+    elif evt == "STEAL":
+        d["stl"] = 1
+    elif evt == "BLOCK":
+        d["blk"] = 1
+    return d
+
+
+def _margins(prefix: dict, teams: list[str]) -> list[int]:
+    a, b = teams
+    return [x - y for x, y in zip(prefix[a]["pts"], prefix[b]["pts"])]
+
+
+def _argmax_table(values: list[int]) -> list[list[int]]:
+    """Sparse table: level j, slot x holds the index of the largest value in
+    values[x : x + 2**j], the earliest one on ties."""
+    levels = [list(range(len(values)))]
+    width = 1
+    while 2 * width <= len(values):
+        prev = levels[-1]
+        levels.append([
+            prev[x + width] if values[prev[x + width]] > values[prev[x]] else prev[x]
+            for x in range(len(values) - 2 * width + 1)
+        ])
+        width *= 2
+    return levels
+
+
+def _range_argmax(values: list[int], levels: list[list[int]], i: int, j: int) -> int:
+    """Index of the largest of values[i..j] (inclusive, earliest on ties): two overlapping blocks."""
+    level = (j - i + 1).bit_length() - 1
+    left, right = levels[level][i], levels[level][j - (1 << level) + 1]
+    return right if values[right] > values[left] else left
+
+
+def build_lead_index(prefix: dict, teams: list[str]) -> dict:
+    """Range-max tables over the margin (teams[0] minus teams[1]) and its negation."""
+    margins = _margins(prefix, teams)
+    return {"max": _argmax_table(margins), "min": _argmax_table([-m for m in margins])}
+
+
+class GameState:
+    """Columnar, prefix-summed view of one game. Build with `build_game_state`."""
+
+    def __init__(self, teams, t, periods, clocks, prefix, derived=None, lead_index=None):
+        self.teams = list(teams)
+        self.t = t
+        self.periods = periods
+        self.clocks = clocks
+        self.prefix = prefix
+        self.derived = derived or {}
+        self.lead_index = lead_index or build_lead_index(prefix, self.teams)
+        self._margins = _margins(prefix, self.teams)
+        self._negated = [-m for m in self._margins]
+
+    # -- point-in-time / range queries -----------------------------------
+    def index_at(self, period: int, clock: str | float = 0.0) -> int:
+        """Number of events that happened at or before (period, clock remaining)."""
+        remaining = clock if isinstance(clock, (int, float)) else clock_to_seconds(clock)
+        return bisect_right(self.t, elapsed(period, remaining))
+
+    def stats_at(self, period: int, clock: str | float = 0.0) -> dict:
+        """Cumulative team stats at a moment; clock 0 means the end of `period`."""
+        i = self.index_at(period, clock)
+        return {team: {s: self.prefix[team][s][i] for s in STATS} for team in self.teams}
+
+    def score_at(self, period: int, clock: str | float = 0.0) -> dict:
+        i = self.index_at(period, clock)
+        return {team: self.prefix[team]["pts"][i] for team in self.teams}
+
+    def stats_between(self, start: tuple, end: tuple) -> dict:
+        """Team stats for events after `start` and up to `end`, both (period, clock remaining)."""
+        i = self.index_at(*start)
+        j = self.index_at(*end)
+        return {
+            team: {s: self.prefix[team][s][j] - self.prefix[team][s][i] for s in STATS}
+            for team in self.teams
+        }
+
+    def largest_lead_between(self, start: tuple, end: tuple) -> dict:
+        """Largest lead per team from `start` up to `end` (both (period, clock remaining)).
+
+        Same shape as `derived["largest_lead"]`; the margin carried into the
+        window counts, timed at `start`. Two sparse-table lookups per team, so
+        the cost does not grow with the window.
+        """
+        a, b = self.teams
+        i, j = self.index_at(*start), self.index_at(*end)
+        largest = {a: {"lead": 0}, b: {"lead": 0}}
+        if j < i:
+            return largest
+        for team, values, levels in (
+            (a, self._margins, self.lead_index["max"]),
+            (b, self._negated, self.lead_index["min"]),
+        ):
+            k = _range_argmax(values, levels, i, j)
+            if values[k] <= 0:
+                continue
+            if k == i:
+                period, clock = start[0], format_clock(start[1])
+            else:
+                period, clock = self.periods[k - 1], format_clock(clock_to_seconds(self.clocks[k - 1]))
+            largest[team] = {"lead": values[k], "period": period, "clock": clock}
+        return largest
+
+    def period_stats(self, period: int) -> dict:
+        return self.stats_between((period, period_length(period)), (period, 0.0))
+
+    def last_period(self) -> int:
+        return self.periods[-1] if self.periods else REGULATION_PERIODS
+
+    # -- persistence -------------------------------------------------------
+    def to_dict(self) -> dict:
+        return {
+            "version": STATE_VERSION,
+            "teams": self.teams,
+            "t": self.t,
+            "period": self.periods,
+            "clock": self.clocks,
+            "prefix": self.prefix,
+            "derived": self.derived,
+            "lead_index": self.lead_index,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameState":
+        return cls(data["teams"], data["t"], data["period"], data["clock"], data["prefix"],
+                   data.get("derived"), data.get("lead_index"))
+
+
+def _derive(state: GameState, scoring: list[tuple]) -> dict:
+    """Per-period splits, lead changes, largest leads and runs from the scoring sequence."""
+    a, b = state.teams
+    splits = []
+    for p in range(1, state.last_period() + 1):
+        ps = state.period_stats(p)
+        splits.append({"period": p, "label": period_label(p), a: ps[a]["pts"], b: ps[b]["pts"]})
+
+    lead_changes, ties = 0, 0
+    leader = None
+    largest = {a: {"lead": 0}, b: {"lead": 0}}
+    runs = []
+    run = None
+    score = {a: 0, b: 0}
+    for team, pts, period, clock in scoring:
+        score[team] += pts
+        diff = score[a] - score[b]
+        now = a if diff > 0 else b if diff < 0 else None
+        if now is None and leader is not None:
+            ties += 1
+        if now is not None and leader is not None and now != leader:
+            lead_changes += 1
+        if now is not None:
+            leader = now
+            if abs(diff) > largest[now]["lead"]:
+                largest[now] = {"lead": abs(diff), "period": period, "clock": format_clock(clock_to_seconds(clock))}
+
+        # Unanswered-points runs, same rule as the summarizer's scoring_runs
+        if run is not None and run["team"] == team:
+            run["points"] += pts
+            run["end_period"], run["end_clock"] = period, clock
+            run["end_score"] = dict(score)
+        else:
+            if run is not None and run["points"] >= RUN_THRESHOLD:
+                runs.append(run)
+            run = {
+                "team": team, "points": pts,
+                "start_period": period, "start_clock": clock,
+                "end_period": period, "end_clock": clock,
+                "end_score": dict(score),
+            }
+    if run is not None and run["points"] >= RUN_THRESHOLD:
+        runs.append(run)
+    for r in runs:
+        r["start_clock"] = format_clock(clock_to_seconds(r["start_clock"]))
+        r["end_clock"] = format_clock(clock_to_seconds(r["end_clock"]))
+
+    return {
+        "period_scores": splits,
+        "lead_changes": lead_changes,
+        "ties": ties,
+        "largest_lead": largest,
+        "runs": runs,
+    }
+
+
+def build_game_state(plays: list[dict], teams: list[str]) -> GameState:
+    """Single pass over parsed plays -> GameState for the two `teams`."""
+    teams = list(teams)[:2]
+    prefix = {team: {s: [0] for s in STATS} for team in teams}
+    t, periods, clocks = [], [], []
+    scoring = []
+    last_t = 0.0
+    max_period = 1
+
+    for play in plays:
+        period = int(play.get("period", 0) or 0)
+        if period <= 0:
+            continue
+        max_period = max(max_period, period)
+        team = play.get("team")
+        deltas = event_deltas(play)
+        if team not in prefix or not deltas:
+            continue
+
+        clock = str(play.get("time") or "")
+        # Guard against out-of-order clocks in the feed so `t` stays sorted for bisect.
+        last_t = max(last_t, elapsed(period, clock_to_seconds(clock)))
+        t.append(round(last_t, 2))
+        periods.append(period)
+        clocks.append(clock)
+        for tm in teams:
+            series = prefix[tm]
+            for s in STATS:
+                series[s].append(series[s][-1] + (deltas.get(s, 0) if tm == team else 0))
+        if deltas.get("pts"):
+            scoring.append((team, deltas["pts"], period, clock))
+
+    # Keep the last period even if it ended without a stat event (e.g. an OT with no scoring yet).
+    if periods and periods[-1] != max_period:
+        periods.append(max_period)
+        t.append(round(max(last_t, period_start(max_period)), 2))
+        clocks.append("")
+        for tm in teams:
+            for s in STATS:
+                prefix[tm][s].append(prefix[tm][s][-1])
+
+    state = GameState(teams, t, periods, clocks, prefix, lead_index=build_lead_index(prefix, teams))
+    state.derived = _derive(state, scoring)
+    return state
+
+
+def save_game_state(parsed_path: str, teams: list[str], save_path: str | None = None) -> GameState:
+    with open(parsed_path, "r") as f:
+        plays = json.load(f)
+    state = build_game_state(plays, teams)
+    if save_path:
+        out_path = Path(save_path)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(out_path, "w") as f:
+            # Compact separators: these files are mostly numeric arrays.
+            json.dump(state.to_dict(), f, separators=(",", ":"))
+        print(f"Saved game state index: {out_path}")
+    return state
+
+
+_cache: dict[str, tuple[int, GameState]] = {}
+
+
+def load_game_state(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> GameState | None:
+    """Load (and memoize by mtime) a game's state index; None if missing or outdated."""
+    path = Path(structured_dir) / f"{game_id}_state.json"
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _cache.get(str(path))
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r") as f:
+        data = json.load(f)
+    if data.get("version") != STATE_VERSION:
+        return None
+    state = GameState.from_dict(data)
+    _cache[str(path)] = (mtime, state)
+    return state
+
+
+if __name__ == "__main__":
+    import sys
+    from src.utils.summarize_parsed_data import get_parsed_path, get_summary_path
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.utils.game_state <GAME_ID>")
+        sys.exit(1)
+
+    game_id = sys.argv[1]
+    parsed_path = get_parsed_path(game_id)
+    summary_path = get_summary_path(game_id)
+    if not parsed_path.exists() or not summary_path.exists():
+        print(f"Parsed JSON or summary not found for {game_id}")
+        sys.exit(1)
+
+    with open(summary_path, "r") as f:
+        teams = json.load(f)["teams"]
+    save_game_state(str(parsed_path), teams, str(get_state_path(game_id)))
@@ -0,0 +1,280 @@
+"""Lineups, stints and on/off splits reconstructed from substitution events.
+
+Each period's plays are read twice:
+
+  - a first scan infers the five players per team who started the period
+    from first appearances (a player who records a live-ball event, or is
+    subbed *out*, before being subbed *in* started it), topped up from the
+    previous period's closing lineup for players who did nothing all period.
+    Technical fouls and their free throws, ejections and other dead-ball
+    events are ignored here: bench players can be charged with those;
+  - a forward pass then drives a small state machine: SUBSTITUTION events
+    swap players in the current lineup; the first non-substitution event
+    after a lineup change closes the current stint, so a batch of subs at one
+    dead ball produces a single boundary; points, possessions
+    (FGA - OREB + TOV + 0.44*FTA) and seconds accrue to the open stint.
+
+Lineups are keyed compactly by their five sorted person ids joined with "-".
+Per-lineup and per-player on/off aggregates are derived from the stint list
+without rescanning plays.
+"""
+
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from src.utils.game_state import clock_to_seconds, elapsed, event_deltas, period_length, period_start
+from src.utils.summarize_parsed_data import STRUCTURED_DIR
+
+
+LINEUP_VERSION = "2"
+
+LINEUP_SIZE = 5
+
+# Weight of a free-throw attempt in the possession estimate
+FTA_POSSESSION_WEIGHT = 0.44
+
+# Event types (prefixes) that only players on the floor can record; technicals are excluded separately
+ON_COURT_EVENTS = ("3PT_", "SHOT_", "FT_", "REBOUND", "TURNOVER", "STEAL", "BLOCK", "FOUL", "JUMPBALL")
+
+
+def get_stints_path(game_id: str) -> Path:
+    return STRUCTURED_DIR / f"{game_id}_stints.json"
+
+
+def lineup_key(players) -> str:
+    return "-".join(str(p) for p in sorted(players))
+
+
+def _is_sub(play: dict) -> bool:
+    return str(play.get("event_type") or "").upper() == "SUBSTITUTION"
+
+
+def _sub_direction(play: dict) -> str:
+    """"in" / "out" from sub_type, falling back to the "SUB in:" / "SUB out:" description."""
+    sub = str(play.get("sub_type") or "").lower()
+    if sub in ("in", "out"):
+        return sub
+    desc = str(play.get("description") or "").upper()
+    return "in" if "SUB IN" in desc else "out" if "SUB OUT" in desc else ""
+
+
+def _on_court_event(play: dict) -> bool:
+    """True if the play's player must have been on the floor (a live-ball event)."""
+    evt = str(play.get("event_type") or "").upper()
+    if not evt.startswith(ON_COURT_EVENTS):
+        return False
+    text = f"{play.get('sub_type') or ''} {play.get('description') or ''}".upper()
+    return "TECHNICAL" not in text and "T.FOUL" not in text
+
+
+def _infer_starters(plays: list[dict], teams: list[str], previous: dict) -> dict:
+    """Players on court at the start of a period, per team."""
+    starters = {t: [] for t in teams}
+    subbed_in = {t: set() for t in teams}
+    for play in plays:
+        team, pid = play.get("team"), play.get("player_id")
+        if team not in starters or not pid:
+            continue
+        if _is_sub(play):
+            if _sub_direction(play) == "in":
+                subbed_in[team].add(pid)
+                continue
+        elif not _on_court_event(play):
+            continue
+        if pid not in subbed_in[team] and pid not in starters[team] and len(starters[team]) < LINEUP_SIZE:
+            starters[team].append(pid)
+
+    # Someone who played the whole period without a single event: carry over from the previous period.
+    for team in teams:
+        for pid in previous.get(team, ()):
+            if len(starters[team]) >= LINEUP_SIZE:
+                break
+            if pid not in starters[team] and pid not in subbed_in[team]:
+                starters[team].append(pid)
+    return starters
+
+
+class _Stint:
+    __slots__ = ("period", "start", "end", "lineups", "events", "pts", "fga", "fta", "tov", "oreb")
+
+    def __init__(self, period: int, start: float, lineups: dict):
+        self.period = period
+        self.start = self.end = start
+        self.lineups = {t: lineup_key(p) for t, p in lineups.items()}
+        self.events = 0
+        self.pts = defaultdict(int)
+        self.fga = defaultdict(int)
+        self.fta = defaultdict(int)
+        self.tov = defaultdict(int)
+        self.oreb = defaultdict(int)
+
+    def possessions(self, team: str) -> float:
+        return self.fga[team] - self.oreb[team] + self.tov[team] + FTA_POSSESSION_WEIGHT * self.fta[team]
+
+    def to_dict(self, teams: list[str]) -> dict:
+        a, b = teams
+        return {
+            "period": self.period,
+            "start": round(self.start, 1),
+            "end": round(self.end, 1),
+            "seconds": round(self.end - self.start, 1),
+            "lineups": self.lineups,
+            "pts": {a: self.pts[a], b: self.pts[b]},
+            "poss": {a: round(self.possessions(a), 2), b: round(self.possessions(b), 2)},
+        }
+
+
+def build_stints(plays: list[dict], teams: list[str]) -> list[dict]:
+    """Segment the game into stints of unchanged 10-man lineups."""
+    teams = list(teams)[:2]
+    by_period = defaultdict(list)
+    for play in plays:
+        period = int(play.get("period", 0) or 0)
+        if period > 0:
+            by_period[period].append(play)
+
+    stints = []
+    previous = {}
+    for period in sorted(by_period):
+        period_plays = by_period[period]
+        on_court = {t: list(p) for t, p in _infer_starters(period_plays, teams, previous).items()}
+        stint = _Stint(period, period_start(period), on_court)
+        changed = False
+        last_missed_by = None
+
+        for play in period_plays:
+            now = elapsed(period, clock_to_seconds(play.get("time")))
+            now = max(now, stint.end)
+            team, pid = play.get("team"), play.get("player_id")
+
+            if _is_sub(play):
+                if team in on_court and pid:
+                    lineup = on_court[team]
+                    if _sub_direction(play) == "out" and pid in lineup:
+                        lineup.remove(pid)
+                        changed = True
+                    elif _sub_direction(play) == "in" and pid not in lineup:
+                        lineup.append(pid)
+                        changed = True
+                continue
+
+            if changed:
+                # First live event after one or more subs closes the stint.
+                stint.end = now
+                if stint.end > stint.start or stint.events:
+                    stints.append(stint.to_dict(teams))
+                stint = _Stint(period, now, on_court)
+                changed = False
+            stint.end = now
+
+            if team not in on_court:
+                continue
+            stint.events += 1
+            evt = str(play.get("event_type") or "").upper()
+            deltas = event_deltas(play)
+            stint.pts[team] += deltas.get("pts", 0)
+            stint.fga[team] += deltas.get("fga", 0)
+            stint.fta[team] += deltas.get("fta", 0)
+            stint.tov[team] += deltas.get("tov", 0)
+            if deltas.get("reb") and last_missed_by == team:
+                stint.oreb[team] += 1
+            if evt.endswith("_MISSED"):
+                last_missed_by = team
+            elif evt == "REBOUND" or deltas.get("pts") or evt == "TURNOVER":
+                last_missed_by = None
+
+        stint.end = period_start(period) + period_length(period)
+        if stint.end > stint.start or stint.events:
+            stints.append(stint.to_dict(teams))
+        previous = on_court
+
+    return stints
+
+
+def lineup_stats(stints: list[dict], teams: list[str]) -> list[dict]:
+    """Aggregate stints per (team, lineup)."""
+    agg = {}
+    for s in stints:
+        for team in teams:
+            opp = teams[1] if team == teams[0] else teams[0]
+            key = (team, s["lineups"][team])
+            row = agg.setdefault(key, {
+                "team": team, "lineup": key[1], "stints": 0, "seconds": 0.0,
+                "pts_for": 0, "pts_against": 0, "poss_for": 0.0, "poss_against": 0.0,
+            })
+            row["stints"] += 1
+            row["seconds"] += s["seconds"]
+            row["pts_for"] += s["pts"][team]
+            row["pts_against"] += s["pts"][opp]
+            row["poss_for"] += s["poss"][team]
+            row["poss_against"] += s["poss"][opp]
+    return [with_ratings(row) for row in sorted(agg.values(), key=lambda r: -r["seconds"])]
+
+
+def player_on_off(stints: list[dict], teams: list[str]) -> list[dict]:
+    """Per-player on-court vs off-court point differential and possessions."""
+    totals = {t: {"seconds": 0.0, "pts_for": 0, "pts_against": 0, "poss_for": 0.0, "poss_against": 0.0} for t in teams}
+    on = {}
+    for s in stints:
+        for team in teams:
+            opp = teams[1] if team == teams[0] else teams[0]
+            line = (s["seconds"], s["pts"][team], s["pts"][opp], s["poss"][team], s["poss"][opp])
+            for bucket in [totals[team]] + [
+                on.setdefault((team, pid), {"seconds": 0.0, "pts_for": 0, "pts_against": 0, "poss_for": 0.0, "poss_against": 0.0})
+                for pid in s["lineups"][team].split("-") if pid
+            ]:
+                bucket["seconds"] += line[0]
+                bucket["pts_for"] += line[1]
+                bucket["pts_against"] += line[2]
+                bucket["poss_for"] += line[3]
+                bucket["poss_against"] += line[4]
+
+    rows = []
+    for (team, pid), stats in on.items():
+        off = {k: totals[team][k] - v for k, v in stats.items()}
+        on_row, off_row = with_ratings(dict(stats)), with_ratings(off)
+        rows.append({
+            "team": team,
+            "player_id": int(pid),
+            "on": on_row,
+            "off": off_row,
+            "on_off_net": round(on_row["net_rating"] - off_row["net_rating"], 1)
+            if on_row["net_rating"] is not None and off_row["net_rating"] is not None else None,
+        })
+    return sorted(rows, key=lambda r: (r["team"], -r["on"]["seconds"]))
+
+
+def with_ratings(row: dict) -> dict:
+    """Round and add plus-minus / per-100-possession ratings."""
+    row["seconds"] = round(row["seconds"], 1)
+    row["poss_for"] = round(row["poss_for"], 1)
+    row["poss_against"] = round(row["poss_against"], 1)
+    row["plus_minus"] = row["pts_for"] - row["pts_against"]
+    poss = (row["poss_for"] + row["poss_against"]) / 2
+    row["net_rating"] = round(100 * row["plus_minus"] / poss, 1) if poss > 0 else None
+    return row
+
+
+def save_stints(parsed_path: str, teams: list[str], save_path: str | None = None) -> dict:
+    with open(parsed_path, "r") as f:
+        plays = json.load(f)
+    teams = list(teams)[:2]
+    names = {}
+    for p in plays:
+        if p.get("player_id") and p.get("team") in teams and p.get("player"):
+            names.setdefault(p["player_id"], (p["team"], p["player"]))
+
+    data = {
+        "version": LINEUP_VERSION,
+        "teams": teams,
+        "players": {str(pid): {"team": t, "name": n} for pid, (t, n) in names.items()},
+        "stints": build_stints(plays, teams),
+    }
+    if save_path:
+        out_path = Path(save_path)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(out_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        print(f"Saved {len(data['stints'])} stints: {out_path}")
+    return data
@@ -1,10 +1,16 @@
-import re
+import csv
+import itertools
 import json
+import os
+import re
 from pathlib import Path
 
 RAW_DIR = Path("data/raw")
 STRUCTURED_DIR = Path("data/structured")
 
+# Bump whenever parsing logic changes so the pipeline re-parses stored games.
+PARSER_VERSION = "5"
+
 def parse_event_type(description: str, action_type: str | None) -> str:
     desc = (description or "").upper()
     at = (action_type or "").lower()
@@ -39,8 +45,10 @@ def parse_event_type(description: str, action_type: str | None) -> str:
         if "END" in desc:
             return "PERIOD_END"
         return "PERIOD"
+    if at == "game":
+        # Emitted once the game is over ("Game End")
+        return "GAME_END" if "END" in desc else "GAME"
 
-    
 
 
 def extract_points(description: str) -> int:
@@ -53,55 +61,103 @@ def extract_player(description: str) -> str:
     return match.group(1).strip() if match else "Unknown"
 
 
-def parse_game_data(game_id: str, csv_path: str, home_team="HOME", away_team="AWAY") -> list[dict]:
-    import pandas as pd
-    df = pd.read_csv(csv_path)
-    parsed = []
-    shotAttempts = 0
-
-    # Infer home/away team tricodes from score changes
-    def infer_home_away_codes(df: "pd.DataFrame"):
-        home_code = None
-        away_code = None
-        last_home = None
-        last_away = None
-
-        for _, r in df.iterrows():
-            team = r.get("TEAM_TRICODE")
-            sh = r.get("SCORE_HOME")
-            sa = r.get("SCORE_AWAY")
-
-            if team and pd.notna(team) and pd.notna(sh) and pd.notna(sa):
-                if last_home is not None and sh != last_home:
-                    if home_code is None:
-                        home_code = str(team)
-                if last_away is not None and sa != last_away:
-                    if away_code is None:
-                        away_code = str(team)
-                if home_code and away_code:
-                    break
+def _clean_str(value) -> str:
+    text = str(value if value is not None else "").strip()
+    return "" if text.lower() == "nan" else text
+
+
+def _person_id(value) -> int | None:
+    """CDN personId as an int; None for team/neutral events (0 or missing)."""
+    try:
+        pid = int(float(value))
+    except (TypeError, ValueError):
+        return None
+    return pid or None
+
+
+def _number(value) -> float | None:
+    try:
+        num = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if num != num else num  # NaN from empty CSV cells
+
+
+def shot_location(row) -> dict:
+    """Half-court shot coordinates (tenths of feet, hoop at origin), distance and zone.
+
+    Prefers the CDN legacy coordinates; otherwise converts the full-court
+    percentages, mirroring shots taken at the right-hand basket.
+    """
+    x, y = _number(row.get("X_LEGACY")), _number(row.get("Y_LEGACY"))
+    if x is None or y is None:
+        px, py = _number(row.get("X")), _number(row.get("Y"))
+        if px is not None and py is not None:
+            if px > 50:
+                px, py = 100 - px, 100 - py
+            x = (py - 50) / 100 * 500
+            y = px / 100 * 940 - 52.5  # hoop centre is 5.25 ft from the baseline
+    distance = _number(row.get("SHOT_DISTANCE"))
+    if distance is None and x is not None and y is not None:
+        distance = round((x * x + y * y) ** 0.5 / 10, 1)
+    return {
+        "x": round(x, 1) if x is not None else None,
+        "y": round(y, 1) if y is not None else None,
+        "shot_distance": distance,
+        "area": _clean_str(row.get("AREA")) or None,
+    }
+
+
+def iter_csv_rows(csv_path: str):
+    """Rows of a raw play-by-play CSV as dicts of strings (empty cells are "")."""
+    with open(csv_path, newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def parse_rows(rows, home_team="HOME", away_team="AWAY"):
+    """Yield parsed events for an iterable of raw CSV rows.
+
+    Home/away tricodes are inferred from the first score changes, so rows are
+    only buffered until both teams have scored (usually a few baskets); the
+    rest stream through.
+    """
+    rows = iter(rows)
+    pending = []
+    home_team_code = None
+    away_team_code = None
+    last_home = None
+    last_away = None
+
+    for r in rows:
+        pending.append(r)
+        team = _clean_str(r.get("TEAM_TRICODE"))
+        sh = _clean_str(r.get("SCORE_HOME"))
+        sa = _clean_str(r.get("SCORE_AWAY"))
+
+        if team and sh and sa:
+            if last_home is not None and sh != last_home:
+                if home_team_code is None:
+                    home_team_code = team
+            if last_away is not None and sa != last_away:
+                if away_team_code is None:
+                    away_team_code = team
+            if home_team_code and away_team_code:
+                break
+
+        last_home, last_away = sh, sa
 
-            last_home, last_away = sh, sa
-
-        return home_code, away_code
-
-    home_team_code, away_team_code = infer_home_away_codes(df)
-
-    for _, row in df.iterrows():
+    shotAttempts = 0
+    for row in itertools.chain(pending, rows):
         # Normalize descriptions and choose the first non-empty
-        home_val = row.get("HOMEDESCRIPTION")
-        away_val = row.get("VISITORDESCRIPTION")
-        home_desc = "" if str(home_val).lower() == "nan" else str(home_val or "").strip()
-        away_desc = "" if str(away_val).lower() == "nan" else str(away_val or "").strip()
+        home_desc = _clean_str(row.get("HOMEDESCRIPTION"))
+        away_desc = _clean_str(row.get("VISITORDESCRIPTION"))
         desc = home_desc or away_desc
 
         if not desc:
             continue
 
         # TEAM_TRICODE holds the team identifier (e.g. "SAC", "BOS")
-        raw_team = str(row.get("TEAM_TRICODE") or "").strip()
-        if raw_team.lower() == "nan":  # guard against pandas NaN stringification
-            raw_team = ""
+        raw_team = _clean_str(row.get("TEAM_TRICODE"))
 
         # Map to home/away based on inferred game-level mapping
         if raw_team and home_team_code and raw_team == home_team_code:
@@ -115,27 +171,32 @@ def parse_game_data(game_id: str, csv_path: str, home_team="HOME", away_team="AW
             raw_team = "UNK"
 
         # Prefer structured player name, but fall back to parsing description
-        player_name = str(row.get("PLAYER_NAME") or row.get("PLAYER1_NAME") or "").strip()
+        player_name = _clean_str(row.get("PLAYER_NAME") or row.get("PLAYER1_NAME"))
         if not player_name and desc:
             player_name = extract_player(desc)
 
-        action_type = str(row.get("ACTION_TYPE") or "").strip()
+        action_type = _clean_str(row.get("ACTION_TYPE"))
         evt_type = parse_event_type(desc, action_type)
         pts = extract_points(desc)
 
         primary_event = {
-            "period": int(row.get("PERIOD", 0)),
-            "time": str(row.get("PCTIMESTRING") or "").strip(),
+            "period": int(_number(row.get("PERIOD")) or 0),
+            "time": _clean_str(row.get("PCTIMESTRING")),
             "HoA": primary_HoA,
             "team": raw_team,
             "player": player_name,
             "event_type": evt_type,
             "points": pts,
-            "description": desc.strip(),
+            "description": desc,
             "home_description": home_desc,
             "away_description": away_desc,
+            # Needed to track who is on court (lineups / stints)
+            "player_id": _person_id(row.get("PLAYER_ID")),
+            "sub_type": _clean_str(row.get("SUB_TYPE")).lower(),
         }
-        parsed.append(primary_event)
+        if (evt_type or "").startswith(("SHOT_", "3PT_")):
+            primary_event.update(shot_location(row))
+        yield primary_event
 
         evt = evt_type or ""
         if any(k in evt for k in ("SHOT", "DUNK", "LAYUP", "3PT", "FT")):
@@ -143,7 +204,10 @@ def parse_game_data(game_id: str, csv_path: str, home_team="HOME", away_team="AW
                 shotAttempts += 1
 
     print(f"Shot attempts: {shotAttempts}")
-    return parsed
+
+
+def parse_game_data(game_id: str, csv_path: str, home_team="HOME", away_team="AWAY") -> list[dict]:
+    return list(parse_rows(iter_csv_rows(csv_path), home_team, away_team))
 
 
 def get_raw_csv_path(game_id: str) -> Path:
@@ -151,15 +215,25 @@ def get_raw_csv_path(game_id: str) -> Path:
 
 
 def save_parsed_game(game_id: str, output_dir: str = str(STRUCTURED_DIR)) -> str:
+    """Parse the raw CSV into <output_dir>/<GAME_ID>_parsed.json, one event per line.
+
+    Events are written as they are parsed, so neither the CSV nor the event
+    list is ever held in memory as a whole.
+    """
     csv_path = get_raw_csv_path(game_id)
     if not csv_path.exists():
         raise FileNotFoundError(f"Raw CSV not found: {csv_path}")
 
-    data = parse_game_data(game_id, str(csv_path))
     out_path = Path(output_dir) / f"{game_id}_parsed.json"
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, "w") as f:
-        json.dump(data, f, indent=2)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        f.write("[")
+        for i, event in enumerate(parse_rows(iter_csv_rows(str(csv_path)))):
+            f.write(",\n  " if i else "\n  ")
+            f.write(json.dumps(event))
+        f.write("\n]\n")
+    os.replace(tmp_path, out_path)
     print(f"Saved parsed game data: {out_path}")
     return str(out_path)
 
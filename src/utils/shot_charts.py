@@ -0,0 +1,198 @@
+"""Precomputed shot charts: binned make/attempt grids per team and player.
+
+Shots are binned on the half court in legacy coordinates (tenths of feet,
+hoop at the origin) into 2 ft x 2 ft cells with `numpy.histogram2d`, once per
+game at ingest, plus made/attempted counts per CDN shot zone. Per-game grids
+live in data/structured/<GAME_ID>_shots.npz; season totals are the sum of
+those, kept in data/structured/shots_season_<YY>.npz, so chart endpoints only
+slice stored arrays.
+
+Array names inside an .npz:
+  team:<TRI>:made / team:<TRI>:att                  (X_BINS, Y_BINS) uint32 grids
+  team:<TRI>:zone_made / team:<TRI>:zone_att        (len(ZONES),) uint32
+  player:<PERSON_ID>:...                            same four arrays per player
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.summarize_parsed_data import STRUCTURED_DIR
+
+
+SHOT_CHART_VERSION = "1"
+
+CELL = 20  # tenths of feet
+X_EDGES = np.arange(-250, 250 + CELL, CELL)  # sideline to sideline
+Y_EDGES = np.arange(-50, 430 + CELL, CELL)   # baseline to just past the top of the arc
+
+ZONES = (
+    "Restricted Area",
+    "In The Paint (Non-RA)",
+    "Mid-Range",
+    "Left Corner 3",
+    "Right Corner 3",
+    "Above the Break 3",
+    "Backcourt",
+)
+
+_lock = threading.Lock()
+
+
+def get_shots_path(game_id: str, structured_dir: Path = STRUCTURED_DIR) -> Path:
+    return Path(structured_dir) / f"{game_id}_shots.npz"
+
+
+def season_of(game_id: str) -> str:
+    """Two-digit season year from an NBA game id (002<YY><NNNNN>)."""
+    return game_id[3:5]
+
+
+def get_season_path(season: str, structured_dir: Path = STRUCTURED_DIR) -> Path:
+    return Path(structured_dir) / f"shots_season_{season}.npz"
+
+
+def _grid(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    # Clip so heaves and corner-3 edge cases land in the outermost cells instead of vanishing.
+    x = np.clip(x, X_EDGES[0], X_EDGES[-1] - 1)
+    y = np.clip(y, Y_EDGES[0], Y_EDGES[-1] - 1)
+    counts, _, _ = np.histogram2d(x, y, bins=(X_EDGES, Y_EDGES))
+    return counts.astype(np.uint32)
+
+
+def build_shot_charts(plays: list[dict], teams: list[str]) -> dict[str, np.ndarray]:
+    """Per-team and per-player grids for every located field-goal attempt in `plays`."""
+    rows = []
+    for p in plays:
+        evt = str(p.get("event_type") or "").upper()
+        if not evt.startswith(("SHOT_", "3PT_")) or p.get("team") not in teams:
+            continue
+        if p.get("x") is None or p.get("y") is None:
+            continue
+        area = p.get("area")
+        if area not in ZONES and p["y"] > Y_EDGES[-1]:
+            area = "Backcourt"
+        rows.append((p["team"], p.get("player_id") or 0, p["x"], p["y"], "MADE" in evt,
+                     ZONES.index(area) if area in ZONES else -1))
+
+    arrays = {}
+    if not rows:
+        return arrays
+    team = np.array([r[0] for r in rows])
+    player = np.array([r[1] for r in rows], dtype=np.int64)
+    x = np.array([r[2] for r in rows], dtype=np.float64)
+    y = np.array([r[3] for r in rows], dtype=np.float64)
+    made = np.array([r[4] for r in rows], dtype=bool)
+    zone = np.array([r[5] for r in rows], dtype=np.int64)
+    # Shots with an unknown zone name count in the grids but not in the zone table.
+    zoned = zone >= 0
+
+    def add(prefix: str, mask: np.ndarray):
+        arrays[f"{prefix}:made"] = _grid(x[mask & made], y[mask & made])
+        arrays[f"{prefix}:att"] = _grid(x[mask], y[mask])
+        arrays[f"{prefix}:zone_made"] = np.bincount(zone[mask & zoned & made], minlength=len(ZONES)).astype(np.uint32)
+        arrays[f"{prefix}:zone_att"] = np.bincount(zone[mask & zoned], minlength=len(ZONES)).astype(np.uint32)
+
+    for t in teams:
+        mask = team == t
+        if mask.any():
+            add(f"team:{t}", mask)
+    for pid in np.unique(player):
+        if pid:
+            add(f"player:{pid}", player == pid)
+    return arrays
+
+
+def _write_npz(path: Path, arrays: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, version=np.array(SHOT_CHART_VERSION), **arrays)
+    os.replace(tmp, path)
+
+
+def _read_npz(path: Path) -> dict:
+    try:
+        with np.load(path) as data:
+            if str(data["version"]) != SHOT_CHART_VERSION:
+                return {}
+            return {k: data[k] for k in data.files if k != "version"}
+    except (OSError, KeyError, ValueError):
+        return {}
+
+
+def save_shot_charts(game_id: str, parsed_path: str, teams: list[str],
+                     structured_dir: Path = STRUCTURED_DIR) -> tuple[dict, dict]:
+    """Write the game's grids; returns (previous arrays, new arrays) for the season rollup."""
+    with open(parsed_path, "r") as f:
+        plays = json.load(f)
+    path = get_shots_path(game_id, structured_dir)
+    previous = _read_npz(path) if path.exists() else {}
+    arrays = build_shot_charts(plays, list(teams)[:2])
+    _write_npz(path, arrays)
+    print(f"Saved shot charts ({len(arrays) // 4} teams/players): {path}")
+    return previous, arrays
+
+
+def update_season_rollup(game_id: str, previous: dict, arrays: dict, structured_dir: Path = STRUCTURED_DIR):
+    """Apply one game's change to its season totals (subtract old grids, add new ones)."""
+    path = get_season_path(season_of(game_id), structured_dir)
+    with _lock:
+        totals = _read_npz(path) if path.exists() else {}
+        for name, arr in previous.items():
+            if name in totals:
+                totals[name] = totals[name] - np.minimum(totals[name], arr)
+        for name, arr in arrays.items():
+            totals[name] = totals[name] + arr if name in totals else arr.copy()
+        _write_npz(path, {k: v for k, v in totals.items() if v.any()})
+
+
+def rebuild_season_rollup(season: str, structured_dir: Path = STRUCTURED_DIR) -> int:
+    """Recompute a season's totals from every per-game file; returns the number of games."""
+    totals: dict[str, np.ndarray] = {}
+    games = 0
+    for path in sorted(Path(structured_dir).glob(f"???{season}*_shots.npz")):
+        games += 1
+        for name, arr in _read_npz(path).items():
+            totals[name] = totals[name] + arr if name in totals else arr.copy()
+    with _lock:
+        _write_npz(get_season_path(season, structured_dir), totals)
+    return games
+
+
+_cache: dict[str, tuple[int, dict]] = {}
+
+
+def load_shot_charts(path: Path) -> dict:
+    """Arrays stored at `path` (memoized by mtime); {} if missing."""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    cached = _cache.get(str(path))
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    arrays = _read_npz(path)
+    _cache[str(path)] = (mtime, arrays)
+    return arrays
+
+
+def chart(arrays: dict, team: str | None = None, player_id: int | None = None) -> dict | None:
+    """JSON-ready chart for one team or player: grid edges, made/attempt grids and zone splits."""
+    prefix = f"player:{player_id}" if player_id is not None else f"team:{team}"
+    if f"{prefix}:att" not in arrays:
+        return None
+    zone_made, zone_att = arrays[f"{prefix}:zone_made"], arrays[f"{prefix}:zone_att"]
+    return {
+        "xEdges": X_EDGES.tolist(),
+        "yEdges": Y_EDGES.tolist(),
+        "made": arrays[f"{prefix}:made"].tolist(),
+        "attempts": arrays[f"{prefix}:att"].tolist(),
+        "zones": [
+            {"zone": z, "made": int(m), "attempts": int(a), "pct": round(float(m) / float(a), 3) if a else None}
+            for z, m, a in zip(ZONES, zone_made, zone_att)
+        ],
+    }
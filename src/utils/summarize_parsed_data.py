@@ -5,6 +5,9 @@ from re import T
 
 STRUCTURED_DIR = Path("data/structured")
 
+# Bump whenever summary logic changes; `rebuild-summaries` then reruns only this stage.
+SUMMARIZER_VERSION = "2"
+
 def get_parsed_path(game_id: str) -> Path:
     return STRUCTURED_DIR / f"{game_id}_parsed.json"
 
@@ -170,6 +173,10 @@ def summarize_parsed_game(parsed_path: str, save_path: str | None = None):
 
     summary["narrative"] = narrative
 
+    # "final" once the feed has emitted its Game End action; anything else is still in progress.
+    game_over = any(str(p.get("event_type") or "").upper() == "GAME_END" for p in plays)
+    summary["status"] = "final" if game_over else "live"
+
     # --------------------------------------------
     # Save and return
     # --------------------------------------------
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from src.api import server
+
+
+SUMMARY = {
+    "teams": ["BOS", "SAC"],
+    "status": "final",
+    "final_score": {"BOS": 112, "SAC": 104},
+    "turnovers": {"BOS": 11, "SAC": 14},
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    (tmp_path / "0022400001_summary.json").write_text(json.dumps(SUMMARY))
+    monkeypatch.setattr(server, "STRUCTURED_DIR", tmp_path)
+    monkeypatch.setattr(server, "llm", None)
+    monkeypatch.setattr(server, "prompt", None)
+
+    def unavailable(*args, **kwargs):
+        raise RuntimeError("LLM not configured")
+
+    monkeypatch.setattr(server, "build_llm", unavailable)
+    return TestClient(server.app, raise_server_exceptions=False)
+
+
+def test_fast_path_answers_without_building_the_llm(client):
+    r = client.post("/api/games/0022400001/ask", json={"question": "How many turnovers did SAC have?"})
+    assert r.status_code == 200
+    assert r.json() == {"answer": "SAC had 14 turnovers.", "source": "fast_path"}
+
+
+def test_batch_fast_path_answers_without_building_the_llm(client):
+    r = client.post("/api/games/0022400001/ask/batch",
+                    json={"questions": ["What was the final score?", "Who won?"]})
+    assert r.status_code == 200
+    assert [a["source"] for a in r.json()["answers"]] == ["fast_path", "fast_path"]
+
+
+def test_ask_renders_missing_context_snapshot(client, tmp_path, monkeypatch):
+    from src.benchmarks.fixtures import StubLLM
+
+    stub = StubLLM("BOS shot better.")
+    monkeypatch.setattr(server, "build_llm", lambda: stub)
+    r = client.post("/api/games/0022400001/ask", json={"question": "Why did BOS win?"})
+    assert r.status_code == 200
+    assert r.json()["answer"] == "BOS shot better."
+    assert (tmp_path / "0022400001_context.json").exists()
+    assert stub.calls == 1
+
+
+def test_concurrent_first_asks_build_one_llm(monkeypatch):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    built = []
+
+    def slow_build():
+        time.sleep(0.05)
+        built.append(threading.get_ident())
+        return object()
+
+    monkeypatch.setattr(server, "llm", None)
+    monkeypatch.setattr(server, "prompt", None)
+    monkeypatch.setattr(server, "build_llm", slow_build)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: server._ensure_llm(), range(4)))
+    assert len(built) == 1
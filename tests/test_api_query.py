@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.benchmarks.fixtures import StubLLM
+from src.service.game_catalog import update_catalog
+
+
+def _summary(home, away, home_pts, away_pts):
+    return {"teams": [home, away], "status": "final", "final_score": {home: home_pts, away: away_pts}}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    games = {"g1": (_summary("BOS", "SAC", 112, 104), "2025-11-01"),
+             "g2": (_summary("WAS", "MIN", 99, 101), "2025-11-02")}
+    for game_id, (summary, date) in games.items():
+        (tmp_path / f"{game_id}_summary.json").write_text(json.dumps(summary))
+        update_catalog(game_id, summary, date, tmp_path)
+    monkeypatch.setattr(server, "STRUCTURED_DIR", tmp_path)
+    monkeypatch.setattr(server, "llm", StubLLM())
+    monkeypatch.setattr(server, "prompt", server.build_prompt())
+    return TestClient(server.app)
+
+
+@pytest.mark.parametrize("question, game_ids", [
+    ("How was BOS this month?", ["g1"]),
+    ("How did the Celtics do?", ["g1"]),
+    ("What was the record?", ["g1", "g2"]),  # "was" is not WAS
+    ("How many min did starters play?", ["g1", "g2"]),  # "min" is not MIN
+])
+def test_query_reads_teams_from_codes_and_nicknames_only(client, question, game_ids):
+    r = client.post("/api/games/query", json={"question": question})
+    assert r.status_code == 200
+    assert sorted(r.json()["gameIds"]) == game_ids
@@ -0,0 +1,26 @@
+from src.service.comparison import aggregate, build_rows, format_comparison_context
+
+
+def _summary(home, away, home_pts, away_pts, status="final"):
+    return {"teams": [home, away], "status": status, "final_score": {home: home_pts, away: away_pts}}
+
+
+SUMMARIES = {
+    "g1": _summary("BOS", "SAC", 112, 104),
+    "g2": _summary("NYK", "BOS", 120, 101),
+    "g3": _summary("BOS", "MIA", 40, 52, status="live"),
+}
+DATES = {"g1": "2025-11-01", "g2": "2025-11-03", "g3": "2025-11-05"}
+
+
+def test_in_progress_games_are_not_losses():
+    agg = aggregate(build_rows(SUMMARIES, DATES, "BOS"))
+    assert (agg["games"], agg["wins"], agg["losses"], agg["in_progress"]) == (3, 1, 1, 1)
+    assert agg["worst"]["game_id"] == "g2"
+
+
+def test_context_labels_in_progress_games():
+    text = format_comparison_context(build_rows(SUMMARIES, DATES, "BOS"), "BOS")
+    assert "record 1-1 (1 in progress)" in text
+    assert "2025-11-05 | BOS | MIA | H | in progress 40-52 |" in text
+    assert "2025-11-03 | BOS | NYK | A | L 101-120 |" in text
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("fastapi")
+
+import pyarrow as pa
+from fastapi.testclient import TestClient
+
+from src.api import server
+
+
+SUMMARY = {"teams": ["BOS", "SAC"], "status": "final", "final_score": {"BOS": 112, "SAC": 104}}
+PLAYS = [
+    {"period": 1, "time": "PT11M40.00S", "team": "BOS", "event_type": "3PT_MADE", "points": 3,
+     "description": "Tatum 26' 3PT Jump Shot"},
+    {"period": 1, "time": "PT11M20.00S", "team": "SAC", "event_type": "SHOT_MADE", "points": 2,
+     "description": "Fox Driving Layup"},
+]
+
+
+def test_export_backfills_parquet_and_reports_missing_games(tmp_path, monkeypatch):
+    (tmp_path / "g1_parsed.json").write_text(json.dumps(PLAYS))
+    (tmp_path / "g1_summary.json").write_text(json.dumps(SUMMARY))
+    monkeypatch.setattr(server, "STRUCTURED_DIR", tmp_path)
+
+    r = TestClient(server.app).get("/api/export/plays", params=[("gameId", "g1"), ("gameId", "g2")])
+    assert r.status_code == 200
+    assert r.headers["x-playmind-games"] == "1"
+    assert r.headers["x-playmind-missing-games"] == "g2"
+    table = pa.ipc.open_stream(r.content).read_all()
+    assert table.column("game_id").to_pylist() == ["g1", "g1"]
+    assert (tmp_path / "g1_plays.parquet").exists()
+
+
+def test_export_with_no_stored_games_is_404(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "STRUCTURED_DIR", tmp_path)
+    r = TestClient(server.app).get("/api/export/summaries", params={"gameId": "g2"})
+    assert r.status_code == 404
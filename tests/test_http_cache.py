@@ -0,0 +1,50 @@
+import gzip
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.api.http_cache import CachedBody, cached_response, etag_matches
+
+
+BODY = b'{"plays": "' + b"x" * 4096 + b'"}'
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    cached = CachedBody(BODY, "no-cache")
+
+    @app.get("/r")
+    def resource(request: Request):
+        return cached_response(request, cached)
+
+    return TestClient(app)
+
+
+def test_each_encoding_has_its_own_strong_etag(client):
+    identity = client.get("/r", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/r", headers={"Accept-Encoding": "gzip"})
+    assert identity.content == BODY
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert identity.headers["etag"] != gzipped.headers["etag"]
+    assert gzipped.headers["etag"].endswith('-gzip"')
+    assert not identity.headers["etag"].startswith("W/")
+
+
+def test_any_variant_etag_revalidates(client):
+    gzip_tag = client.get("/r", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    r = client.get("/r", headers={"Accept-Encoding": "identity", "If-None-Match": gzip_tag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == gzip_tag.removesuffix('-gzip"') + '"'
+
+
+def test_etag_matches_rejects_other_bodies():
+    cached = CachedBody(BODY, "no-cache")
+    other = CachedBody(gzip.compress(BODY), "no-cache")
+    assert etag_matches(f"{cached.etag('br')}, {other.etag()}", cached)
+    assert not etag_matches(other.etag("gzip"), cached)
+    assert etag_matches("*", cached)
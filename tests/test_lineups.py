@@ -0,0 +1,35 @@
+from src.utils.lineups import build_stints
+
+
+BOS = [1, 2, 3, 4, 5]
+BENCH = 6
+SAC = [11, 12, 13, 14, 15]
+
+
+def _play(clock, team, pid, event_type, sub_type="", description="x"):
+    return {"period": 1, "time": clock, "team": team, "player_id": pid,
+            "event_type": event_type, "sub_type": sub_type, "description": description}
+
+
+def _game(*leading):
+    plays = list(leading)
+    for i, pid in enumerate(BOS):
+        plays.append(_play(f"PT11M{50 - i}.00S", "BOS", pid, "SHOT_MISSED"))
+    for i, pid in enumerate(SAC):
+        plays.append(_play(f"PT11M{40 - i}.00S", "SAC", pid, "REBOUND"))
+    return plays
+
+
+def test_starters_come_from_live_ball_events():
+    stints = build_stints(_game(), ["BOS", "SAC"])
+    assert stints[0]["lineups"]["BOS"] == "1-2-3-4-5"
+
+
+def test_bench_technical_does_not_make_a_starter():
+    technical = [
+        _play("PT11M55.00S", "BOS", BENCH, "FOUL", "technical", "Walker T.FOUL (P1.PN)"),
+        _play("PT11M55.00S", "SAC", 11, "FT_MADE", "1 of 1", "Fox Free Throw Technical (1 PTS)"),
+    ]
+    stints = build_stints(_game(*technical), ["BOS", "SAC"])
+    assert stints[0]["lineups"]["BOS"] == "1-2-3-4-5"
+    assert stints[0]["lineups"]["SAC"] == "11-12-13-14-15"
@@ -0,0 +1,96 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("openai")
+
+from openai import OpenAI
+
+from src.benchmarks.fake_openai import FakeOpenAIConfig, serve_fake_openai
+from src.rag.llm_client import CircuitBreaker, LLMQueueTimeout, LLMUnavailable, OpenAIChatLLM
+
+
+RESET = 0.05
+
+
+def _client(base_url: str, **overrides) -> OpenAIChatLLM:
+    return OpenAIChatLLM(OpenAI(base_url=base_url, api_key="fake", max_retries=0), "fake-model", **overrides)
+
+
+def _open_circuit(llm: OpenAIChatLLM, config: FakeOpenAIConfig):
+    config.down = True
+    for _ in range(llm.breaker.failure_threshold):
+        with pytest.raises(LLMUnavailable):
+            llm.invoke("Question: anything")
+    assert llm.breaker.is_open
+    config.down = False
+
+
+def _assert_recovers(llm: OpenAIChatLLM):
+    time.sleep(RESET * 2)
+    assert llm.invoke("Question: anything") == "Not enough information."
+    assert not llm.breaker.is_open
+
+
+def test_rate_limited_probe_does_not_wedge_breaker():
+    config = FakeOpenAIConfig(latency=0.0)
+    with serve_fake_openai(config) as (base_url, _):
+        llm = _client(base_url, max_retries=0, breaker=CircuitBreaker(3, reset_after=RESET))
+        _open_circuit(llm, config)
+
+        time.sleep(RESET * 2)
+        config.rate_limit_rate = 1.0
+        with pytest.raises(LLMUnavailable):
+            llm.invoke("Question: anything")  # the probe gets a 429
+        config.rate_limit_rate = 0.0
+
+        _assert_recovers(llm)
+
+
+def test_non_retryable_probe_does_not_wedge_breaker():
+    config = FakeOpenAIConfig(latency=0.0)
+    with serve_fake_openai(config) as (base_url, _):
+        llm = _client(base_url, max_retries=0, breaker=CircuitBreaker(3, reset_after=RESET))
+        _open_circuit(llm, config)
+
+        time.sleep(RESET * 2)
+        healthy = llm.client
+
+        def reject(**request):
+            raise ValueError("malformed request")
+
+        llm.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=reject)))
+        with pytest.raises(ValueError):
+            llm.invoke("Question: anything")  # the probe fails with a non-retryable error
+        llm.client = healthy
+
+        _assert_recovers(llm)
+
+
+def test_queue_timeout_probe_does_not_wedge_breaker():
+    config = FakeOpenAIConfig(latency=0.0)
+    with serve_fake_openai(config) as (base_url, _):
+        llm = _client(base_url, max_retries=0, timeout=0.05, max_concurrency=1,
+                      breaker=CircuitBreaker(3, reset_after=RESET))
+        _open_circuit(llm, config)
+
+        time.sleep(RESET * 2)
+        llm._slots.acquire()  # every slot busy: the probe times out while queued
+        try:
+            with pytest.raises(LLMQueueTimeout):
+                llm.invoke("Question: anything")
+        finally:
+            llm._slots.release()
+
+        _assert_recovers(llm)
+
+
+def test_probe_success_closes_breaker():
+    config = FakeOpenAIConfig(latency=0.0)
+    with serve_fake_openai(config) as (base_url, _):
+        llm = _client(base_url, max_retries=0, breaker=CircuitBreaker(3, reset_after=RESET))
+        _open_circuit(llm, config)
+        with pytest.raises(LLMUnavailable, match="circuit open"):
+            llm.invoke("Question: anything")
+        _assert_recovers(llm)
@@ -0,0 +1,15 @@
+import importlib.util
+
+import pytest
+
+from src.rag import local_llm
+
+
+def test_missing_dependencies_raise_a_clear_import_error(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(ImportError, match="pip install torch transformers"):
+        local_llm.build_local_llm()
+
+
+def test_json_object_trims_chatter():
+    assert local_llm.json_object('Sure! ```json\n{"answers": []}\n```') == '{"answers": []}'
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.service import data_service
+from src.service.pipeline_manifest import run_stage
+
+
+def _manifest():
+    return {"game_id": "0022400001", "stages": {}}
+
+
+def test_check_reruns_stage_whose_db_rows_are_gone(tmp_path):
+    parsed = tmp_path / "parsed.json"
+    parsed.write_text("[]")
+    db_rows = {"count": 0}
+
+    def build():
+        db_rows["count"] = 3
+        return {"rows": 3}
+
+    def present(rec):
+        return rec.get("rows") == db_rows["count"]
+
+    manifest = _manifest()
+    assert run_stage(manifest, "play_index", "1", {"parsed": parsed}, {}, build, check=present)
+    assert manifest["stages"]["play_index"]["rows"] == 3
+    assert not run_stage(manifest, "play_index", "1", {"parsed": parsed}, {}, build, check=present)
+
+    db_rows["count"] = 0  # the database was deleted
+    assert run_stage(manifest, "play_index", "1", {"parsed": parsed}, {}, build, check=present)
+
+
+def test_rebuild_games_continues_past_failures(monkeypatch):
+    def rebuild(game_id, from_stage, force):
+        if game_id == "bad":
+            raise ValueError("corrupt parsed file")
+        return game_id, {"teams": ["BOS", "SAC"]}
+
+    catalogued, seasons = [], []
+    monkeypatch.setattr(data_service, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(data_service, "_rebuild_game", rebuild)
+    monkeypatch.setattr(data_service, "update_catalog", lambda gid, summary: catalogued.append(gid))
+    monkeypatch.setattr(data_service, "_notify", lambda gid, summary: None)
+    monkeypatch.setattr(data_service, "season_of", lambda gid: "2024-25")
+    monkeypatch.setattr(data_service, "rebuild_season_rollup", seasons.append)
+
+    rebuilt, failed = data_service.rebuild_games(["a", "bad", "b"])
+    assert rebuilt == ["a", "b"]
+    assert failed == {"bad": "corrupt parsed file"}
+    assert catalogued == ["a", "b"]
+    assert seasons == ["2024-25"]
+
+
+def test_rebuild_games_reindexes_play_vectors_in_parent(monkeypatch):
+    import threading
+
+    main = threading.current_thread()
+    worker_stages, reindexed = [], []
+
+    def derived(game_id, manifest, force, from_stage="parse", in_worker=False):
+        worker_stages.append((game_id, in_worker))
+        return game_id, {"teams": ["BOS", "SAC"]}
+
+    def play_vectors(game_id, manifest, force):
+        assert threading.current_thread() is main
+        reindexed.append(game_id)
+
+    monkeypatch.setattr(data_service, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(data_service, "_derived_stages", derived)
+    monkeypatch.setattr(data_service, "_play_vector_store", lambda: object())
+    monkeypatch.setattr(data_service, "_play_vectors_stage", play_vectors)
+    monkeypatch.setattr(data_service, "load_manifest", lambda gid: {"stages": {}})
+    monkeypatch.setattr(data_service, "save_manifest", lambda manifest: None)
+    monkeypatch.setattr(data_service, "update_catalog", lambda gid, summary: None)
+    monkeypatch.setattr(data_service, "_notify", lambda gid, summary: None)
+    monkeypatch.setattr(data_service, "season_of", lambda gid: "2024-25")
+    monkeypatch.setattr(data_service, "rebuild_season_rollup", lambda season: None)
+
+    rebuilt, failed = data_service.rebuild_games(["a", "b"])
+    assert (rebuilt, failed) == (["a", "b"], {})
+    assert sorted(worker_stages) == [("a", True), ("b", True)]
+    assert reindexed == ["a", "b"]
+
+
+def test_ingest_game_serializes_per_game(monkeypatch):
+    import threading
+    import time
+
+    active, overlaps = {}, []
+    guard = threading.Lock()
+
+    def fetch(game_id, manifest, force):
+        with guard:
+            active[game_id] = active.get(game_id, 0) + 1
+            overlaps.append((game_id, active[game_id], sum(active.values())))
+        time.sleep(0.05)
+        with guard:
+            active[game_id] -= 1
+        return None
+
+    monkeypatch.setattr(data_service, "load_manifest", lambda gid: _manifest())
+    monkeypatch.setattr(data_service, "save_manifest", lambda manifest: None)
+    monkeypatch.setattr(data_service, "_fetch_stage", fetch)
+    monkeypatch.setattr(data_service, "_derived_stages", lambda gid, manifest, force: (gid, None))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(data_service.ingest_game, ["a", "a", "b", "b"]))
+
+    assert max(per_game for _, per_game, _ in overlaps) == 1
+    assert max(total for _, _, total in overlaps) == 2  # different games still run in parallel
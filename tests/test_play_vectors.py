@@ -0,0 +1,24 @@
+import pytest
+
+pytest.importorskip("langchain_chroma")
+pytest.importorskip("langchain_huggingface")
+
+from src.benchmarks.fixtures import HashEmbeddings
+from src.embeddings.build_index import build_play_index, indexed_vector_count, replace_game_plays
+
+
+def _plays(*descriptions):
+    return [{"period": 1, "time": "PT11M00.00S", "team": "BOS", "description": d} for d in descriptions]
+
+
+def test_reindexing_a_game_drops_its_stale_documents(tmp_path):
+    db = build_play_index(
+        {"g1": _plays("Tatum 3PT Jump Shot", "Brown Layup", "White Free Throw"), "g2": _plays("Fox Dunk")},
+        tmp_path / "play_index", HashEmbeddings(),
+    )
+    assert indexed_vector_count(db, "g1") == 3
+
+    # A corrected feed removed a play: seq 2 must not survive the reindex.
+    assert replace_game_plays(db, "g1", _plays("Tatum 3PT Jump Shot", "Brown Layup")) == 2
+    assert sorted(db.get(where={"game_id": "g1"}, include=[])["ids"]) == ["g1:0", "g1:1"]
+    assert indexed_vector_count(db, "g2") == 1
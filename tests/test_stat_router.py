@@ -0,0 +1,105 @@
+import pytest
+
+from src.rag.stat_router import route_question
+
+
+SUMMARY = {
+    "teams": ["BOS", "SAC"],
+    "status": "final",
+    "final_score": {"BOS": 112, "SAC": 104},
+    "turnovers": {"BOS": 11, "SAC": 14},
+    "rebounds": {"BOS": 48, "SAC": 41},
+    "three_pointers": {"BOS": "15/40", "SAC": "12/35"},
+}
+
+
+@pytest.mark.parametrize("question, answer", [
+    ("What was the final score?", "The final score was BOS 112, SAC 104."),
+    ("Who won?", "BOS won by 8 points (BOS 112, SAC 104)."),
+    ("How many points did BOS score?", "BOS scored 112 points."),
+    ("How many points did the Kings score?", "SAC scored 104 points."),
+    ("How many turnovers did SAC have?", "SAC had 14 turnovers."),
+    ("Who had more rebounds?", "BOS had more rebounds (48 vs SAC's 41)."),
+    ("How many threes did the Celtics make?", "BOS made 15 of 40 three-pointers."),
+    ("How many points did BOS win by?", "BOS won by 8 points (BOS 112, SAC 104)."),
+    ("How many points did SAC lose by?", "SAC lost to BOS by 8 points (BOS 112, SAC 104)."),
+])
+def test_plain_stat_questions_are_routed(question, answer):
+    assert route_question(question, SUMMARY) == answer
+
+
+@pytest.mark.parametrize("question", [
+    "How many points did Jayson Tatum score?",
+    "How many rebounds did Tatum have?",
+    "How many points in the paint did BOS score?",
+    "How many paint points did SAC have?",
+    "How many fast break points did BOS score?",
+    "How many second chance points did SAC have?",
+    "How many bench points did BOS have?",
+    "How many points off turnovers did SAC score?",
+    "What was Tatum's score?",
+    "How many times did BOS score?",
+    "How many points did BOS score in the first?",
+    "What was the score after the first?",
+    "What was the score at the end of the third?",
+])
+def test_qualified_or_player_questions_go_to_the_llm(question):
+    assert route_question(question, SUMMARY) is None
+    assert route_question(question, SUMMARY, _state()) is None
+
+
+def test_live_game_reports_current_score():
+    live = SUMMARY | {"status": "live"}
+    assert route_question("What's the score?", live) == "The current score is BOS 112, SAC 104."
+    assert route_question("Who won?", live) == "The game is still in progress: BOS leads by 8 points (BOS 112, SAC 104)."
+
+
+def _play(period, clock, team, event_type):
+    return {"period": period, "time": clock, "team": team, "event_type": event_type, "description": ""}
+
+
+def _state():
+    from src.utils.game_state import build_game_state
+
+    plays = (
+        [_play(1, f"PT{10 - i}M00.00S", "BOS", "3PT_MADE") for i in range(4)]  # BOS up 12
+        + [_play(2, f"PT{10 - i}M00.00S", "SAC", "SHOT_MADE") for i in range(6)]  # tied 12-12
+        + [_play(4, "PT10M00.00S", "SAC", "3PT_MADE"), _play(4, "PT5M00.00S", "BOS", "SHOT_MADE")]
+    )
+    return build_game_state(plays, ["BOS", "SAC"])
+
+
+def test_largest_lead_respects_period_qualifier():
+    state, summary = _state(), SUMMARY | {"final_score": {"BOS": 14, "SAC": 15}}
+    assert route_question("What was the largest lead?", summary, state) == (
+        "BOS's largest lead was 12 (Q1 7:00); SAC's largest lead was 3 (Q4 10:00)."
+    )
+    assert route_question("What was the largest lead in the fourth quarter?", summary, state) == (
+        "BOS never led in the fourth quarter; SAC's largest lead in the fourth quarter was 3 (Q4 10:00)."
+    )
+    assert route_question("What was BOS's biggest lead in the second quarter?", summary, state) == (
+        "BOS's largest lead in the second quarter was 12 (Q2 12:00)."
+    )
+    assert route_question("What was the largest lead in the first?", summary, state) is None
+
+
+def test_period_phrases_still_route_with_state():
+    state, summary = _state(), SUMMARY | {"final_score": {"BOS": 14, "SAC": 15}}
+    assert route_question("What was the score after the first quarter?", summary, state) == (
+        "After the first quarter it was BOS 12, SAC 0."
+    )
+    assert route_question("What was the score at halftime?", summary, state) == "At halftime it was BOS 12, SAC 12."
+
+
+def test_largest_lead_lookup_matches_a_scan_of_every_window():
+    from src.utils.game_state import GameState, period_length
+
+    state = GameState.from_dict(_state().to_dict())
+    margins = [x - y for x, y in zip(state.prefix["BOS"]["pts"], state.prefix["SAC"]["pts"])]
+    for p in range(1, 5):
+        for q in range(p, 5):
+            i, j = state.index_at(p, period_length(p)), state.index_at(q, 0.0)
+            leads = state.largest_lead_between((p, period_length(p)), (q, 0.0))
+            window = margins[i:j + 1]
+            assert leads["BOS"]["lead"] == max([0] + window)
+            assert leads["SAC"]["lead"] == max([0] + [-m for m in window])